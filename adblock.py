@@ -0,0 +1,295 @@
+import os
+import re
+import pickle
+import hashlib
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+FILTER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "filters")
+CACHE_PATH = os.path.join(FILTER_DIR, "compiled.cache")
+
+# Bump when the compiled layout changes so stale caches are rebuilt
+CACHE_FORMAT = 1
+
+TYPE_OPTIONS = {"script", "image", "stylesheet", "xmlhttprequest", "subdocument", "document", "media",
+                "font", "object", "ping", "websocket", "other"}
+IGNORED_OPTIONS = {"match-case", "important", "all", "popup", "~popup"}
+
+OPTIONS_RE = re.compile(r"^[\w~,=|.\-*]+$")
+HOST_RULE_RE = re.compile(r"^\|\|([a-z0-9.\-]+)\^?$")
+TOKEN_RE = re.compile(r"[a-z0-9%]+")
+SEPARATOR = r"(?:[^\w\-.%]|$)"
+
+
+def registrable_domain(host):
+    # Without a public suffix list, the last two labels are close enough to
+    # tell first-party from third-party requests
+    parts = host.split(".")
+    return ".".join(parts[-2:]) if len(parts) > 2 else host
+
+
+class Filter:
+    __slots__ = ("source", "literal", "types", "excluded_types", "third_party",
+                 "domains", "excluded_domains", "regex")
+
+    def __init__(self, source, literal):
+        self.source = source
+        self.literal = literal
+        self.types = None
+        self.excluded_types = None
+        self.third_party = None
+        self.domains = None
+        self.excluded_domains = None
+        self.regex = None
+
+    def __getstate__(self):
+        # Regexes are compiled on first use, never pickled
+        return tuple(getattr(self, name) for name in Filter.__slots__[:-1])
+
+    def __setstate__(self, state):
+        for name, value in zip(Filter.__slots__[:-1], state):
+            setattr(self, name, value)
+        self.regex = None
+
+    def applies(self, resource_type, third_party, source_host):
+        if self.types is not None and resource_type not in self.types:
+            return False
+        if self.excluded_types is not None and resource_type in self.excluded_types:
+            return False
+        if self.third_party is not None and self.third_party != third_party:
+            return False
+        if self.domains is not None or self.excluded_domains is not None:
+            suffixes = host_suffixes(source_host)
+            if self.excluded_domains is not None and any(suffix in self.excluded_domains for suffix in suffixes):
+                return False
+            if self.domains is not None and not any(suffix in self.domains for suffix in suffixes):
+                return False
+        return True
+
+    def matches(self, url):
+        if self.literal:
+            return self.source in url
+        if self.regex is None:
+            self.regex = re.compile(self.source)
+        return self.regex.search(url) is not None
+
+
+def host_suffixes(host):
+    parts = host.split(".")
+    return [".".join(parts[i:]) for i in range(len(parts))]
+
+
+def parse_options(text, rule):
+    for option in text.split(","):
+        option = option.strip()
+        negated = option.startswith("~")
+        name = option[1:] if negated else option
+        if name == "third-party":
+            rule.third_party = not negated
+        elif name in TYPE_OPTIONS:
+            if negated:
+                rule.excluded_types = (rule.excluded_types or frozenset()) | {name}
+            else:
+                rule.types = (rule.types or frozenset()) | {name}
+        elif name.startswith("domain="):
+            for domain in name[len("domain="):].split("|"):
+                if domain.startswith("~"):
+                    rule.excluded_domains = (rule.excluded_domains or frozenset()) | {domain[1:]}
+                elif domain:
+                    rule.domains = (rule.domains or frozenset()) | {domain}
+        elif option not in IGNORED_OPTIONS:
+            # csp=, redirect=, removeparam= and the like change responses
+            # rather than block them; skip the whole rule
+            return False
+    return True
+
+
+def pattern_to_regex(pattern):
+    prefix, suffix = "", ""
+    if pattern.startswith("||"):
+        prefix = r"^[a-z][a-z0-9.+\-]*://(?:[^/?#]*\.)?"
+        pattern = pattern[2:]
+    elif pattern.startswith("|"):
+        prefix = "^"
+        pattern = pattern[1:]
+    if pattern.endswith("|"):
+        suffix = "$"
+        pattern = pattern[:-1]
+    body = []
+    for char in pattern:
+        if char == "*":
+            body.append(".*")
+        elif char == "^":
+            body.append(SEPARATOR)
+        else:
+            body.append(re.escape(char))
+    return prefix + "".join(body) + suffix
+
+
+def best_token(pattern):
+    # A token can index a rule only if the URL must contain it as a whole
+    # token: bounded by a separator-like character or an anchor on both sides
+    best = None
+    for match in TOKEN_RE.finditer(pattern):
+        start, end = match.span()
+        before = pattern[start - 1] if start else ""
+        after = pattern[end] if end < len(pattern) else ""
+        left_ok = before != "*" and (before != "" or pattern.startswith("|"))
+        right_ok = after != "*" and (after != "" or pattern.endswith("|"))
+        if not (left_ok and right_ok) or len(match.group()) < 2:
+            continue
+        token = match.group()
+        if best is None or len(token) > len(best):
+            best = token
+    return best
+
+
+# One side (blocking or exception) of a filter list: host rules in tables
+# keyed by domain suffix, other rules bucketed by one token the URL must
+# contain, and the few rules with no usable token in a list checked always.
+class RuleSet:
+    def __init__(self):
+        self.plain_hosts = set()
+        self.hosts = {}
+        self.tokens = {}
+        self.generic = []
+        self.count = 0
+
+    def add(self, pattern, options):
+        host_match = HOST_RULE_RE.match(pattern)
+        if host_match:
+            rule = Filter(None, True)
+        else:
+            stripped = pattern.strip("*")
+            literal = not any(char in stripped for char in "|^*")
+            rule = Filter(stripped if literal else pattern_to_regex(pattern), literal)
+        if options is not None and not parse_options(options, rule):
+            return False
+
+        if host_match and options is None:
+            # Most of a list: no options, so a set of host names is enough
+            self.plain_hosts.add(host_match.group(1))
+        elif host_match:
+            self.hosts.setdefault(host_match.group(1), []).append(rule)
+        else:
+            token = best_token(pattern)
+            if token is None:
+                self.generic.append(rule)
+            else:
+                self.tokens.setdefault(token, []).append(rule)
+        self.count += 1
+        return True
+
+    def match(self, url, suffixes, url_tokens, resource_type, third_party, source_host):
+        for suffix in suffixes:
+            if suffix in self.plain_hosts:
+                return True
+            for rule in self.hosts.get(suffix, ()):
+                if rule.applies(resource_type, third_party, source_host):
+                    return True
+        for token in url_tokens:
+            for rule in self.tokens.get(token, ()):
+                if rule.matches(url) and rule.applies(resource_type, third_party, source_host):
+                    return True
+        for rule in self.generic:
+            if rule.matches(url) and rule.applies(resource_type, third_party, source_host):
+                return True
+        return False
+
+
+class FilterMatcher:
+    shared_matcher = None
+
+    def __init__(self):
+        self.block = RuleSet()
+        self.allow = RuleSet()
+        self.skipped = 0
+
+    @classmethod
+    def shared(cls):
+        if cls.shared_matcher is None:
+            cls.shared_matcher = load_matcher()
+        return cls.shared_matcher
+
+    def add_rule(self, line):
+        line = line.strip()
+        if not line or line.startswith(("!", "[")) or "##" in line or "#@#" in line or "#?#" in line or "#$#" in line:
+            return
+        rules = self.block
+        if line.startswith("@@"):
+            rules = self.allow
+            line = line[2:]
+        options = None
+        dollar = line.rfind("$")
+        if dollar > 0 and OPTIONS_RE.match(line[dollar + 1:]):
+            line, options = line[:dollar], line[dollar + 1:]
+        line = line.lower()
+        if line.startswith("/") and line.endswith("/") and len(line) > 2:
+            # Raw regex filters are rare and slow; leave them out
+            self.skipped += 1
+            return
+        if not rules.add(line or "*", options):
+            self.skipped += 1
+
+    def should_block(self, url, host, source_host, resource_type="other"):
+        url = url.lower()
+        host = host.lower()
+        source_host = (source_host or "").lower()
+        third_party = bool(source_host) and registrable_domain(host) != registrable_domain(source_host)
+        suffixes = host_suffixes(host)
+        tokens = set(TOKEN_RE.findall(url))
+        if not self.block.match(url, suffixes, tokens, resource_type, third_party, source_host):
+            return False
+        return not self.allow.match(url, suffixes, tokens, resource_type, third_party, source_host)
+
+
+def filter_list_paths(directory=FILTER_DIR):
+    try:
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".txt"))
+    except OSError:
+        return []
+
+
+def compile_lists(paths):
+    matcher = FilterMatcher()
+    for path in paths:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                matcher.add_rule(line)
+    return matcher
+
+
+def load_matcher(paths=None, cache_path=CACHE_PATH):
+    # The cache is keyed on the lists' contents, so editing or adding a list
+    # triggers one re-parse and every later start just unpickles
+    paths = filter_list_paths() if paths is None else paths
+    digest = hashlib.sha256(str(CACHE_FORMAT).encode())
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                digest.update(f.read())
+        except OSError as e:
+            logging.error(f"Failed to read filter list {path}: {str(e)}")
+    key = digest.hexdigest()
+
+    try:
+        with open(cache_path, "rb") as f:
+            cached_key, matcher = pickle.load(f)
+        if cached_key == key:
+            return matcher
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError):
+        pass
+
+    matcher = compile_lists(paths)
+    logging.info(f"Compiled {matcher.block.count} blocking and {matcher.allow.count} exception filters "
+                 f"({matcher.skipped} skipped)")
+    try:
+        temp_path = cache_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump((key, matcher), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logging.error(f"Failed to cache compiled filters: {str(e)}")
+    return matcher
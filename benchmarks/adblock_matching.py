@@ -0,0 +1,127 @@
+# Measures the content blocker's per-request matching cost, the time to
+# compile filter lists and the time to load the compiled cache. By default it
+# generates an EasyList-sized list and a URL corpus; pass real lists and a
+# recorded corpus (one "url<TAB>page host<TAB>type" per line) to use those.
+#
+#   python benchmarks/adblock_matching.py [--rules 40000] [--requests 50000]
+#   python benchmarks/adblock_matching.py --lists easylist.txt --corpus urls.tsv
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import urllib.parse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import adblock
+
+TYPES = ["script", "image", "stylesheet", "xmlhttprequest", "subdocument", "font", "media"]
+WORDS = ["ad", "ads", "banner", "track", "pixel", "promo", "sponsor", "beacon", "metrics", "tag",
+         "static", "cdn", "img", "assets", "media", "api", "v1", "v2", "js", "css", "widget", "user"]
+
+
+def word(rng):
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 10)))
+
+
+def generate_list(path, rules, rng):
+    # Roughly EasyList's mix: mostly host rules, then URL patterns with
+    # options, some exceptions and cosmetic rules the parser skips
+    hosts = []
+    with open(path, "w") as f:
+        f.write("[Adblock Plus 2.0]\n! Generated for benchmarking\n")
+        for i in range(rules):
+            kind = rng.random()
+            if kind < 0.55:
+                hosts.append(f"{word(rng)}{i}.{rng.choice(['com', 'net', 'io'])}")
+                f.write(f"||{hosts[-1]}^\n")
+            elif kind < 0.75:
+                f.write(f"/{rng.choice(WORDS)}-{word(rng)}{i}/*\n")
+            elif kind < 0.85:
+                f.write(f"||{word(rng)}.com/{word(rng)}{i}/*.js$script,third-party\n")
+            elif kind < 0.90:
+                f.write(f"&{word(rng)}{i}=$xmlhttprequest\n")
+            elif kind < 0.93:
+                f.write(f"@@||{word(rng)}{i}.com/{word(rng)}^$domain={word(rng)}.com\n")
+            else:
+                f.write(f"{word(rng)}{i}.com##.{word(rng)}\n")
+    return hosts
+
+
+def generate_corpus(count, rng, ad_hosts):
+    # About one request in ten goes to a listed host, as on a typical news page
+    pages = [f"www.{word(rng)}.com" for _ in range(50)]
+    hosts = [f"{rng.choice(['cdn', 'static', 'img', 'api'])}.{word(rng)}.com" for _ in range(400)]
+    hosts += rng.sample(ad_hosts, min(len(ad_hosts), 45)) if ad_hosts else []
+    corpus = []
+    for _ in range(count):
+        page = rng.choice(pages)
+        host = page if rng.random() < 0.4 else rng.choice(hosts)
+        path = "/".join(rng.choice(WORDS + [word(rng)]) for _ in range(rng.randint(1, 4)))
+        query = f"?{word(rng)}={word(rng)}" if rng.random() < 0.3 else ""
+        corpus.append((f"https://{host}/{path}.{rng.choice(['js', 'png', 'css', 'json'])}{query}",
+                       page, rng.choice(TYPES)))
+    return corpus
+
+
+def load_corpus(path):
+    corpus = []
+    with open(path) as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            if fields and fields[0]:
+                corpus.append((fields[0], fields[1] if len(fields) > 1 else "", fields[2] if len(fields) > 2 else "other"))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rules", type=int, default=40000)
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--lists", nargs="*")
+    parser.add_argument("--corpus")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as directory:
+        lists, ad_hosts = args.lists, []
+        if not lists:
+            lists = [os.path.join(directory, "generated.txt")]
+            ad_hosts = generate_list(lists[0], args.rules, rng)
+        corpus = load_corpus(args.corpus) if args.corpus else generate_corpus(args.requests, rng, ad_hosts)
+        cache_path = os.path.join(directory, "compiled.cache")
+
+        started = time.perf_counter()
+        matcher = adblock.load_matcher(lists, cache_path)
+        compiled = time.perf_counter() - started
+        started = time.perf_counter()
+        matcher = adblock.load_matcher(lists, cache_path)
+        cached = time.perf_counter() - started
+        cache_size = os.path.getsize(cache_path)
+
+    requests = [(url, urllib.parse.urlsplit(url).hostname or "", page, kind) for url, page, kind in corpus]
+    # One pass to compile the regexes the corpus touches, as a browsing
+    # session would have done already
+    for url, host, page, kind in requests:
+        matcher.should_block(url, host, page, kind)
+
+    samples, blocked = [], 0
+    for url, host, page, kind in requests:
+        started = time.perf_counter()
+        blocked += matcher.should_block(url, host, page, kind)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+
+    print(f"{matcher.block.count} blocking and {matcher.allow.count} exception filters, "
+          f"{len(matcher.block.generic)} checked on every request")
+    print(f"compile lists: {compiled * 1000:7.1f} ms, load cache: {cached * 1000:6.1f} ms ({cache_size / 1024:.0f} KB)")
+    print(f"{len(requests)} requests, {blocked} blocked: "
+          f"mean {statistics.mean(samples) * 1e6:.1f} us, p50 {samples[len(samples) // 2] * 1e6:.1f} us, "
+          f"p99 {samples[int(len(samples) * 0.99)] * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
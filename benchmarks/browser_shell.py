@@ -0,0 +1,260 @@
+# Runs the real Browser window offscreen against a local HTTP fixture server
+# and measures the shell: cold start, new tabs, mass open/close, session
+# save/restore, history writes, menu building and peak memory. Each scenario
+# runs in a fresh process with its own working directory (so its own
+# browser_data.db and session files) and prints one JSON object; the parent
+# merges them into a results file and compares it against a baseline.
+#
+#   python benchmarks/browser_shell.py [--tabs 500] [--output results.json]
+#   python benchmarks/browser_shell.py --update-baseline
+#   python benchmarks/browser_shell.py --scenario startup   (one scenario, JSON to stdout)
+#
+# Metrics ending in _per_s are throughputs (higher is better); all others are
+# times or sizes (lower is better). A metric regresses when it is worse than
+# the baseline by more than --tolerance.
+#
+# No baseline is committed: the first run on the reference machine writes
+# browser_shell_baseline.json, which should then be checked in. The machine
+# needs a working QtWebEngine (its Chromium libraries load X11 and ALSA
+# libraries even offscreen); without one the run stops before any scenario.
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Imported first so a scenario's startup phases count from process start
+import startup
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "browser_shell_baseline.json")
+SCENARIOS = ["startup", "new_tab", "mass_tabs", "session_save", "session_restore", "history", "menus"]
+
+
+# Fixture server
+
+def start_fixture_server():
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.startswith("/style"):
+                body, kind = b"body { font-family: sans-serif; margin: 2em; }", "text/css"
+            else:
+                number = self.path.rsplit("/", 1)[-1] or "0"
+                paragraphs = "".join(f"<p>Paragraph {i} of fixture page {number}.</p>" for i in range(50))
+                body = (f"<!doctype html><html><head><title>Fixture {number}</title>"
+                        f"<link rel=stylesheet href=/style.css></head><body><h1>Fixture {number}</h1>"
+                        f"{paragraphs}</body></html>").encode()
+                kind = "text/html"
+            self.send_response(200)
+            self.send_header("Content-Type", kind)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# Child side: one scenario against a live Browser
+
+def wait_until(app, predicate, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise TimeoutError("condition not reached")
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return ordered[len(ordered) // 2], ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+def run_scenario(name, tabs):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PyQt5.QtWidgets import QApplication, QMenu
+    from browser import Browser
+    import instrumentation
+    import resource
+
+    base_url = start_fixture_server()
+    app = QApplication(sys.argv[:1])
+    # The startup tab and new tabs open a fixture page, not the network
+    window = Browser(home_url=f"{base_url}/page/home")
+    window.show()
+    wait_until(app, lambda: window.started)
+    results = {}
+
+    if name == "startup":
+        phases = dict(startup.phases)
+        results["first_paint_ms"] = phases["first paint"]
+        results["session_restored_ms"] = phases["session restored"]
+
+    elif name == "new_tab":
+        samples = []
+        for i in range(50):
+            # Let the pool refill between tabs, as a person opening tabs would
+            wait_until(app, lambda: window.tab_pool.spares or not window.tab_pool.size, 5.0)
+            started = time.perf_counter()
+            window.add_tab(f"{base_url}/page/{i}")
+            samples.append((time.perf_counter() - started) * 1000)
+            app.processEvents()
+        results["new_tab_p50_ms"], results["new_tab_p95_ms"] = percentiles(samples)
+        # TabPool's own split between tabs taken from the pool and built cold
+        for summary in instrumentation.summaries():
+            if summary["name"].startswith("tab_pool.new_tab_") and summary["count"]:
+                source = summary["name"].rsplit("_", 1)[-1]
+                results[f"new_tab_{source}_p50_ms"] = summary["p50_ms"]
+                results[f"new_tab_{source}_p95_ms"] = summary["p95_ms"]
+
+        # Time to a finished load of a fixture page in a fresh tab
+        loaded = []
+        tab = window.add_tab(f"{base_url}/page/loaded")
+        started = time.perf_counter()
+        tab.browser.loadFinished.connect(lambda ok: loaded.append(time.perf_counter()))
+        wait_until(app, lambda: loaded)
+        results["fixture_load_ms"] = (loaded[0] - started) * 1000
+
+    elif name == "mass_tabs":
+        started = time.perf_counter()
+        for i in range(tabs):
+            window.add_tab(f"{base_url}/page/{i}", activate=False)
+        app.processEvents()
+        results["open_tabs_ms"] = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        while window.tabs.count() > 1:
+            window.close_tab(window.tabs.count() - 1)
+        app.processEvents()
+        results["close_tabs_ms"] = (time.perf_counter() - started) * 1000
+
+    elif name == "session_save":
+        for i in range(200):
+            window.add_placeholder_tab(f"{base_url}/page/{i}", f"Fixture {i}")
+        started = time.perf_counter()
+        window.save_session()
+        window.session.close()
+        results["session_save_ms"] = (time.perf_counter() - started) * 1000
+
+    elif name == "session_restore":
+        # Runs in session_save's working directory, so 200 tabs come back
+        summary = {item["name"]: item for item in instrumentation.summaries()}
+        results["session_restore_ms"] = summary["browser.restore_session"]["max_ms"]
+        results["restored_tabs"] = window.tabs.count()
+
+    elif name == "history":
+        count = 10000
+        started = time.perf_counter()
+        for i in range(count):
+            window.storage.add_history(f"Fixture {i}", f"{base_url}/page/{i}")
+        window.storage.flush()
+        results["history_inserts_per_s"] = count / (time.perf_counter() - started)
+
+    elif name == "menus":
+        for i in range(2000):
+            window.storage.add_history(f"Fixture {i}", f"{base_url}/page/{i}")
+            window.storage.add_bookmark(f"Bookmark {i}", f"{base_url}/page/{i}")
+        window.storage.flush()
+        for method in ("update_history_menu", "update_bookmarks_menu"):
+            menu = QMenu(window)
+            samples = []
+            for _ in range(50):
+                started = time.perf_counter()
+                getattr(window, method)(menu)
+                samples.append((time.perf_counter() - started) * 1000)
+            results[f"{method}_p50_ms"], results[f"{method}_p95_ms"] = percentiles(samples)
+
+    # ru_maxrss is in KiB on Linux
+    results["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    window.close()
+    app.processEvents()
+    return {f"{name}.{key}": round(value, 3) for key, value in results.items()}
+
+
+# Parent side
+
+def run_child(name, tabs, cwd):
+    completed = subprocess.run([sys.executable, os.path.abspath(__file__), "--scenario", name, "--tabs", str(tabs)],
+                               cwd=cwd, capture_output=True, text=True, timeout=600)
+    if completed.returncode != 0:
+        raise RuntimeError(f"scenario {name} failed:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for key, value in sorted(results.items()):
+        previous = baseline.get(key)
+        if previous is None:
+            print(f"  {key:45} {value:12.2f}   (no baseline)")
+            continue
+        higher_is_better = key.endswith("_per_s")
+        change = (value - previous) / previous if previous else 0.0
+        worse = -change if higher_is_better else change
+        flag = "  REGRESSION" if worse > tolerance else ""
+        print(f"  {key:45} {value:12.2f}   baseline {previous:12.2f} ({change:+.1%}){flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", choices=SCENARIOS)
+    parser.add_argument("--tabs", type=int, default=500)
+    parser.add_argument("--output", default="browser_shell_results.json")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(run_scenario(args.scenario, args.tabs)))
+        return
+
+    # Every scenario would fail the same way, each with its own traceback
+    try:
+        import PyQt5.QtWebEngineWidgets
+    except ImportError as e:
+        sys.exit(f"QtWebEngine cannot be loaded, so no scenario can run: {e}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in SCENARIOS:
+            # session_restore reuses the files session_save left behind
+            cwd = os.path.join(workdir, "session" if name.startswith("session") else name)
+            os.makedirs(cwd, exist_ok=True)
+            print(f"running {name}...", file=sys.stderr)
+            results.update(run_child(name, args.tabs, cwd))
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Builds a synthetic history database and measures omnibox keystroke latency.
+#
+#   python benchmarks/omnibox_latency.py [--visits 1000000] [--urls 150000]
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import init_database, frecency_add
+from omnibox import HistorySuggester
+
+WORDS = ("news mail docs github python qt browser search video music maps cloud "
+         "store forum wiki blog sport travel weather finance shop recipe code api "
+         "stack overflow linux kernel release notes download image photo chat").split()
+TLDS = ("com", "org", "net", "io", "dev")
+
+
+def build_database(path, url_count, visit_count, seed=1):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    init_database(cursor)
+
+    now = int(time.time())
+    urls = []
+    for i in range(url_count):
+        host = f"{rng.choice(WORDS)}{rng.choice(WORDS)}{i % 997}.{rng.choice(TLDS)}"
+        path_words = "/".join(rng.choice(WORDS) for _ in range(rng.randint(0, 3)))
+        title = " ".join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(2, 6)))
+        urls.append((f"https://{host}/{path_words}?id={i}", title))
+
+    # Zipf-like popularity, visits spread over the last two years
+    weights = [1.0 / (rank + 1) for rank in range(url_count)]
+    visits = [[] for _ in range(url_count)]
+    for url_index in rng.choices(range(url_count), weights=weights, k=visit_count):
+        visits[url_index].append(now - rng.randint(0, 2 * 365 * 86400))
+
+    rows, visit_rows = [], []
+    for (url, title), times in zip(urls, visits):
+        if not times:
+            continue
+        frecency = None
+        for visit_time in times:
+            frecency = frecency_add(frecency, visit_time)
+        rows.append((len(rows) + 1, url, title, len(times), max(times), frecency))
+        visit_rows.extend((len(rows), visit_time) for visit_time in times)
+    cursor.executemany("INSERT INTO urls (id, url, title, visit_count, last_visit, frecency) VALUES (?, ?, ?, ?, ?, ?)", rows)
+    cursor.executemany("INSERT INTO visits (url_id, visit_time) VALUES (?, ?)", visit_rows)
+    cursor.executemany("INSERT INTO bookmarks (title, url) VALUES (?, ?)", rng.sample(urls, 200))
+    conn.commit()
+    return conn
+
+
+def keystrokes(rng, count):
+    # Every prefix of a typed word or "word word" phrase, as the user types it
+    for _ in range(count):
+        phrase = rng.choice(WORDS)
+        if rng.random() < 0.3:
+            phrase += " " + rng.choice(WORDS)
+        for end in range(1, len(phrase) + 1):
+            yield phrase[:end]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--visits", type=int, default=1000000)
+    parser.add_argument("--urls", type=int, default=150000)
+    parser.add_argument("--phrases", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.db")
+        start = time.perf_counter()
+        build_database(path, args.urls, args.visits).close()
+        print(f"built {args.visits} visits over {args.urls} urls in {time.perf_counter() - start:.1f}s")
+
+        conn = sqlite3.connect(path)
+        suggester = HistorySuggester(conn)
+        rng = random.Random(2)
+        samples = []
+        for text in keystrokes(rng, args.phrases):
+            start = time.perf_counter()
+            suggester.suggest(text)
+            samples.append((time.perf_counter() - start) * 1000)
+        conn.close()
+
+    samples.sort()
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+    print(f"keystrokes={len(samples)} p50={pick(0.50):.2f}ms p95={pick(0.95):.2f}ms "
+          f"p99={pick(0.99):.2f}ms max={samples[-1]:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# Serves a generated file from a local HTTP server with Range support and a
+# per-connection bandwidth cap (like most real servers and CDNs), then
+# compares a single stream against the segmented downloader. Correctness,
+# including resume and the no-Range fallback, is covered by
+# tests/test_segmented_download.py.
+#
+#   python benchmarks/segmented_download.py [--size-mb 64] [--rate-mb 16] [--segments 4]
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from segmented_download import SegmentedDownload, CHUNK_SIZE
+
+
+def make_handler(payload, rate):
+    etag = '"%s"' % hashlib.sha256(payload).hexdigest()[:16]
+
+    class RangeHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            start, end = 0, len(payload) - 1
+            header = self.headers.get("Range")
+            if_range = self.headers.get("If-Range")
+            if header and (if_range is None or if_range == etag):
+                first, _, last = header[len("bytes="):].partition("-")
+                start = int(first)
+                end = min(int(last), end) if last else end
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(payload)}")
+            else:
+                self.send_response(200)
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+
+            # Token bucket per connection
+            step = 64 * 1024
+            began = time.monotonic()
+            sent = 0
+            try:
+                for offset in range(start, end + 1, step):
+                    block = payload[offset:min(offset + step, end + 1)]
+                    self.wfile.write(block)
+                    sent += len(block)
+                    ahead = sent / rate - (time.monotonic() - began)
+                    if ahead > 0:
+                        time.sleep(ahead)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return RangeHandler
+
+
+def single_stream(url, path):
+    with urllib.request.urlopen(url) as response, open(path, "wb") as f:
+        shutil.copyfileobj(response, f, CHUNK_SIZE)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--rate-mb", type=float, default=16.0, help="per-connection cap in MB/s")
+    parser.add_argument("--segments", type=int, default=4)
+    args = parser.parse_args()
+
+    payload = os.urandom(args.size_mb * 1024 * 1024)
+    expected = hashlib.sha256(payload).hexdigest()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(payload, args.rate_mb * 1024 * 1024))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/file.bin"
+    workdir = tempfile.mkdtemp()
+
+    try:
+        path = os.path.join(workdir, "single.bin")
+        started = time.perf_counter()
+        single_stream(url, path)
+        single = time.perf_counter() - started
+
+        path = os.path.join(workdir, "segmented.bin")
+        started = time.perf_counter()
+        download = SegmentedDownload(url, path, segments=args.segments, expected_sha256=expected)
+        download.run()
+        segmented = time.perf_counter() - started
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir)
+
+    if download.state != "completed":
+        sys.exit(f"Segmented download failed: {download.error}")
+
+    size = args.size_mb
+    print(f"{size} MB at {args.rate_mb:g} MB/s per connection")
+    print(f"single stream:         {single:6.2f} s  {size / single:7.1f} MB/s")
+    print(f"segmented ({args.segments} ranges): {segmented:6.2f} s  {size / segmented:7.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
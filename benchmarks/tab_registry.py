@@ -0,0 +1,97 @@
+# Opens, moves and closes thousands of tabs in an offscreen TabWidget and
+# compares TabRegistry's lookup cost against the old linear scan. Registry
+# consistency is covered by tests/test_tab_registry.py.
+#
+#   QT_QPA_PLATFORM=offscreen python benchmarks/tab_registry.py [--tabs 3000] [--ops 20000]
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QWidget
+from tab_registry import TabWidget
+
+
+class FakeTab(QWidget):
+    def __init__(self, tab_id=None):
+        super().__init__()
+        self.tab_id = tab_id or str(uuid.uuid4())
+
+
+def linear_find(tabs, tab_id):
+    for i in range(tabs.count()):
+        if tabs.widget(i).tab_id == tab_id:
+            return i
+    return -1
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tabs", type=int, default=3000)
+    parser.add_argument("--ops", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    rng = random.Random(args.seed)
+    tabs = TabWidget()
+    tabs.setMovable(True)
+    registry = tabs.registry
+
+    started = time.perf_counter()
+    for _ in range(args.tabs):
+        tabs.insertTab(rng.randint(0, tabs.count()), FakeTab(), "tab")
+    opened = time.perf_counter() - started
+
+    # Mixed workload: lookups dominate, as title and style updates do in the browser
+    lookups = structural = 0
+    started = time.perf_counter()
+    for step in range(args.ops):
+        roll = rng.random()
+        if roll < 0.05:
+            tabs.tabBar().moveTab(rng.randrange(tabs.count()), rng.randrange(tabs.count()))
+            structural += 1
+        elif roll < 0.08 and tabs.count() > 1:
+            index = rng.randrange(tabs.count())
+            registry.unregister(tabs.widget(index).tab_id)
+            tabs.removeTab(index)
+            structural += 1
+        elif roll < 0.11:
+            tabs.insertTab(rng.randint(0, tabs.count()), FakeTab(), "tab")
+            structural += 1
+        elif roll < 0.12:
+            # Placeholder swapped for a real tab under the same id
+            index = rng.randrange(tabs.count())
+            old = tabs.widget(index)
+            tabs.insertTab(index, FakeTab(old.tab_id), "tab")
+            tabs.removeTab(index + 1)
+            structural += 1
+        else:
+            registry.index(tabs.widget(rng.randrange(tabs.count())).tab_id)
+            lookups += 1
+    mixed = time.perf_counter() - started
+
+    ids = [tabs.widget(rng.randrange(tabs.count())).tab_id for _ in range(2000)]
+    started = time.perf_counter()
+    for tab_id in ids:
+        registry.index(tab_id)
+    registry_lookup = (time.perf_counter() - started) / len(ids)
+    started = time.perf_counter()
+    for tab_id in ids:
+        linear_find(tabs, tab_id)
+    linear_lookup = (time.perf_counter() - started) / len(ids)
+
+    print(f"{args.tabs} tabs opened at random positions in {opened:.2f} s")
+    print(f"{args.ops} mixed ops ({structural} structural, {lookups} lookups) in {mixed:.2f} s, "
+          f"{tabs.count()} tabs left")
+    print(f"lookup by id: registry {registry_lookup * 1e6:.1f} us, linear scan {linear_lookup * 1e6:.1f} us")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# Measures title-change throughput with grouped tabs: every title change
+# sets the tab text and restyles the tab, as Browser.update_tab_title does.
+# Compares the old per-call widget/stylesheet rebuild with GroupBadge.
+#
+#   QT_QPA_PLATFORM=offscreen python benchmarks/tab_styling.py [--tabs 200] [--changes 5000]
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QWidget, QLabel, QHBoxLayout, QTabBar
+from PyQt5.QtCore import Qt
+from tab_registry import TabWidget
+from tab_badge import apply_group_style
+
+COLORS = ["#1a73e8", "#d93025", "#188038", "#f9ab00", "#a142f4", "#e52592"]
+
+
+class FakeTab(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.tab_id = str(uuid.uuid4())
+
+
+def rebuild_style(tabs, index, group):
+    # The previous update_tab_style
+    group_name, color = group
+    tabs.tabBar().setTabTextColor(index, Qt.white)
+    widget = QWidget()
+    layout = QHBoxLayout()
+    layout.setContentsMargins(0, 0, 0, 0)
+    layout.setSpacing(4)
+    label = QLabel(group_name[0].upper())
+    label.setStyleSheet(f"""
+        QLabel {{
+            color: white;
+            background-color: {color};
+            border-radius: 8px;
+            padding: 2px 6px;
+            font-weight: bold;
+        }}
+    """)
+    layout.addWidget(label)
+    title = QLabel(tabs.tabText(index))
+    title.setStyleSheet("color: white;")
+    layout.addWidget(title)
+    layout.addStretch()
+    widget.setLayout(layout)
+    tabs.tabBar().setTabButton(index, QTabBar.LeftSide, widget)
+
+
+def run(app, tab_count, changes, cached, seed):
+    rng = random.Random(seed)
+    tabs = TabWidget()
+    tabs.resize(1600, 600)
+    tabs.show()
+    groups = {}
+    for i in range(tab_count):
+        tab = FakeTab()
+        tabs.addTab(tab, f"Tab {i}")
+        groups[tab.tab_id] = (f"group{i % 12}", COLORS[i % len(COLORS)])
+
+    def restyle(index):
+        tab_id = tabs.widget(index).tab_id
+        if cached:
+            apply_group_style(tabs.tabBar(), index, tabs.registry.entry(tab_id), groups[tab_id])
+        else:
+            rebuild_style(tabs, index, groups[tab_id])
+
+    for i in range(tab_count):
+        restyle(i)
+    app.processEvents()
+
+    styling = 0.0
+    started = time.perf_counter()
+    for change in range(changes):
+        index = rng.randrange(tab_count)
+        tabs.setTabText(index, f"Page title {change}")
+        styled = time.perf_counter()
+        restyle(index)
+        styling += time.perf_counter() - styled
+        if change % 100 == 0:
+            app.processEvents()
+    app.processEvents()
+    elapsed = time.perf_counter() - started
+    tabs.close()
+    tabs.deleteLater()
+    app.processEvents()
+    return elapsed, styling
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tabs", type=int, default=200)
+    parser.add_argument("--changes", type=int, default=5000)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    rebuilt = run(app, args.tabs, args.changes, cached=False, seed=1)
+    cached = run(app, args.tabs, args.changes, cached=True, seed=1)
+    print(f"{args.tabs} grouped tabs, {args.changes} title changes")
+    for name, (elapsed, styling) in (("rebuild per change", rebuilt), ("cached GroupBadge ", cached)):
+        print(f"{name}: {args.changes / elapsed:6.0f} changes/s, "
+              f"styling {styling / args.changes * 1e6:7.1f} us per change")
+
+
+if __name__ == "__main__":
+    main()
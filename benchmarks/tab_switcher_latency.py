@@ -0,0 +1,67 @@
+# Indexes synthetic tabs and times TabIndex.search for every keystroke of a
+# set of typed queries, the way the quick switcher calls it. Fails (exit
+# status 1) when the 99th percentile keystroke is over TARGET_MS.
+#
+#   python benchmarks/tab_switcher_latency.py [--tabs 1000] [--rounds 5]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tab_switcher import TabIndex
+
+WORDS = ("news mail docs github python qt browser search video music maps cloud "
+         "store forum wiki blog sport travel weather finance shop recipe code api "
+         "stack overflow linux kernel release notes download image photo chat").split()
+QUERIES = ["github python", "gthbpy", "stack overflow qt", "weather", "docs api", "linux kernel notes",
+           "mail", "shop recipe", "zzzz", "wiki travel", "rn", "cloud"]
+TARGET_MS = 2.0
+
+
+def build_index(tabs, rng):
+    index = TabIndex()
+    now = time.time()
+    for i in range(tabs):
+        title = " ".join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(3, 9)))
+        url = f"https://{rng.choice(WORDS)}.{rng.choice(WORDS)}.com/" + "/".join(
+            rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+        group = rng.choice(["", "", "", "work", "research", "shopping"])
+        index.update(str(i), title=title, url=url, group=group, last_active=now - rng.random() * 86400)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tabs", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    timings = []
+    for _ in range(args.rounds):
+        index = build_index(args.tabs, rng)
+        for query in QUERIES:
+            for end in range(len(query) + 1):
+                started = time.perf_counter()
+                index.search(query[:end])
+                timings.append((time.perf_counter() - started, query[:end]))
+            # An update between queries invalidates the narrowing cache
+            index.update(str(rng.randrange(args.tabs)), title="Release notes " + query)
+
+    timings.sort()
+    p50 = timings[len(timings) // 2][0] * 1000
+    p99 = timings[int(len(timings) * 0.99)][0] * 1000
+    print(f"{args.tabs} tabs, {args.rounds} rounds, {len(timings)} keystrokes: p50 {p50:.2f} ms, "
+          f"p99 {p99:.2f} ms, max {timings[-1][0] * 1000:.2f} ms")
+    print("slowest: " + ", ".join(f"{query!r} {elapsed * 1000:.2f} ms" for elapsed, query in timings[:-6:-1]))
+    passed = p99 <= TARGET_MS
+    print(f"{'PASS' if passed else 'FAIL'}: p99 {p99:.2f} ms against a {TARGET_MS:.1f} ms target")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,101 +1,159 @@
-from PyQt5.QtWidgets import (QMainWindow, QToolBar, QAction, QTabWidget, QMenu, 
-                            QInputDialog, QColorDialog, QTabBar, QLabel, 
-                            QHBoxLayout, QWidget, QSizePolicy, QLineEdit, QMessageBox)
+from PyQt5.QtWidgets import (QMainWindow, QToolBar, QAction, QMenu, 
+                            QInputDialog, QColorDialog, QWidget, QSizePolicy, QLineEdit, QMessageBox)
 from PyQt5.QtGui import QIcon, QPixmap
-from PyQt5.QtCore import Qt, QUrl, QSize
-from tab import BrowserTab
-from about import AboutDialog
-from settings import SettingsDialog
+from PyQt5.QtCore import Qt, QUrl, QSize, QTimer, pyqtSignal
+from tab import BrowserTab, TabPlaceholder
+from tab_registry import TabWidget
+from tab_badge import apply_group_style
+from tab_switcher import TabIndex, TabSwitcher
 from icons import Icons
 from resources import AnimationPlayer
+from storage import StorageWorker, init_database
+from omnibox import Omnibox
+from lifecycle import TabLifecycleManager
+from tab_pool import TabPool
+from profiles import ProfileManager
+from downloads import DownloadManager, DownloadsDialog, mark_interrupted
+from session import SessionJournal, load_session, encode_history, decode_history
+from config import BACKGROUND_RESTORE_TABS, RECENTLY_CLOSED_TABS, INSTRUMENTATION_DUMP_PATH
+from startup import FirstPaintWatcher
+from settings_store import SettingsStore
+from resource_monitor import ResourceMonitor, TaskManagerDialog
+from page_loads import PageLoadsDialog
+from instrumentation import StallWatchdog, InstrumentationDialog, timed
+import instrumentation
+import startup
+from collections import deque
 import sqlite3
 import os
-import json
 import uuid
+import time
 import logging
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class Browser(QMainWindow):
-    def __init__(self):
+    # A storage job's result, emitted on the storage thread and delivered on
+    # the GUI thread: the confirmation to show and the job's error or None
+    writeFinished = pyqtSignal(object, object)
+
+    def __init__(self, home_url=None):
         super().__init__()
         self.setWindowTitle("Utharam Browser")
         self.setGeometry(100, 100, 1200, 800)
         self.setMinimumSize(800, 600)
 
-        # Initialize database
-        self.init_database()
+        # Stage one builds only the window frame; everything that touches the
+        # database or the session file waits until it has been painted
+        self.started = False
+        self.tab_groups = {}
+        # tab_ids of open incognito tabs, which stay out of the session files
+        self.private_tabs = set()
+
+        # Captures the main thread's stack whenever the event loop stalls
+        self.watchdog = StallWatchdog(self)
+
+        # Settings are read once here; tabs share the in-memory snapshot
+        self.settings = SettingsStore.shared()
+        # Overrides the home page setting for this window only
+        self.home_url = home_url
+        self.writeFinished.connect(self.confirm_write)
+
+        # Shared persistent and off-the-record profiles with configured caches
+        self.profiles = ProfileManager(self)
+
+        # As-you-type suggestions for every url bar, queried off the GUI thread
+        self.omnibox = Omnibox("browser_data.db", self)
 
-        # Tab widget
-        self.tabs = QTabWidget()
+        # Tab widget; the registry looks tabs up by tab_id
+        self.tabs = TabWidget()
+        self.registry = self.tabs.registry
+        self.tab_index = TabIndex()
         self.tabs.setTabsClosable(True)
         self.tabs.tabCloseRequested.connect(self.close_tab)
         self.tabs.setMovable(True)
         self.tabs.setDocumentMode(True)
+        self.tabs.currentChanged.connect(self.on_current_tab_changed)
         self.setCentralWidget(self.tabs)
+        self.materializing = False
 
-        self.tab_groups = {}
-        self.add_tab()
+        # Discards idle background tabs and tracks reclaimed memory
+        self.lifecycle = TabLifecycleManager(self)
+
+        # Pre-built spare tabs, refilled whenever the event loop is idle
+        self.tab_pool = TabPool(self)
 
-        # Create toolbar
+        # Create toolbar; disabled until the rest of startup has run
         self.create_toolbar()
+        self.toolbar.setEnabled(False)
+
+        self.first_paint = FirstPaintWatcher(self)
+        self.first_paint.painted.connect(self.on_first_paint)
+        startup.mark("window constructed")
+
+    def on_first_paint(self):
+        startup.mark("first paint")
+        # Let the paint finish and reach the screen before the slow stage
+        QTimer.singleShot(0, self.finish_startup)
+
+    @timed("browser.finish_startup")
+    def finish_startup(self):
+        # Initialize database and the background writer that owns all writes
+        self.init_database()
+        self.storage = StorageWorker("browser_data.db")
+        self.storage.start()
+        startup.mark("database ready")
+
+        # One download handler per profile, not per tab
+        self.downloads = DownloadManager(self)
+
+        # Samples renderer memory and CPU per tab off the GUI thread
+        self.resource_monitor = ResourceMonitor(self)
+
+        # Tab changes are journaled as they happen instead of only on close
+        seq, self.saved_tabs, closed = load_session()
+        self.recently_closed = deque(closed, maxlen=RECENTLY_CLOSED_TABS)
+        self.session = SessionJournal(seq, self.saved_tabs, closed)
+        self.session.start()
+        self.tabs.tabBar().tabMoved.connect(self.on_tab_moved)
+
+        self.add_tab()
 
         # Initialize tab search
         self.init_tab_search()
+        self.init_new_tab_shortcut()
 
         # Load saved tab groups
         self.load_tab_groups()
 
         # Restore session
         self.restore_session()
+        self.started = True
+        self.toolbar.setEnabled(True)
+        startup.mark("session restored")
+
+        # The current tab is interactive once its first load finishes
+        current_tab = self.tabs.currentWidget()
+        if current_tab is not None and not current_tab.is_placeholder:
+            current_tab.browser.loadFinished.connect(self.on_first_load_finished)
+        self.tab_pool.schedule_refill()
+
+    def on_first_load_finished(self):
+        self.sender().loadFinished.disconnect(self.on_first_load_finished)
+        startup.mark("first tab interactive")
 
     def init_database(self):
         self.conn = sqlite3.connect("browser_data.db")
         self.cursor = self.conn.cursor()
-        
-        # Create schema_version table if it doesn't exist
-        self.cursor.execute('''CREATE TABLE IF NOT EXISTS schema_version
-                             (version INTEGER PRIMARY KEY)''')
-        
-        # Get current schema version
-        self.cursor.execute("SELECT version FROM schema_version")
-        version = self.cursor.fetchone()
-        if not version:
-            version = 1
-            self.cursor.execute("INSERT INTO schema_version (version) VALUES (?)", (version,))
-        else:
-            version = version[0]
-        
-        # Create or update tables based on version
-        if version == 1:
-            self.cursor.execute('''CREATE TABLE IF NOT EXISTS bookmarks
-                                 (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT, url TEXT)''')
-            self.cursor.execute('''CREATE TABLE IF NOT EXISTS history
-                                 (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT, url TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
-            
-            # Check if tab_groups table exists and its structure
-            self.cursor.execute("PRAGMA table_info(tab_groups)")
-            columns = [info[1] for info in self.cursor.fetchall()]
-            
-            if "tab_groups" not in [table[0] for table in self.cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")]:
-                self.cursor.execute('''CREATE TABLE tab_groups
-                                     (tab_id TEXT PRIMARY KEY, group_name TEXT, color TEXT)''')
-            elif "tab_index" in columns and "tab_id" not in columns:
-                self.cursor.execute('''CREATE TABLE tab_groups_new
-                                     (tab_id TEXT PRIMARY KEY, group_name TEXT, color TEXT)''')
-                self.cursor.execute('''INSERT INTO tab_groups_new (tab_id, group_name, color)
-                                     SELECT CAST(tab_index AS TEXT), group_name, color FROM tab_groups''')
-                self.cursor.execute('''DROP TABLE tab_groups''')
-                self.cursor.execute('''ALTER TABLE tab_groups_new RENAME TO tab_groups''')
-                self.cursor.execute("UPDATE schema_version SET version = 2")
-                version = 2
-        
-        if version == 2:
-            pass
-        
+        init_database(self.cursor)
+        # Before anything reads the downloads table
+        mark_interrupted(self.cursor)
         self.conn.commit()
 
+        # WAL lets the GUI connection read while the storage worker writes
+        self.cursor.execute("PRAGMA journal_mode=WAL")
+
     def create_toolbar(self):
         # Main toolbar
         self.toolbar = QToolBar("Navigation")
@@ -135,6 +193,7 @@ class Browser(QMainWindow):
         self.url_bar.setPlaceholderText("Search Google or type URL")
         self.url_bar.setClearButtonEnabled(True)
         self.url_bar.returnPressed.connect(self.navigate_to_url)
+        self.omnibox.attach(self.url_bar)
         self.toolbar.addWidget(self.url_bar)
 
         # Extensions spacer
@@ -160,26 +219,160 @@ class Browser(QMainWindow):
         devtools_btn.triggered.connect(self.toggle_dev_tools)
         self.toolbar.addAction(devtools_btn)
 
-    def add_tab(self, url=None, incognito=False):
-        browser_tab = BrowserTab(self, incognito)
-        i = self.tabs.addTab(browser_tab, "New Tab")
-        self.tabs.setCurrentIndex(i)
+    @timed("browser.add_tab")
+    def add_tab(self, url=None, incognito=False, tab_id=None, index=None, activate=True, history=None):
+        started = time.perf_counter()
+        browser_tab = None if incognito else self.tab_pool.take(tab_id)
+        from_pool = browser_tab is not None
+        if browser_tab is None:
+            browser_tab = BrowserTab(self, incognito, tab_id, self.profiles.profile(incognito))
+        self.lifecycle.tab_added(browser_tab)
+        if index is None:
+            i = self.tabs.addTab(browser_tab, "New Tab")
+        else:
+            i = self.tabs.insertTab(index, browser_tab, "New Tab")
+        self.omnibox.attach(browser_tab.url_bar)
+        if activate:
+            self.tabs.setCurrentIndex(i)
         
-        browser_tab.urlChanged.connect(lambda url: self.update_tab_title(i, browser_tab))
-        browser_tab.titleChanged.connect(lambda title: self.update_tab_title(i, browser_tab))
+        browser_tab.urlChanged.connect(lambda url: self.update_tab_title(browser_tab.tab_id))
+        browser_tab.titleChanged.connect(lambda title: self.update_tab_title(browser_tab.tab_id))
         
         if not incognito:
-            browser_tab.urlChanged.connect(self.add_to_history)
-        
-        if url:
+            browser_tab.navigationCommitted.connect(lambda url: self.record_navigation(browser_tab, url))
+            browser_tab.titleChanged.connect(lambda title: self.session.updated(browser_tab.tab_id, title=title))
+            browser_tab.visited.connect(lambda url, title: self.add_to_history(browser_tab, url, title))
+            browser_tab.titleChanged.connect(lambda title: self.update_history_title(browser_tab, title))
+            browser_tab.pageLoaded.connect(self.storage.add_page_load)
+        
+        if history:
+            browser_tab.restore_history(history)
+        elif url:
             browser_tab.browser.setUrl(QUrl(url))
         else:
-            browser_tab.browser.setUrl(QUrl("https://www.google.com"))
+            browser_tab.browser.setUrl(QUrl(self.home_page()))
+        self.journal_opened(i)
         
         self.update_tab_style(i)
+        self.tab_pool.record_latency(started, from_pool)
         return browser_tab
 
-    def update_tab_title(self, index, browser_tab):
+    @timed("browser.add_placeholder_tab")
+    def add_placeholder_tab(self, url, title, tab_id=None, incognito=False, last_active=0.0, history=None):
+        placeholder = TabPlaceholder(url, title, tab_id, incognito, last_active, self, history=history)
+        i = self.tabs.addTab(placeholder, title[:20] + "..." if len(title) > 20 else title)
+        self.tabs.setTabToolTip(i, url)
+        entry = self.registry.entry(placeholder.tab_id)
+        entry.title, entry.url = title, url
+        self.update_tab_index(placeholder.tab_id, title=title, url=url, last_active=last_active)
+        self.journal_opened(i)
+        self.update_tab_style(i)
+        return placeholder
+
+    @timed("browser.materialize_tab")
+    def materialize_tab(self, index, activate=True):
+        placeholder = self.tabs.widget(index)
+        if placeholder is None or not placeholder.is_placeholder:
+            return placeholder
+
+        # Insert the real tab in front of the placeholder, then drop it. The
+        # guard stops the currentChanged signals fired here from recursing.
+        self.materializing = True
+        try:
+            was_current = self.tabs.currentIndex() == index
+            tab = self.add_tab(placeholder.url, placeholder.incognito, placeholder.tab_id,
+                               index=index, activate=activate or was_current, history=placeholder.history)
+            tab.last_active = placeholder.last_active
+            tab.pinned = placeholder.pinned
+            self.tabs.setTabText(index, self.tabs.tabText(index + 1))
+            self.tabs.removeTab(index + 1)
+            placeholder.deleteLater()
+        finally:
+            self.materializing = False
+        self.update_tab_style(index)
+        return tab
+
+    @timed("browser.discard_tab")
+    def discard_tab(self, index):
+        tab = self.tabs.widget(index)
+        if tab is None or tab.is_placeholder:
+            return None
+
+        title = self.tabs.tabText(index)
+        placeholder = TabPlaceholder(tab.current_url(), title, tab.tab_id, tab.incognito, tab.last_active, self,
+                                     history=tab.save_history(), pinned=tab.pinned, discarded=True)
+        self.materializing = True
+        try:
+            self.tabs.insertTab(index, placeholder, title)
+            self.tabs.setTabToolTip(index, placeholder.url)
+            self.tabs.removeTab(index + 1)
+            tab.deleteLater()
+        finally:
+            self.materializing = False
+        self.update_tab_style(index)
+        return placeholder
+
+    @timed("browser.on_current_tab_changed")
+    def on_current_tab_changed(self, index):
+        if self.materializing or index < 0:
+            return
+        tab = self.tabs.widget(index)
+        if tab is None:
+            return
+        self.lifecycle.tab_activated(tab)
+        if tab.is_placeholder:
+            tab = self.materialize_tab(index)
+        tab.last_active = time.time()
+        self.update_tab_index(tab.tab_id, last_active=tab.last_active)
+        self.journal_updated(tab, last_active=tab.last_active)
+
+    def on_tab_moved(self, from_index, to_index):
+        tab = self.tabs.widget(to_index)
+        if not tab.incognito:
+            self.session.moved(tab.tab_id, self.session_index(to_index))
+
+    # Incognito tabs never reach the session journal or snapshot. Positions
+    # in the journal count only the tabs that are saved.
+
+    def session_index(self, index):
+        if not self.private_tabs:
+            return index
+        return sum(1 for i in range(index) if not self.tabs.widget(i).incognito)
+
+    def journal_opened(self, index):
+        tab = self.tabs.widget(index)
+        if tab.incognito:
+            self.private_tabs.add(tab.tab_id)
+        else:
+            self.session.opened(self.tab_state(index), self.session_index(index))
+
+    def journal_updated(self, tab, **fields):
+        if not tab.incognito:
+            self.session.updated(tab.tab_id, **fields)
+
+    def restore_background_tabs(self, budget=BACKGROUND_RESTORE_TABS):
+        if self.settings.get("lazy_background_tabs"):
+            return
+        placeholders = [self.tabs.widget(i) for i in range(self.tabs.count())]
+        placeholders = [tab for tab in placeholders if tab.is_placeholder]
+        placeholders.sort(key=lambda tab: tab.last_active, reverse=True)
+
+        # Load one tab per event-loop turn so startup stays responsive
+        for delay, placeholder in enumerate(placeholders[:budget]):
+            QTimer.singleShot(200 * (delay + 1),
+                              lambda tab_id=placeholder.tab_id: self.materialize_tab(self.find_tab(tab_id), activate=False))
+
+    def find_tab(self, tab_id):
+        return self.registry.index(tab_id)
+
+    @timed("browser.update_tab_title")
+    def update_tab_title(self, tab_id):
+        entry = self.registry.entry(tab_id)
+        index = self.registry.index(tab_id)
+        if index < 0:
+            return
+        browser_tab = entry.widget
+        entry.url = browser_tab.current_url()
         title = browser_tab.browser.title()
         if not title:
             title = browser_tab.browser.url().toString()
@@ -187,21 +380,34 @@ class Browser(QMainWindow):
                 title = title[8:]
             elif title.startswith("http://"):
                 title = title[7:]
-        
-        self.tabs.setTabText(index, title[:20] + "..." if len(title) > 20 else title)
+        entry.title = title
+        self.update_tab_index(tab_id, title=title, url=entry.url)
+
+        # Relaying out the tab bar is the expensive part; skip it for no-op changes
+        text = title[:20] + "..." if len(title) > 20 else title
+        if self.tabs.tabText(index) != text:
+            self.tabs.setTabText(index, text)
         self.update_tab_style(index)
 
+    @timed("browser.close_tab")
     def close_tab(self, index):
         if self.tabs.count() > 1:
             widget = self.tabs.widget(index)
             if widget:
+                self.lifecycle.tab_removed(widget.tab_id)
+                self.registry.unregister(widget.tab_id)
+                self.tab_index.remove(widget.tab_id)
                 if widget.tab_id in self.tab_groups:
-                    self.cursor.execute("DELETE FROM tab_groups WHERE tab_id = ?", (widget.tab_id,))
-                    self.conn.commit()
+                    self.storage.remove_tab_group(widget.tab_id)
                     del self.tab_groups[widget.tab_id]
+                state = dict(self.tab_state(index), index=index)
+                self.recently_closed.append(state)
+                if widget.incognito:
+                    self.private_tabs.discard(widget.tab_id)
+                else:
+                    self.session.closed(widget.tab_id, state)
                 widget.deleteLater()
             self.tabs.removeTab(index)
-            self.update_tab_styles()
 
     def navigate_back(self):
         current_tab = self.tabs.currentWidget()
@@ -218,10 +424,13 @@ class Browser(QMainWindow):
         if current_tab:
             current_tab.browser.reload()
 
+    def home_page(self):
+        return self.home_url or self.settings.get("home_url") or "about:blank"
+
     def go_home(self):
         current_tab = self.tabs.currentWidget()
         if current_tab:
-            current_tab.browser.setUrl(QUrl("https://www.google.com"))
+            current_tab.browser.setUrl(QUrl(self.home_page()))
 
     def navigate_to_url(self):
         current_tab = self.tabs.currentWidget()
@@ -231,14 +440,10 @@ class Browser(QMainWindow):
     def add_bookmark(self):
         current_tab = self.tabs.currentWidget()
         if current_tab and not current_tab.incognito:
-            try:
-                url = current_tab.browser.url().toString()
-                title = current_tab.browser.title() or url
-                self.cursor.execute("INSERT INTO bookmarks (title, url) VALUES (?, ?)", (title, url))
-                self.conn.commit()
-                self.show_bookmark_animation()
-            except sqlite3.Error as e:
-                QMessageBox.warning(self, "Database Error", f"Failed to add bookmark: {str(e)}")
+            url = current_tab.browser.url().toString()
+            title = current_tab.browser.title() or url
+            self.storage.add_bookmark(title, url)
+            self.show_bookmark_animation()
 
     def show_bookmark_animation(self):
         anim = AnimationPlayer(self)
@@ -249,15 +454,18 @@ class Browser(QMainWindow):
         from PyQt5.QtCore import QTimer
         QTimer.singleShot(2000, anim.deleteLater)
 
-    def add_to_history(self, url):
-        current_tab = self.tabs.currentWidget()
-        if current_tab and not current_tab.incognito:
-            try:
-                title = current_tab.browser.title() or url
-                self.cursor.execute("INSERT INTO history (title, url) VALUES (?, ?)", (title, url))
-                self.conn.commit()
-            except sqlite3.Error as e:
-                logging.error(f"Failed to add to history: {str(e)}")
+    @timed("browser.add_to_history")
+    def add_to_history(self, tab, url, title=""):
+        if tab.incognito or url == "about:blank":
+            return
+        # Titles that change after the load are filled in by update_history_title
+        self.storage.add_history(title or url, url)
+
+    @timed("browser.update_history_title")
+    def update_history_title(self, tab, title):
+        if tab.incognito or not title or tab.visited_url is None:
+            return
+        self.storage.update_title(tab.visited_url.toString(), title)
 
     def init_tab_search(self):
         self.tab_search_action = QAction("Search Tabs", self)
@@ -265,21 +473,31 @@ class Browser(QMainWindow):
         self.tab_search_action.triggered.connect(self.show_tab_search)
         self.addAction(self.tab_search_action)
 
+    def init_new_tab_shortcut(self):
+        self.new_tab_action = QAction("New Tab", self)
+        self.new_tab_action.setShortcut("Ctrl+T")
+        self.new_tab_action.triggered.connect(lambda: self.add_tab())
+        self.addAction(self.new_tab_action)
+
+        self.reopen_tab_action = QAction("Reopen Closed Tab", self)
+        self.reopen_tab_action.setShortcut("Ctrl+Shift+T")
+        self.reopen_tab_action.triggered.connect(self.reopen_closed_tab)
+        self.addAction(self.reopen_tab_action)
+
+        self.task_manager_action = QAction("Task Manager", self)
+        self.task_manager_action.setShortcut("Shift+Esc")
+        self.task_manager_action.triggered.connect(self.show_task_manager)
+        self.addAction(self.task_manager_action)
+
+    def update_tab_index(self, tab_id, **fields):
+        group = self.tab_groups.get(tab_id)
+        self.tab_index.update(tab_id, group=group[0] if group else "", **fields)
+
     def show_tab_search(self):
-        dialog = QInputDialog(self)
-        dialog.setWindowTitle("Search Tabs")
-        dialog.setLabelText("Search open tabs:")
-        
-        tab_titles = [self.tabs.tabText(i) for i in range(self.tabs.count())]
-        dialog.setComboBoxItems(tab_titles)
-        dialog.setComboBoxEditable(True)
-        
-        if dialog.exec_():
-            selected_text = dialog.textValue()
-            for i in range(self.tabs.count()):
-                if selected_text.lower() in self.tabs.tabText(i).lower():
-                    self.tabs.setCurrentIndex(i)
-                    break
+        switcher = TabSwitcher(self.tab_index, self)
+        switcher.tabChosen.connect(lambda tab_id: self.tabs.setCurrentIndex(self.registry.index(tab_id)))
+        switcher.move(self.mapToGlobal(self.rect().center()) - switcher.rect().center())
+        switcher.exec_()
 
     def group_tab(self):
         current_index = self.tabs.currentIndex()
@@ -292,9 +510,9 @@ class Browser(QMainWindow):
             color = QColorDialog.getColor()
             if color.isValid():
                 self.tab_groups[current_tab.tab_id] = (group_name, color.name())
-                self.cursor.execute("INSERT OR REPLACE INTO tab_groups (tab_id, group_name, color) VALUES (?, ?, ?)",
-                                   (current_tab.tab_id, group_name, color.name()))
-                self.conn.commit()
+                self.storage.set_tab_group(current_tab.tab_id, group_name, color.name())
+                self.journal_updated(current_tab, group=self.tab_groups[current_tab.tab_id])
+                self.update_tab_index(current_tab.tab_id)
                 self.update_tab_style(current_index)
 
     def load_tab_groups(self):
@@ -302,48 +520,21 @@ class Browser(QMainWindow):
             self.cursor.execute("SELECT tab_id, group_name, color FROM tab_groups")
             for tab_id, group_name, color in self.cursor.fetchall():
                 self.tab_groups[tab_id] = (group_name, color)
-                for i in range(self.tabs.count()):
-                    tab = self.tabs.widget(i)
-                    if tab and tab.tab_id == tab_id:
-                        self.update_tab_style(i)
+                index = self.registry.index(tab_id)
+                if index >= 0:
+                    self.update_tab_style(index)
+                    self.update_tab_index(tab_id)
         except sqlite3.Error as e:
             logging.error(f"Failed to load tab groups: {str(e)}")
 
+    @timed("browser.update_tab_style")
     def update_tab_style(self, index):
         tab = self.tabs.widget(index)
-        if not tab or tab.tab_id not in self.tab_groups:
-            self.tabs.tabBar().setTabTextColor(index, Qt.white)
-            self.tabs.tabBar().setTabButton(index, QTabBar.LeftSide, None)
-            return
-        
-        group_name, color = self.tab_groups[tab.tab_id]
-        self.tabs.tabBar().setTabTextColor(index, color)
-        
-        widget = QWidget()
-        layout = QHBoxLayout()
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(4)
-        
-        label = QLabel(group_name[0].upper())
-        label.setStyleSheet(f"""
-            QLabel {{
-                color: white;
-                background-color: {color};
-                border-radius: 8px;
-                padding: 2px 6px;
-                font-weight: bold;
-            }}
-        """)
-        layout.addWidget(label)
-        
-        title = QLabel(self.tabs.tabText(index))
-        title.setStyleSheet("color: white;")
-        layout.addWidget(title)
-        layout.addStretch()
-        
-        widget.setLayout(layout)
-        self.tabs.tabBar().setTabButton(index, QTabBar.LeftSide, widget)
+        entry = self.registry.entry(tab.tab_id) if tab else None
+        if entry is not None:
+            apply_group_style(self.tabs.tabBar(), index, entry, self.tab_groups.get(tab.tab_id))
 
+    @timed("browser.update_tab_styles")
     def update_tab_styles(self):
         for i in range(self.tabs.count()):
             self.update_tab_style(i)
@@ -354,9 +545,22 @@ class Browser(QMainWindow):
             current_tab.toggle_dev_tools()
 
     def show_downloads(self):
-        downloads_tab = self.add_tab("chrome://downloads", incognito=False)
-        self.tabs.setTabText(self.tabs.currentIndex(), "Downloads")
+        dialog = DownloadsDialog(self)
+        dialog.exec_()
+
+    def show_task_manager(self):
+        dialog = TaskManagerDialog(self)
+        dialog.show()
+
+    def show_performance_stats(self):
+        dialog = InstrumentationDialog(self)
+        dialog.show()
+
+    def show_page_loads(self):
+        dialog = PageLoadsDialog(self)
+        dialog.show()
 
+    @timed("browser.show_main_menu")
     def show_main_menu(self):
         menu = QMenu(self)
         
@@ -369,6 +573,12 @@ class Browser(QMainWindow):
         new_incognito.setShortcut("Ctrl+Shift+N")
         new_incognito.triggered.connect(lambda: self.add_tab(incognito=True))
         menu.addAction(new_incognito)
+
+        reopen_tab = QAction("Reopen Closed Tab", self)
+        reopen_tab.setShortcut("Ctrl+Shift+T")
+        reopen_tab.setEnabled(bool(self.recently_closed))
+        reopen_tab.triggered.connect(self.reopen_closed_tab)
+        menu.addAction(reopen_tab)
         
         menu.addSeparator()
         
@@ -385,9 +595,36 @@ class Browser(QMainWindow):
         group_action = QAction("Group This Tab", self)
         group_action.triggered.connect(self.group_tab)
         menu.addAction(group_action)
+
+        current_tab = self.tabs.currentWidget()
+        pin_action = QAction("Unpin This Tab" if current_tab and current_tab.pinned else "Pin This Tab", self)
+        pin_action.triggered.connect(self.toggle_pin_tab)
+        menu.addAction(pin_action)
+
+        if current_tab and not current_tab.is_placeholder:
+            blocked_action = QAction(f"Blocked Requests on This Page: {current_tab.blocker.blocked_count}", self)
+            blocked_action.setEnabled(False)
+            menu.addAction(blocked_action)
         
         menu.addSeparator()
         
+        task_manager_action = QAction("Task Manager", self)
+        task_manager_action.setShortcut("Shift+Esc")
+        task_manager_action.triggered.connect(self.show_task_manager)
+        menu.addAction(task_manager_action)
+
+        page_loads_action = QAction("Page Load Times", self)
+        page_loads_action.triggered.connect(self.show_page_loads)
+        menu.addAction(page_loads_action)
+
+        stats_action = QAction("Performance Statistics", self)
+        stats_action.triggered.connect(self.show_performance_stats)
+        menu.addAction(stats_action)
+
+        cache_action = QAction("Cache Statistics", self)
+        cache_action.triggered.connect(self.show_cache_stats)
+        menu.addAction(cache_action)
+
         settings_action = QAction("Settings", self)
         settings_action.triggered.connect(self.show_settings)
         menu.addAction(settings_action)
@@ -408,6 +645,13 @@ class Browser(QMainWindow):
         
         menu.exec_(self.mapToGlobal(self.toolbar.geometry().bottomLeft()))
 
+    def toggle_pin_tab(self):
+        current_tab = self.tabs.currentWidget()
+        if current_tab:
+            current_tab.pinned = not current_tab.pinned
+            self.journal_updated(current_tab, pinned=current_tab.pinned)
+
+    @timed("browser.update_bookmarks_menu")
     def update_bookmarks_menu(self, menu):
         menu.clear()
         try:
@@ -420,11 +664,12 @@ class Browser(QMainWindow):
         except sqlite3.Error as e:
             QMessageBox.warning(self, "Database Error", f"Failed to load bookmarks: {str(e)}")
 
+    @timed("browser.update_history_menu")
     def update_history_menu(self, menu):
         menu.clear()
         try:
-            self.cursor.execute("SELECT title, url, timestamp FROM history ORDER BY timestamp DESC LIMIT 20")
-            for title, url, timestamp in self.cursor.fetchall():
+            self.cursor.execute("SELECT title, url, last_visit FROM urls ORDER BY last_visit DESC LIMIT 20")
+            for title, url, last_visit in self.cursor.fetchall():
                 action = QAction(f"{title[:30]} - {url[:30]}", self)
                 action.setToolTip(url)
                 action.triggered.connect(lambda checked, u=url: self.add_tab(u))
@@ -432,71 +677,135 @@ class Browser(QMainWindow):
         except sqlite3.Error as e:
             QMessageBox.warning(self, "Database Error", f"Failed to load history: {str(e)}")
 
+    def show_cache_stats(self):
+        lines = []
+        for name, stats in self.profiles.cache_stats().items():
+            lines.append(f"{name.capitalize()}: {stats['type']} cache, "
+                         f"{stats['disk_size'] / 1048576:.1f} of {stats['max_size'] / 1048576:.0f} MB "
+                         f"in {stats['disk_entries']} files")
+        QMessageBox.information(self, "Cache Statistics", "\n".join(lines))
+
     def show_settings(self):
-        settings_dialog = SettingsDialog()
+        # Dialog modules are imported on first use, not at startup
+        from settings import SettingsDialog
+        settings_dialog = SettingsDialog(self.settings, self)
         settings_dialog.exec_()
 
     def show_about(self):
+        from about import AboutDialog
         about_dialog = AboutDialog()
         about_dialog.exec_()
 
+    def tab_state(self, index):
+        tab = self.tabs.widget(index)
+        return {
+            "url": tab.current_url(),
+            "title": self.tabs.tabText(index),
+            "tab_id": tab.tab_id,
+            "incognito": tab.incognito,
+            "group": self.tab_groups.get(tab.tab_id, None),
+            "last_active": tab.last_active,
+            "pinned": tab.pinned,
+            "history": None if tab.incognito else encode_history(tab.save_history())
+        }
+
+    @timed("browser.record_navigation")
+    def record_navigation(self, tab, url):
+        # The back/forward stack changes with every committed navigation
+        self.session.updated(tab.tab_id, url=url, history=encode_history(tab.save_history()))
+
+    def reopen_closed_tab(self):
+        if not self.recently_closed:
+            return
+        state = self.recently_closed.pop()
+        if state.get("group"):
+            self.tab_groups[state["tab_id"]] = tuple(state["group"])
+            self.storage.set_tab_group(state["tab_id"], state["group"][0], state["group"][1])
+        index = min(state.get("index", self.tabs.count()), self.tabs.count())
+        tab = self.add_tab(state["url"], state["incognito"], state["tab_id"], index=index,
+                           history=decode_history(state.get("history")))
+        if state.get("pinned"):
+            tab.pinned = True
+            self.journal_updated(tab, pinned=True)
+
+    @timed("browser.save_session")
     def save_session(self):
-        session = []
-        for i in range(self.tabs.count()):
-            tab = self.tabs.widget(i)
-            session.append({
-                "url": tab.browser.url().toString(),
-                "title": self.tabs.tabText(i),
-                "tab_id": tab.tab_id,
-                "incognito": tab.incognito,
-                "group": self.tab_groups.get(tab.tab_id, None)
-            })
-        try:
-            with open("session.json", "w") as f:
-                json.dump(session, f)
-        except Exception as e:
-            logging.error(f"Failed to save session: {str(e)}")
+        # Rewrites the snapshot from the live tabs, off the GUI thread
+        saved = [i for i in range(self.tabs.count()) if not self.tabs.widget(i).incognito]
+        self.session.compact([self.tab_state(i) for i in saved],
+                             [state for state in self.recently_closed if not state["incognito"]])
 
+    @timed("browser.restore_session")
     def restore_session(self):
         try:
-            with open("session.json", "r") as f:
-                session = json.load(f)
-            for tab_data in session:
-                tab = self.add_tab(tab_data["url"], tab_data["incognito"])
-                self.tabs.setTabText(self.tabs.indexOf(tab), tab_data["title"])
-                if tab_data["group"]:
-                    self.tab_groups[tab.tab_id] = tab_data["group"]
-                    self.cursor.execute("INSERT OR REPLACE INTO tab_groups (tab_id, group_name, color) VALUES (?, ?, ?)",
-                                       (tab.tab_id, tab_data["group"][0], tab_data["group"][1]))
-            self.conn.commit()
+            # Restored tabs start as placeholders; only the most recently
+            # used one is loaded now, the rest load when first activated
+            restored = []
+            for tab_data in self.saved_tabs:
+                if tab_data["group"] and tab_data.get("tab_id"):
+                    self.tab_groups[tab_data["tab_id"]] = tab_data["group"]
+                    self.storage.set_tab_group(tab_data["tab_id"], tab_data["group"][0], tab_data["group"][1])
+                placeholder = self.add_placeholder_tab(tab_data["url"], tab_data["title"],
+                                                       tab_data.get("tab_id"), tab_data["incognito"],
+                                                       tab_data.get("last_active", 0.0),
+                                                       decode_history(tab_data.get("history")))
+                placeholder.pinned = tab_data.get("pinned", False)
+                restored.append(placeholder)
+            self.saved_tabs = None
             self.update_tab_styles()
-        except FileNotFoundError:
-            pass
+            self.save_session()
+
+            if restored:
+                current = max(reversed(restored), key=lambda tab: tab.last_active)
+                self.tabs.setCurrentWidget(current)
+                self.restore_background_tabs()
         except Exception as e:
             logging.error(f"Failed to restore session: {str(e)}")
 
     def clear_history(self):
-        try:
-            self.cursor.execute("DELETE FROM history")
-            self.conn.commit()
-            QMessageBox.information(self, "History", "Browsing history cleared.")
-        except sqlite3.Error as e:
-            QMessageBox.warning(self, "Error", f"Failed to clear history: {str(e)}")
+        confirmation = ("History", "Browsing history cleared.", "clear browsing history")
+        self.storage.clear_history(lambda error: self.writeFinished.emit(confirmation, error))
 
     def clear_bookmarks(self):
-        try:
-            self.cursor.execute("DELETE FROM bookmarks")
-            self.conn.commit()
-            QMessageBox.information(self, "Bookmarks", "Bookmarks cleared.")
-        except sqlite3.Error as e:
-            QMessageBox.warning(self, "Error", f"Failed to clear bookmarks: {str(e)}")
+        confirmation = ("Bookmarks", "Bookmarks cleared.", "clear bookmarks")
+        self.storage.clear_bookmarks(lambda error: self.writeFinished.emit(confirmation, error))
+
+    def confirm_write(self, confirmation, error):
+        # Runs once the storage thread has committed that job, or failed to
+        # run it, so success is only reported once it is true
+        title, message, action = confirmation
+        if error is not None:
+            QMessageBox.warning(self, "Database Error", f"Failed to {action}: {str(error)}")
+        else:
+            QMessageBox.information(self, title, message)
 
     def closeEvent(self, event):
+        self.watchdog.stop()
+        if INSTRUMENTATION_DUMP_PATH:
+            try:
+                instrumentation.dump(INSTRUMENTATION_DUMP_PATH)
+            except OSError as e:
+                logging.error(f"Failed to write performance statistics: {str(e)}")
+        if not self.started:
+            # Closed before startup finished; nothing to save yet
+            self.omnibox.close()
+            super().closeEvent(event)
+            return
         self.save_session()
+        self.tab_pool.clear()
+        # Removing tabs moves the current index; without this each
+        # currentChanged would materialize the next placeholder and journal
+        # it after the session was saved
+        self.tabs.blockSignals(True)
         while self.tabs.count() > 0:
             widget = self.tabs.widget(0)
             if widget:
                 widget.deleteLater()
             self.tabs.removeTab(0)
+        self.omnibox.close()
+        self.downloads.close()
+        self.resource_monitor.close()
+        self.session.close()
+        self.storage.close()
         self.conn.close()
         super().closeEvent(event)
\ No newline at end of file
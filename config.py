@@ -1,2 +1,48 @@
 # config.py
-GITHUB_URL = "https://github.com/parthiv/utharam"  # Replace with actual repository URL
\ No newline at end of file
+GITHUB_URL = "https://github.com/parthiv/utharam"  # Replace with actual repository URL
+
+# Restored tabs are placeholders until activated; this many of the most
+# recently used ones are loaded in the background after startup
+BACKGROUND_RESTORE_TABS = 2
+
+# Background tabs are discarded (web view torn down, state kept) once idle
+# this long, or least recently used first while renderers exceed the budget.
+# 0 disables either rule.
+TAB_DISCARD_IDLE_MINUTES = 30
+TAB_MEMORY_BUDGET_MB = 2048
+
+# Idle tabs kept pre-built so Ctrl+T only has to navigate
+SPARE_TABS = 1
+
+# Defaults for the HTTP cache and cookie settings. HTTP cache for normal tabs
+# ("disk", "memory" or "none"); incognito tabs share one in-memory cache.
+# Cookie policy is "allow", "force" or "none".
+HTTP_CACHE_TYPE = "disk"
+HTTP_CACHE_SIZE_MB = 256
+INCOGNITO_CACHE_SIZE_MB = 32
+PERSISTENT_COOKIES = "allow"
+
+# Optional download engine: large HTTP(S) downloads are fetched over several
+# byte-range connections and resume after a crash. It does not share the
+# page's cookies, so it is off by default.
+SEGMENTED_DOWNLOADS = False
+SEGMENTED_MIN_SIZE_MB = 50
+SEGMENTED_DOWNLOAD_SEGMENTS = 4
+
+# Closed tabs (with their back/forward history) that Ctrl+Shift+T can reopen
+RECENTLY_CLOSED_TABS = 10
+
+# Block ads and trackers with the filter lists in filters/ (EasyList syntax).
+# Lists are compiled once and cached; editing a list recompiles it.
+CONTENT_BLOCKING = True
+
+# Renderer memory and CPU are sampled this often for the task manager;
+# the last RESOURCE_HISTORY_SAMPLES rounds are kept for export
+RESOURCE_SAMPLE_SECONDS = 5
+RESOURCE_HISTORY_SAMPLES = 720
+
+# The GUI thread counts as stalled once its event loop is this late; the
+# main thread's stack is captured for the performance statistics dialog.
+# Set INSTRUMENTATION_DUMP_PATH to also write the statistics on exit.
+STALL_THRESHOLD_MS = 200
+INSTRUMENTATION_DUMP_PATH = ""
@@ -0,0 +1,305 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton,
+                            QHeaderView, QFileDialog, QMessageBox, QAbstractItemView)
+from PyQt5.QtWebEngineWidgets import QWebEngineDownloadItem
+from PyQt5.QtCore import Qt, QObject, QTimer, QUrl, pyqtSignal
+from segmented_download import SegmentedDownload, journal_path
+from config import SEGMENTED_DOWNLOADS, SEGMENTED_MIN_SIZE_MB, SEGMENTED_DOWNLOAD_SEGMENTS
+import os
+import time
+import uuid
+import sqlite3
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Progress is shown at most this often, and written to sqlite less often
+UI_REFRESH_MS = 250
+PERSIST_INTERVAL = 2.0
+
+JOB_STATES = {
+    "in_progress": QWebEngineDownloadItem.DownloadInProgress,
+    "completed": QWebEngineDownloadItem.DownloadCompleted,
+    "cancelled": QWebEngineDownloadItem.DownloadCancelled,
+    "interrupted": QWebEngineDownloadItem.DownloadInterrupted,
+    # Recorded as interrupted, but without a journal it is never resumed
+    "failed": QWebEngineDownloadItem.DownloadInterrupted,
+}
+
+STATES = {
+    QWebEngineDownloadItem.DownloadRequested: "requested",
+    QWebEngineDownloadItem.DownloadInProgress: "in_progress",
+    QWebEngineDownloadItem.DownloadCompleted: "completed",
+    QWebEngineDownloadItem.DownloadCancelled: "cancelled",
+    QWebEngineDownloadItem.DownloadInterrupted: "interrupted",
+}
+
+
+def format_bytes(count):
+    for unit in ("B", "KB", "MB", "GB"):
+        if count < 1024 or unit == "GB":
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+
+
+def mark_interrupted(cursor):
+    # Rows still in progress at startup belong to a session that crashed or
+    # was killed before DownloadManager.close could record them
+    cursor.execute("UPDATE downloads SET state = 'interrupted' WHERE state = 'in_progress'")
+    if cursor.rowcount > 0:
+        logging.info(f"Marked {cursor.rowcount} unfinished downloads as interrupted")
+
+
+# Runs a SegmentedDownload on its own threads and presents it with the parts
+# of the QWebEngineDownloadItem interface DownloadManager uses. The job's
+# callbacks fire on worker threads and are queued onto the GUI thread.
+class SegmentedItem(QObject):
+    downloadProgress = pyqtSignal()
+    finished = pyqtSignal()
+    jobProgress = pyqtSignal()
+    jobFinished = pyqtSignal()
+
+    def __init__(self, url, path, parent=None):
+        super().__init__(parent)
+        self.jobProgress.connect(self.downloadProgress, Qt.QueuedConnection)
+        self.jobFinished.connect(self.finished, Qt.QueuedConnection)
+        self.job = SegmentedDownload(url, path, segments=SEGMENTED_DOWNLOAD_SEGMENTS,
+                                     on_progress=self.jobProgress.emit, on_finished=self.jobFinished.emit)
+        self.job.start()
+
+    def url(self):
+        return QUrl(self.job.url)
+
+    def path(self):
+        return self.job.path
+
+    def receivedBytes(self):
+        return self.job.received
+
+    def totalBytes(self):
+        return self.job.total
+
+    def state(self):
+        return JOB_STATES[self.job.state]
+
+    def sha256(self):
+        return self.job.sha256
+
+    def cancel(self):
+        self.job.cancel()
+
+    def stop(self):
+        self.job.stop()
+
+
+# Handles downloadRequested once per profile instead of once per tab,
+# records every download in the downloads table through the storage worker
+# and reports progress at a fixed refresh rate rather than per chunk.
+class DownloadManager(QObject):
+    progressChanged = pyqtSignal(str, int, int)
+    downloadFinished = pyqtSignal(str, str)
+
+    def __init__(self, browser):
+        super().__init__(browser)
+        self.browser = browser
+        self.active = {}
+        self.dirty = set()
+        self.last_persist = {}
+
+        for profile in browser.profiles.profiles():
+            profile.downloadRequested.connect(self.handle_download)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(UI_REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.flush_progress)
+
+        if SEGMENTED_DOWNLOADS:
+            QTimer.singleShot(0, self.resume_interrupted)
+
+    def handle_download(self, download):
+        if download.state() != QWebEngineDownloadItem.DownloadRequested:
+            return
+        if self.sender() is self.browser.profiles.incognito:
+            QMessageBox.warning(self.browser, "Incognito Mode", "Downloads are not supported in incognito mode.")
+            download.cancel()
+            return
+
+        # Ask for download location
+        default_path = os.path.join(os.path.expanduser("~"), "Downloads", download.suggestedFileName())
+        file_path, _ = QFileDialog.getSaveFileName(self.browser, "Save File", default_path)
+        if not file_path:
+            download.cancel()
+            return
+
+        # Large HTTP(S) files go to the segmented engine instead
+        if self.use_segmented(download):
+            download.cancel()
+            self.track(SegmentedItem(download.url().toString(), file_path, self), file_path)
+            return
+
+        download.setPath(file_path)
+        download.accept()
+        self.track(download, file_path)
+
+    def use_segmented(self, download):
+        return (SEGMENTED_DOWNLOADS and download.url().scheme() in ("http", "https")
+                and download.totalBytes() >= SEGMENTED_MIN_SIZE_MB * 1024 * 1024)
+
+    def resume_interrupted(self):
+        try:
+            self.browser.cursor.execute("SELECT id, url, path FROM downloads WHERE state = 'interrupted'")
+            rows = self.browser.cursor.fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Failed to load interrupted downloads: {str(e)}")
+            return
+        for key, url, path in rows:
+            if path and os.path.exists(journal_path(path)):
+                self.track(SegmentedItem(url, path, self), path, key)
+
+    def track(self, download, file_path, key=None):
+        if key is None:
+            key = str(uuid.uuid4())
+            self.browser.storage.execute(
+                '''INSERT INTO downloads (id, url, path, received_bytes, total_bytes, state, started)
+                   VALUES (?, ?, ?, 0, ?, 'in_progress', ?)''',
+                (key, download.url().toString(), file_path, max(download.totalBytes(), 0), int(time.time())))
+        else:
+            self.browser.storage.execute("UPDATE downloads SET state = 'in_progress' WHERE id = ?", (key,))
+        self.active[key] = download
+        self.last_persist[key] = time.monotonic()
+
+        download.downloadProgress.connect(lambda *args, key=key: self.dirty.add(key))
+        download.finished.connect(lambda key=key: self.finish(key))
+        if not self.refresh_timer.isActive():
+            self.refresh_timer.start()
+        return key
+
+    def flush_progress(self):
+        now = time.monotonic()
+        for key in self.dirty:
+            download = self.active.get(key)
+            if download is None:
+                continue
+            received, total = download.receivedBytes(), download.totalBytes()
+            self.progressChanged.emit(key, received, total)
+            if now - self.last_persist[key] >= PERSIST_INTERVAL:
+                self.last_persist[key] = now
+                self.browser.storage.execute(
+                    "UPDATE downloads SET received_bytes = ?, total_bytes = ? WHERE id = ?",
+                    (received, max(total, 0), key))
+        self.dirty.clear()
+        self.update_status()
+        if not self.active:
+            self.refresh_timer.stop()
+
+    def update_status(self):
+        if not self.active:
+            self.browser.statusBar().clearMessage()
+            return
+        received = sum(download.receivedBytes() for download in self.active.values())
+        total = sum(max(download.totalBytes(), 0) for download in self.active.values())
+        message = f"Downloading {len(self.active)} file(s): {format_bytes(received)}"
+        if total:
+            message += f" of {format_bytes(total)} ({received * 100 / total:.1f}%)"
+        self.browser.statusBar().showMessage(message)
+
+    def finish(self, key):
+        download = self.active.pop(key, None)
+        self.dirty.discard(key)
+        self.last_persist.pop(key, None)
+        if download is None:
+            return
+        state = STATES.get(download.state(), "interrupted")
+        sha256 = download.sha256() if isinstance(download, SegmentedItem) else None
+        self.browser.storage.execute(
+            "UPDATE downloads SET received_bytes = ?, total_bytes = ?, state = ?, finished = ?, sha256 = ? WHERE id = ?",
+            (download.receivedBytes(), max(download.totalBytes(), 0), state, int(time.time()), sha256, key))
+        self.progressChanged.emit(key, download.receivedBytes(), download.totalBytes())
+        self.downloadFinished.emit(key, state)
+        self.update_status()
+        if state == "completed":
+            self.browser.statusBar().showMessage(f"Downloaded: {os.path.basename(download.path())}", 5000)
+
+    def cancel(self, key):
+        download = self.active.get(key)
+        if download is not None:
+            download.cancel()
+
+    def close(self):
+        self.refresh_timer.stop()
+        for key, download in list(self.active.items()):
+            # Segmented downloads keep their journal and resume next start
+            if isinstance(download, SegmentedItem):
+                download.stop()
+            self.browser.storage.execute(
+                "UPDATE downloads SET received_bytes = ?, state = 'interrupted' WHERE id = ?",
+                (download.receivedBytes(), key))
+
+
+class DownloadsDialog(QDialog):
+    def __init__(self, browser):
+        super().__init__(browser)
+        self.browser = browser
+        self.manager = browser.downloads
+        self.rows = {}
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.setWindowTitle("Downloads")
+        self.resize(700, 400)
+
+        layout = QVBoxLayout()
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["File", "Progress", "State", "URL"])
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        layout.addWidget(self.table)
+
+        cancel_btn = QPushButton("Cancel Selected")
+        cancel_btn.clicked.connect(self.cancel_selected)
+        layout.addWidget(cancel_btn)
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        layout.addWidget(close_btn)
+        self.setLayout(layout)
+
+        self.load()
+        self.manager.progressChanged.connect(self.update_progress)
+        self.manager.downloadFinished.connect(self.update_state)
+
+    def load(self):
+        # Rows written moments ago may still be queued in the storage worker
+        self.browser.storage.flush(1.0)
+        try:
+            self.browser.cursor.execute('''SELECT id, path, received_bytes, total_bytes, state, url
+                                           FROM downloads ORDER BY started DESC LIMIT 200''')
+            for key, path, received, total, state, url in self.browser.cursor.fetchall():
+                row = self.table.rowCount()
+                self.table.insertRow(row)
+                self.rows[key] = row
+                self.table.setItem(row, 0, QTableWidgetItem(os.path.basename(path or "")))
+                self.table.setItem(row, 1, QTableWidgetItem(""))
+                self.table.setItem(row, 2, QTableWidgetItem(state))
+                self.table.setItem(row, 3, QTableWidgetItem(url))
+                self.update_progress(key, received, total)
+        except sqlite3.Error as e:
+            QMessageBox.warning(self, "Database Error", f"Failed to load downloads: {str(e)}")
+
+    def update_progress(self, key, received, total):
+        row = self.rows.get(key)
+        if row is None:
+            return
+        text = format_bytes(received)
+        if total > 0:
+            text += f" / {format_bytes(total)} ({received * 100 / total:.0f}%)"
+        self.table.item(row, 1).setText(text)
+
+    def update_state(self, key, state):
+        row = self.rows.get(key)
+        if row is not None:
+            self.table.item(row, 2).setText(state)
+
+    def cancel_selected(self):
+        for key, row in self.rows.items():
+            if self.table.item(row, 0).isSelected():
+                self.manager.cancel(key)
@@ -0,0 +1,66 @@
+import os
+import shlex
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+ENV_VAR = "QTWEBENGINE_CHROMIUM_FLAGS"
+
+# Named Chromium flag sets. Chromium reads them once, when Qt WebEngine
+# starts, so a changed preset applies from the next launch.
+PRESETS = {
+    # Chromium's own defaults: a process per site instance, no limit beyond
+    # what memory allows, background tabs throttled
+    "default": [],
+    # Fit many tabs in little memory: one renderer per site, few renderers
+    # overall, and Chromium's low-end device mode
+    "low memory": [
+        "--process-per-site",
+        "--renderer-process-limit=4",
+        "--enable-low-end-device-mode",
+    ],
+    # Keep the default process model but cap the renderer count
+    "balanced": [
+        "--renderer-process-limit=12",
+    ],
+    # Background tabs keep running at full speed, rasterize on the GPU
+    "throughput": [
+        "--disable-background-timer-throttling",
+        "--disable-renderer-backgrounding",
+        "--disable-backgrounding-occluded-windows",
+        "--enable-gpu-rasterization",
+    ],
+}
+
+
+def split_flags(text, source):
+    # Chromium itself splits on whitespace, so that is the fallback for text
+    # shlex cannot parse, such as an unbalanced quote
+    try:
+        return shlex.split(text)
+    except ValueError as e:
+        logging.error(f"Splitting {source} Chromium flags {text!r} on whitespace: {str(e)}")
+        return text.split()
+
+
+def engine_flags(preset, extra=""):
+    flags = list(PRESETS.get(preset, []))
+    flags.extend(split_flags(extra, "extra"))
+    return flags
+
+
+def apply_engine_flags(preset, extra=""):
+    # Must run before QApplication is created. Flags already in the
+    # environment come last, so a flag given there wins over the preset.
+    if preset not in PRESETS:
+        logging.error(f"Unknown engine preset {preset!r}, using default")
+        preset = "default"
+    flags = engine_flags(preset, extra)
+    inherited = os.environ.get(ENV_VAR, "").strip()
+    if inherited:
+        flags.extend(split_flags(inherited, ENV_VAR))
+    if flags:
+        os.environ[ENV_VAR] = " ".join(flags)
+    logging.info(f"Chromium flags (preset '{preset}'): {' '.join(flags) or '(none)'}")
+    return flags
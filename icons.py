@@ -1,50 +1,132 @@
-from PyQt5.QtGui import QIcon
+from PyQt5.QtGui import QIcon, QPixmap, QPainter, QGuiApplication
+from PyQt5.QtSvg import QSvgRenderer
+from PyQt5.QtCore import Qt, QByteArray
+import os
+import json
+import logging
+
+ICON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons")
+ATLAS_PATH = os.path.join(ICON_DIR, "atlas.json")
+ICON_SIZES = (16, 24, 32)
+
+
+# Parses each SVG once, pre-rasterizes it at the device pixel ratios of the
+# connected screens and hands out one shared QIcon per name. If icons/atlas.json
+# exists (see build_atlas) all SVGs come from that single file.
+class IconRegistry:
+    icons = {}
+    atlas = None
+
+    @classmethod
+    def get(cls, name):
+        icon = cls.icons.get(name)
+        if icon is None:
+            icon = cls.icons[name] = cls.build(name)
+        return icon
+
+    @classmethod
+    def load_svg(cls, name):
+        if cls.atlas is None:
+            try:
+                with open(ATLAS_PATH, "r") as f:
+                    cls.atlas = json.load(f)
+            except (OSError, ValueError):
+                cls.atlas = {}
+        if name in cls.atlas:
+            return cls.atlas[name].encode("utf-8")
+        try:
+            with open(os.path.join(ICON_DIR, f"{name}.svg"), "rb") as f:
+                return f.read()
+        except OSError as e:
+            logging.error(f"Icon not found: {name} ({str(e)})")
+            return None
+
+    @classmethod
+    def device_pixel_ratios(cls):
+        ratios = {1.0}
+        if QGuiApplication.instance() is not None:
+            ratios.update(screen.devicePixelRatio() for screen in QGuiApplication.screens())
+        return sorted(ratios)
+
+    @classmethod
+    def build(cls, name):
+        icon = QIcon()
+        data = cls.load_svg(name)
+        if data is None:
+            return icon
+        renderer = QSvgRenderer(QByteArray(data))
+        for ratio in cls.device_pixel_ratios():
+            for size in ICON_SIZES:
+                pixmap = QPixmap(int(size * ratio), int(size * ratio))
+                pixmap.setDevicePixelRatio(ratio)
+                pixmap.fill(Qt.transparent)
+                painter = QPainter(pixmap)
+                renderer.render(painter)
+                painter.end()
+                icon.addPixmap(pixmap)
+        return icon
+
+
+def build_atlas():
+    atlas = {}
+    for file_name in sorted(os.listdir(ICON_DIR)):
+        if file_name.endswith(".svg"):
+            with open(os.path.join(ICON_DIR, file_name), "r", encoding="utf-8") as f:
+                atlas[file_name[:-4]] = f.read()
+    with open(ATLAS_PATH, "w", encoding="utf-8") as f:
+        json.dump(atlas, f)
+    return len(atlas)
+
 
 class Icons:
     @staticmethod
     def home():
-        return QIcon("icons/home.svg")
-    
+        return IconRegistry.get("home")
+
     @staticmethod
     def new_tab():
-        return QIcon("icons/new_tab.svg")
-    
+        return IconRegistry.get("new_tab")
+
     @staticmethod
     def incognito():
-        return QIcon("icons/incognito.svg")
-    
+        return IconRegistry.get("incognito")
+
     @staticmethod
     def bookmarks():
-        return QIcon("icons/bookmarks.svg")
-    
+        return IconRegistry.get("bookmarks")
+
     @staticmethod
     def history():
-        return QIcon("icons/history.svg")
-    
+        return IconRegistry.get("history")
+
     @staticmethod
     def downloads():
-        return QIcon("icons/downloads.svg")
-    
+        return IconRegistry.get("downloads")
+
     @staticmethod
     def devtools():
-        return QIcon("icons/devtools.svg")
-    
+        return IconRegistry.get("devtools")
+
     @staticmethod
     def menu():
-        return QIcon("icons/menu.svg")
-    
+        return IconRegistry.get("menu")
+
     @staticmethod
     def back():
-        return QIcon("icons/back.svg")
-    
+        return IconRegistry.get("back")
+
     @staticmethod
     def forward():
-        return QIcon("icons/forward.svg")
-    
+        return IconRegistry.get("forward")
+
     @staticmethod
     def reload():
-        return QIcon("icons/reload.svg")
-    
+        return IconRegistry.get("reload")
+
     @staticmethod
     def stop():
-        return QIcon("icons/stop.svg")
\ No newline at end of file
+        return IconRegistry.get("stop")
+
+
+if __name__ == "__main__":
+    print(f"Packed {build_atlas()} icons into {ATLAS_PATH}")
@@ -0,0 +1,252 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton,
+                             QHeaderView, QAbstractItemView, QPlainTextEdit, QMessageBox, QFileDialog)
+from PyQt5.QtCore import Qt, QObject, QTimer
+from config import STALL_THRESHOLD_MS
+from collections import deque
+import functools
+import inspect
+import threading
+import traceback
+import json
+import sys
+import time
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Percentiles come from the most recent samples of each histogram
+HISTOGRAM_SAMPLES = 1024
+HEARTBEAT_MS = 50
+KEPT_STALLS = 50
+
+
+class Histogram:
+    __slots__ = ("name", "count", "total", "max", "samples")
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=HISTOGRAM_SAMPLES)
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        self.samples.append(value)
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {"name": self.name, "count": 0}
+        return {
+            "name": self.name,
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3),
+            "p50_ms": round(ordered[len(ordered) // 2], 3),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+            "max_ms": round(self.max, 3),
+        }
+
+
+histograms = {}
+stalls = deque(maxlen=KEPT_STALLS)
+lock = threading.Lock()
+
+
+def record(name, milliseconds):
+    with lock:
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = Histogram(name)
+        histogram.add(milliseconds)
+
+
+def summaries():
+    with lock:
+        return [histograms[name].summary() for name in sorted(histograms)]
+
+
+def reset():
+    with lock:
+        histograms.clear()
+        stalls.clear()
+
+
+def dump(path):
+    # One JSON object per line: every histogram, then the captured stalls
+    with open(path, "w", encoding="utf-8") as f:
+        for summary in summaries():
+            f.write(json.dumps(dict(summary, type="histogram")) + "\n")
+        for stall in list(stalls):
+            f.write(json.dumps(dict(stall, type="stall")) + "\n")
+
+
+# Times a block or a function into the histogram of the same name:
+#
+#     with timed("session.save"): ...
+#
+#     @timed("browser.add_tab")
+#     def add_tab(self, ...): ...
+class timed:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, (time.perf_counter() - self.started) * 1000)
+        return False
+
+    def __call__(self, function):
+        name = self.name
+        # PyQt passes every signal argument to a slot that accepts *args and
+        # does not retry with fewer, so a decorated slot connected to, say,
+        # loadFinished(bool) would raise TypeError and abort. The wrapper
+        # drops positional arguments the wrapped function cannot take.
+        parameters = inspect.signature(function).parameters.values()
+        if any(parameter.kind == parameter.VAR_POSITIONAL for parameter in parameters):
+            limit = None
+        else:
+            limit = sum(1 for parameter in parameters
+                        if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD))
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if limit is not None and len(args) > limit:
+                args = args[:limit]
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, (time.perf_counter() - started) * 1000)
+        return wrapper
+
+
+# A GUI-thread timer stamps a heartbeat every HEARTBEAT_MS; a watchdog thread
+# checks it, and once the beat is more than the threshold late it captures
+# the main thread's Python stack while the stall is still in progress. The
+# stall's full length is recorded when the heartbeat resumes.
+class StallWatchdog(QObject):
+    def __init__(self, parent=None, threshold_ms=STALL_THRESHOLD_MS):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.main_thread = threading.main_thread().ident
+        self.last_beat = time.monotonic()
+        self.current = None
+        self.running = threading.Event()
+        self.running.set()
+
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setInterval(HEARTBEAT_MS)
+        self.heartbeat.timeout.connect(self.beat)
+        self.heartbeat.start()
+
+        self.thread = threading.Thread(target=self.watch, name="stall-watchdog", daemon=True)
+        self.thread.start()
+
+    def beat(self):
+        now = time.monotonic()
+        late = now - self.last_beat - HEARTBEAT_MS / 1000
+        self.last_beat = now
+        stall = self.current
+        if stall is not None:
+            self.current = None
+            stall["duration_ms"] = round(late * 1000, 1)
+            record("gui.stall", late * 1000)
+            logging.warning(f"GUI thread stalled for {late * 1000:.0f} ms in {stall['where']}")
+
+    def watch(self):
+        while self.running.is_set():
+            time.sleep(HEARTBEAT_MS / 2000)
+            if self.current is not None or time.monotonic() - self.last_beat - HEARTBEAT_MS / 1000 < self.threshold:
+                continue
+            frame = sys._current_frames().get(self.main_thread)
+            if frame is None:
+                continue
+            stack = traceback.format_stack(frame)
+            stall = {"time": time.time(), "duration_ms": None, "stack": "".join(stack),
+                     "where": stack[-1].strip().splitlines()[0] if stack else "?"}
+            self.current = stall
+            stalls.append(stall)
+
+    def stop(self):
+        self.heartbeat.stop()
+        self.running.clear()
+        self.thread.join(1.0)
+
+
+class InstrumentationDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.setWindowTitle("Performance Statistics")
+        self.resize(760, 520)
+
+        layout = QVBoxLayout()
+        self.table = QTableWidget(0, 6)
+        self.table.setHorizontalHeaderLabels(["Name", "Count", "Mean ms", "p50 ms", "p95 ms", "Max ms"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        self.stall_view = QPlainTextEdit()
+        self.stall_view.setReadOnly(True)
+        layout.addWidget(self.stall_view)
+
+        buttons = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        buttons.addWidget(refresh_btn)
+        dump_btn = QPushButton("Save as JSONL")
+        dump_btn.clicked.connect(self.save)
+        buttons.addWidget(dump_btn)
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.reset)
+        buttons.addWidget(reset_btn)
+        buttons.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        self.refresh()
+
+    def refresh(self):
+        rows = [summary for summary in summaries() if summary["count"]]
+        self.table.setRowCount(len(rows))
+        for i, summary in enumerate(rows):
+            values = [summary["name"], str(summary["count"])] + [
+                f"{summary[key]:.2f}" for key in ("mean_ms", "p50_ms", "p95_ms", "max_ms")]
+            for column, value in enumerate(values):
+                self.table.setItem(i, column, QTableWidgetItem(value))
+
+        lines = []
+        for stall in reversed(list(stalls)):
+            duration = f"{stall['duration_ms']:.0f} ms" if stall["duration_ms"] is not None else "in progress"
+            lines.append(f"{time.strftime('%H:%M:%S', time.localtime(stall['time']))} stall, {duration}\n"
+                         f"{stall['stack']}")
+        self.stall_view.setPlainText("\n".join(lines) or "No stalls captured.")
+
+    def save(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Statistics", "instrumentation.jsonl",
+                                              "JSON Lines (*.jsonl)")
+        if not path:
+            return
+        try:
+            dump(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Save Statistics", f"Failed to save statistics: {str(e)}")
+
+    def reset(self):
+        reset()
+        self.refresh()
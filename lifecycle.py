@@ -0,0 +1,111 @@
+from PyQt5.QtCore import QObject, QTimer
+from config import TAB_DISCARD_IDLE_MINUTES, TAB_MEMORY_BUDGET_MB
+import os
+import time
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def process_rss(pid):
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+# Discards background tabs that have been idle too long, or least recently
+# used first while renderer memory is over budget. Browser.discard_tab swaps
+# the tab for a placeholder holding its URL, title, group and serialized
+# navigation history; activating it again rebuilds and reloads the tab.
+class TabLifecycleManager(QObject):
+    def __init__(self, browser, idle_minutes=TAB_DISCARD_IDLE_MINUTES,
+                 memory_budget_mb=TAB_MEMORY_BUDGET_MB, interval_ms=60000):
+        super().__init__(browser)
+        self.browser = browser
+        self.idle_seconds = idle_minutes * 60
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.last_activation = {}
+        self.discarded_tabs = 0
+        self.reactivated_tabs = 0
+        self.reclaimed_bytes = 0
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check)
+        self.timer.start(interval_ms)
+
+    def tab_added(self, tab):
+        self.last_activation.setdefault(tab.tab_id, tab.last_active or time.time())
+
+    def tab_activated(self, tab):
+        if tab.is_placeholder and tab.discarded:
+            self.reactivated_tabs += 1
+        self.last_activation[tab.tab_id] = time.time()
+
+    def tab_removed(self, tab_id):
+        self.last_activation.pop(tab_id, None)
+
+    def is_exempt(self, tab):
+        # Incognito state lives only in the page and cannot be restored
+        return (tab.is_placeholder or tab.pinned or tab.incognito
+                or tab is self.browser.tabs.currentWidget() or tab.is_audible())
+
+    def candidates(self):
+        tabs = [self.browser.tabs.widget(i) for i in range(self.browser.tabs.count())]
+        tabs = [tab for tab in tabs if not self.is_exempt(tab)]
+        tabs.sort(key=lambda tab: self.last_activation.get(tab.tab_id, 0.0))
+        return tabs
+
+    def renderer_usage(self):
+        # Renderers can be shared between tabs; count each process once
+        usage = {}
+        for i in range(self.browser.tabs.count()):
+            tab = self.browser.tabs.widget(i)
+            if not tab.is_placeholder:
+                usage.setdefault(tab.renderer_pid(), []).append(tab.tab_id)
+        usage.pop(0, None)
+        return {pid: (process_rss(pid), tab_ids) for pid, tab_ids in usage.items()}
+
+    def check(self):
+        now = time.time()
+        if self.idle_seconds:
+            for tab in self.candidates():
+                if now - self.last_activation[tab.tab_id] >= self.idle_seconds:
+                    self.discard(tab)
+
+        if self.memory_budget:
+            usage = self.renderer_usage()
+            total = sum(rss for rss, tab_ids in usage.values())
+            for tab in self.candidates():
+                if total <= self.memory_budget:
+                    break
+                total -= self.discard(tab, usage)
+
+    def discard(self, tab, usage=None):
+        usage = usage if usage is not None else self.renderer_usage()
+        pid = tab.renderer_pid()
+        rss, tab_ids = usage.get(pid, (0, []))
+
+        # Memory only comes back once the last tab using a renderer is gone
+        reclaimed = rss if tab_ids == [tab.tab_id] else 0
+        if pid in usage:
+            tab_ids = [tab_id for tab_id in tab_ids if tab_id != tab.tab_id]
+            usage[pid] = (rss, tab_ids)
+
+        if self.browser.discard_tab(self.browser.find_tab(tab.tab_id)) is None:
+            return 0
+        self.discarded_tabs += 1
+        self.reclaimed_bytes += reclaimed
+        logging.info(f"Discarded tab {tab.tab_id}, reclaimed {reclaimed // 1024} KiB")
+        return reclaimed
+
+    def stats(self):
+        return {
+            "discarded_tabs": self.discarded_tabs,
+            "reactivated_tabs": self.reactivated_tabs,
+            "reclaimed_bytes": self.reclaimed_bytes,
+        }
@@ -0,0 +1,283 @@
+from PyQt5.QtGui import QPainter, QPainterPath, QTransform, QColor, QPen, QBrush, QImage, QPixmap
+from PyQt5.QtCore import Qt, QPointF, QRectF
+import json
+import math
+
+# A small Lottie interpreter covering what the bundled animations use: shape,
+# null and precomp layers, parenting, groups, paths, rects, ellipses, fills,
+# strokes, trim paths and eased keyframes. It draws with QPainter, so playing
+# an animation needs no web engine at all.
+
+LINE_CAPS = {1: Qt.FlatCap, 2: Qt.RoundCap, 3: Qt.SquareCap}
+LINE_JOINS = {1: Qt.MiterJoin, 2: Qt.RoundJoin, 3: Qt.BevelJoin}
+
+
+def _bezier_ease(x1, y1, x2, y2, x):
+    # Solve the cubic bezier (0,0)-(x1,y1)-(x2,y2)-(1,1) for y at the given x
+    def sample(a1, a2, t):
+        return 3 * a1 * t * (1 - t) ** 2 + 3 * a2 * t * t * (1 - t) + t ** 3
+
+    lo, hi, t = 0.0, 1.0, x
+    for _ in range(20):
+        current = sample(x1, x2, t)
+        if abs(current - x) < 1e-4:
+            break
+        if current < x:
+            lo = t
+        else:
+            hi = t
+        t = (lo + hi) / 2
+    return sample(y1, y2, t)
+
+
+def _first(value, default):
+    if isinstance(value, list):
+        return value[0] if value else default
+    return value if value is not None else default
+
+
+def _lerp(a, b, t):
+    if isinstance(a, dict):
+        return {
+            "c": a.get("c", False),
+            "v": _lerp(a["v"], b["v"], t),
+            "i": _lerp(a["i"], b["i"], t),
+            "o": _lerp(a["o"], b["o"], t),
+        }
+    if isinstance(a, list):
+        return [_lerp(x, y, t) for x, y in zip(a, b)]
+    return a + (b - a) * t
+
+
+def value_at(prop, frame):
+    if prop is None:
+        return None
+    if prop.get("s") is True and "x" in prop:
+        return [value_at(prop["x"], frame), value_at(prop["y"], frame)]
+
+    keyframes = prop.get("k")
+    if not prop.get("a") or not isinstance(keyframes, list) or not keyframes or not isinstance(keyframes[0], dict):
+        return keyframes
+
+    def start_value(index):
+        key = keyframes[index]
+        if "s" in key:
+            return key["s"]
+        return keyframes[index - 1].get("e", keyframes[index - 1].get("s"))
+
+    if frame <= keyframes[0]["t"]:
+        value = start_value(0)
+    elif frame >= keyframes[-1]["t"]:
+        value = start_value(len(keyframes) - 1)
+    else:
+        index = 0
+        while index + 1 < len(keyframes) and keyframes[index + 1]["t"] <= frame:
+            index += 1
+        key, following = keyframes[index], keyframes[index + 1]
+        start = start_value(index)
+        end = key.get("e", start_value(index + 1))
+        if key.get("h") or end is None:
+            value = start
+        else:
+            progress = (frame - key["t"]) / max(following["t"] - key["t"], 1e-9)
+            out_tangent, in_tangent = key.get("o", {}), key.get("i", {})
+            eased = _bezier_ease(_first(out_tangent.get("x"), 0.0), _first(out_tangent.get("y"), 0.0),
+                                 _first(in_tangent.get("x"), 1.0), _first(in_tangent.get("y"), 1.0), progress)
+            value = _lerp(start, end, eased)
+
+    # Shapes are wrapped in a one-element list inside keyframes
+    if isinstance(value, list) and len(value) == 1 and isinstance(value[0], dict):
+        return value[0]
+    return value
+
+
+def _scalar(value, default=0.0):
+    if isinstance(value, list):
+        return value[0] if value else default
+    return default if value is None else value
+
+
+def transform_at(ks, frame):
+    anchor = value_at(ks.get("a"), frame) or [0, 0]
+    position = value_at(ks.get("p"), frame) or [0, 0]
+    scale = value_at(ks.get("s"), frame) or [100, 100]
+    rotation = _scalar(value_at(ks.get("r") or ks.get("rz"), frame))
+    opacity = _scalar(value_at(ks.get("o"), frame), 100.0) / 100.0
+
+    # QTransform composes left to right: anchor, scale, rotate, then position
+    matrix = QTransform()
+    matrix.translate(position[0], position[1])
+    matrix.rotate(rotation)
+    matrix.scale(scale[0] / 100.0, scale[1] / 100.0)
+    matrix.translate(-anchor[0], -anchor[1])
+    return matrix, opacity
+
+
+def _shape_path(item, frame):
+    path = QPainterPath()
+    kind = item["ty"]
+    if kind == "sh":
+        shape = value_at(item["ks"], frame)
+        vertices, in_tangents, out_tangents = shape["v"], shape["i"], shape["o"]
+        if not vertices:
+            return path
+        path.moveTo(*vertices[0])
+        count = len(vertices)
+        segments = count if shape.get("c") else count - 1
+        for index in range(segments):
+            start, end = vertices[index], vertices[(index + 1) % count]
+            control1 = (start[0] + out_tangents[index][0], start[1] + out_tangents[index][1])
+            control2 = (end[0] + in_tangents[(index + 1) % count][0], end[1] + in_tangents[(index + 1) % count][1])
+            path.cubicTo(QPointF(*control1), QPointF(*control2), QPointF(*end))
+        if shape.get("c"):
+            path.closeSubpath()
+    elif kind == "rc":
+        center, size = value_at(item["p"], frame), value_at(item["s"], frame)
+        radius = _scalar(value_at(item.get("r"), frame))
+        path.addRoundedRect(QRectF(center[0] - size[0] / 2, center[1] - size[1] / 2, size[0], size[1]),
+                            radius, radius)
+    elif kind == "el":
+        center, size = value_at(item["p"], frame), value_at(item["s"], frame)
+        path.addEllipse(QPointF(*center[:2]), size[0] / 2, size[1] / 2)
+    return path
+
+
+def _trim_path(path, start, end, offset):
+    if end - start >= 0.9999:
+        return path
+    if end <= start:
+        return QPainterPath()
+    start, end = start + offset, end + offset
+    trimmed = QPainterPath()
+    steps = max(8, int(path.length() * (end - start) / 2))
+    for step in range(steps + 1):
+        percent = (start + (end - start) * step / steps) % 1.0
+        point = path.pointAtPercent(percent)
+        if step == 0:
+            trimmed.moveTo(point)
+        else:
+            trimmed.lineTo(point)
+    return trimmed
+
+
+class LottieAnimation:
+    def __init__(self, data):
+        self.data = data
+        self.width = data.get("w", 100)
+        self.height = data.get("h", 100)
+        self.frame_rate = data.get("fr", 30)
+        self.in_point = data.get("ip", 0)
+        self.out_point = data.get("op", self.frame_rate)
+        self.assets = {asset["id"]: asset for asset in data.get("assets", []) if "layers" in asset}
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            return cls(json.load(f))
+
+    @property
+    def frame_count(self):
+        return max(1, int(self.out_point - self.in_point))
+
+    def render(self, painter, frame, size):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        scale = min(size.width() / self.width, size.height() / self.height)
+        painter.translate((size.width() - self.width * scale) / 2, (size.height() - self.height * scale) / 2)
+        painter.scale(scale, scale)
+        self._render_layers(painter, self.data.get("layers", []), self.in_point + frame, QTransform(), 1.0)
+        painter.restore()
+
+    def rasterize(self, frame, size, device_pixel_ratio=1.0):
+        image = QImage(int(size.width() * device_pixel_ratio), int(size.height() * device_pixel_ratio),
+                       QImage.Format_ARGB32_Premultiplied)
+        image.setDevicePixelRatio(device_pixel_ratio)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        self.render(painter, frame, size)
+        painter.end()
+        return QPixmap.fromImage(image)
+
+    def _layer_matrix(self, layer, by_index, frame, cache):
+        index = layer.get("ind")
+        if index in cache:
+            return cache[index]
+        matrix, opacity = transform_at(layer.get("ks", {}), frame)
+        parent = by_index.get(layer.get("parent"))
+        if parent is not None and parent is not layer:
+            matrix = matrix * self._layer_matrix(parent, by_index, frame, cache)[0]
+        cache[index] = (matrix, opacity)
+        return matrix, opacity
+
+    def _render_layers(self, painter, layers, frame, base, opacity):
+        by_index = {layer.get("ind"): layer for layer in layers}
+        cache = {}
+        # Lottie lists layers top first, so paint from the end
+        for layer in reversed(layers):
+            if layer.get("hd") or not (layer.get("ip", 0) <= frame < layer.get("op", float("inf"))):
+                continue
+            kind = layer.get("ty")
+            if kind not in (0, 4):
+                continue
+            local_frame = (frame - layer.get("st", 0)) / (layer.get("sr") or 1)
+            matrix, layer_opacity = self._layer_matrix(layer, by_index, local_frame, cache)
+            matrix = matrix * base
+            if kind == 4:
+                ops = []
+                self._collect(layer.get("shapes", []), local_frame, matrix, opacity * layer_opacity, ops)
+                self._paint_ops(painter, ops)
+            elif layer.get("refId") in self.assets:
+                self._render_layers(painter, self.assets[layer["refId"]]["layers"], local_frame,
+                                    matrix, opacity * layer_opacity)
+
+    def _collect(self, items, frame, matrix, opacity, ops):
+        # Returns this group's paths (in layer space) so styles listed later
+        # in a parent group apply to them; fills and strokes become paint ops
+        group_transform = next((item for item in items if item.get("ty") == "tr"), None)
+        if group_transform is not None:
+            local, local_opacity = transform_at(group_transform, frame)
+            matrix = local * matrix
+            opacity *= local_opacity
+
+        paths = []
+        for item in items:
+            kind = item.get("ty")
+            if item.get("hd"):
+                continue
+            if kind in ("sh", "rc", "el"):
+                paths.append(matrix.map(_shape_path(item, frame)))
+            elif kind == "gr":
+                paths.extend(self._collect(item.get("it", []), frame, matrix, opacity, ops))
+            elif kind == "tm":
+                start = _scalar(value_at(item.get("s"), frame)) / 100.0
+                end = _scalar(value_at(item.get("e"), frame), 100.0) / 100.0
+                offset = _scalar(value_at(item.get("o"), frame)) / 360.0
+                paths = [_trim_path(path, min(start, end), max(start, end), offset) for path in paths]
+            elif kind in ("fl", "st"):
+                ops.append((self._style(item, frame, opacity, matrix), list(paths)))
+        return paths
+
+    def _style(self, item, frame, opacity, matrix):
+        color = value_at(item.get("c"), frame) or [0, 0, 0]
+        alpha = opacity * _scalar(value_at(item.get("o"), frame), 100.0) / 100.0
+        if len(color) > 3:
+            alpha *= color[3]
+        qcolor = QColor.fromRgbF(*[min(max(c, 0.0), 1.0) for c in color[:3]], min(max(alpha, 0.0), 1.0))
+        if item["ty"] == "fl":
+            return QBrush(qcolor), Qt.NoPen, Qt.OddEvenFill if item.get("r") == 2 else Qt.WindingFill
+
+        # Stroke widths scale with the accumulated transform
+        scale = math.sqrt(abs(matrix.determinant()))
+        pen = QPen(qcolor, _scalar(value_at(item.get("w"), frame), 1.0) * scale)
+        pen.setCapStyle(LINE_CAPS.get(item.get("lc"), Qt.FlatCap))
+        pen.setJoinStyle(LINE_JOINS.get(item.get("lj"), Qt.MiterJoin))
+        return Qt.NoBrush, pen, Qt.WindingFill
+
+    def _paint_ops(self, painter, ops):
+        # Styles listed first in a group paint on top
+        for (brush, pen, fill_rule), paths in reversed(ops):
+            painter.setBrush(brush)
+            painter.setPen(pen)
+            for path in paths:
+                path.setFillRule(fill_rule)
+                painter.drawPath(path)
@@ -1,8 +1,11 @@
+import startup
 import os
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from PyQt5.QtGui import QIcon
-from PyQt5.QtCore import QDir
+from PyQt5.QtCore import QDir, QTimer
 from browser import Browser
+from settings_store import SettingsStore
+from engine_flags import apply_engine_flags
 import sys
 
 def ensure_resources():
@@ -10,7 +13,7 @@ def ensure_resources():
     base_dir = os.path.dirname(os.path.abspath(__file__))
     
     # Create necessary directories
-    for folder in ["animations", "icons", "resources"]:
+    for folder in ["animations", "icons"]:
         QDir().mkpath(os.path.join(base_dir, folder))
     
     # Check for required files
@@ -19,7 +22,6 @@ def ensure_resources():
         os.path.join(base_dir, "icons", "app_icon.svg"),
         os.path.join(base_dir, "animations", "success.json"),
         os.path.join(base_dir, "animations", "loading.json"),
-        os.path.join(base_dir, "resources", "lottie.min.js"),
         os.path.join(base_dir, "logo.png")
     ]
     
@@ -34,25 +36,37 @@ def ensure_resources():
     return missing_files
 
 if __name__ == "__main__":
+    # Chromium reads its flags when Qt WebEngine starts, so they are set
+    # from the settings file before QApplication exists
+    settings = SettingsStore.shared()
+    apply_engine_flags(settings.get("engine_preset"), settings.get("engine_extra_flags"))
+
     # Initialize QApplication first
     app = QApplication(sys.argv)
     app.setApplicationName("Utharam Browser")
     app.setApplicationDisplayName("Utharam Browser")
     app.setWindowIcon(QIcon(os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons/app_icon.svg")))
 
-    # Check resources and display warnings if any
-    missing_files = ensure_resources()
-    if missing_files:
-        QMessageBox.warning(None, "Missing Resources",
-                           f"The following resources are missing:\n{', '.join(missing_files)}\n"
-                           "The application may not function correctly.")
-    
+    startup.mark("application created")
+
     # Load styles
     base_dir = os.path.dirname(os.path.abspath(__file__))
-    with open(os.path.join(base_dir, "styles.qss"), "r") as file:
-        app.setStyleSheet(file.read())
+    try:
+        with open(os.path.join(base_dir, "styles.qss"), "r") as file:
+            app.setStyleSheet(file.read())
+    except OSError:
+        pass
 
     window = Browser()
     window.show()
+
+    # Check resources and display warnings if any, once the window is up
+    def check_resources():
+        missing_files = ensure_resources()
+        if missing_files:
+            QMessageBox.warning(window, "Missing Resources",
+                               f"The following resources are missing:\n{', '.join(missing_files)}\n"
+                               "The application may not function correctly.")
+    window.first_paint.painted.connect(lambda: QTimer.singleShot(0, check_resources))
     
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(app.exec_())
@@ -0,0 +1,184 @@
+from PyQt5.QtWidgets import QCompleter
+from PyQt5.QtCore import QObject, QThread, QStringListModel, QTimer, Qt, pyqtSignal
+from PyQt5 import sip
+from storage import register_functions
+import re
+import sqlite3
+import threading
+import time
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# The most frecent URLs are held in memory and filtered in Python; the best
+# matches are nearly always among them, so short queries never have to walk
+# huge FTS doclists. The snapshot is reloaded when another connection commits.
+TOP_FRECENCY_ROWS = 2000
+TOP_REFRESH_SECONDS = 5.0
+FTS_CANDIDATES = 500
+
+
+def fts_query(text):
+    tokens = re.findall(r"\w+", text.lower())
+    return " ".join(f'"{token}"*' for token in tokens), tokens
+
+
+class HistorySuggester:
+    def __init__(self, conn, limit=8):
+        self.conn = conn
+        self.limit = limit
+        self.top = []
+        self.top_version = None
+        self.top_loaded = 0.0
+
+    def refresh_top(self):
+        # data_version only changes when another connection has committed
+        now = time.monotonic()
+        if now - self.top_loaded < TOP_REFRESH_SECONDS:
+            return
+        self.top_loaded = now
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self.top_version:
+            return
+        rows = self.conn.execute("SELECT url, title FROM urls ORDER BY frecency DESC LIMIT ?",
+                                 (TOP_FRECENCY_ROWS,)).fetchall()
+        self.top = [(f"{url} {title or ''}".lower(), url, title) for url, title in rows]
+        self.top_version = version
+
+    def suggest(self, text):
+        match, tokens = fts_query(text)
+        if not tokens:
+            return []
+
+        limit = self.limit
+        results, seen = [], set()
+
+        def add(rows):
+            for url, title in rows:
+                if len(results) >= limit:
+                    break
+                if url not in seen:
+                    seen.add(url)
+                    results.append((url, title or url))
+
+        # Bookmarks always rank first
+        add(self.conn.execute('''SELECT b.url, b.title FROM bookmarks_fts JOIN bookmarks b ON b.id = bookmarks_fts.rowid
+                                 WHERE bookmarks_fts MATCH ? LIMIT ?''', (match, limit)))
+
+        # Most frecent URLs containing every token
+        self.refresh_top()
+        add((url, title) for haystack, url, title in self.top
+            if all(token in haystack for token in tokens))
+
+        # Long tail: token-prefix matches from the FTS index
+        if len(results) < limit:
+            add(self.conn.execute('''SELECT url, title FROM urls WHERE id IN
+                                     (SELECT rowid FROM urls_fts WHERE urls_fts MATCH ? ORDER BY rowid DESC LIMIT ?)
+                                     ORDER BY frecency DESC LIMIT ?''', (match, FTS_CANDIDATES, limit)))
+        return results
+
+
+# Runs suggestion queries on its own read connection. Only the newest request
+# is kept, so keystrokes typed while a query runs are coalesced and superseded
+# queries are never executed.
+class SuggestionWorker(QThread):
+    suggestionsReady = pyqtSignal(int, list)
+
+    def __init__(self, db_path, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.condition = threading.Condition()
+        self.pending = None
+        self.latest_seq = 0
+        self.running = True
+
+    def request(self, seq, text):
+        with self.condition:
+            self.latest_seq = seq
+            self.pending = (seq, text)
+            self.condition.notify()
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.wait(2000)
+
+    def run(self):
+        conn = sqlite3.connect(self.db_path)
+        register_functions(conn)
+        suggester = HistorySuggester(conn)
+        while True:
+            with self.condition:
+                while self.running and self.pending is None:
+                    self.condition.wait()
+                if not self.running:
+                    break
+                seq, text = self.pending
+                self.pending = None
+            try:
+                results = suggester.suggest(text)
+            except sqlite3.Error as e:
+                logging.error(f"Suggestion query failed: {str(e)}")
+                continue
+            if seq == self.latest_seq:
+                self.suggestionsReady.emit(seq, results)
+        conn.close()
+
+
+# One completer shared by every url bar; QLineEdit re-targets it on focus-in.
+class Omnibox(QObject):
+    def __init__(self, db_path, parent=None):
+        super().__init__(parent)
+        self.seq = 0
+        self.active_edit = None
+        self.model = QStringListModel(self)
+        self.completer = QCompleter(self.model, self)
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setCaseSensitivity(Qt.CaseInsensitive)
+        self.completer.popup().clicked.connect(self.on_popup_clicked)
+
+        self.worker = SuggestionWorker(db_path)
+        self.worker.suggestionsReady.connect(self.show_suggestions)
+        self.worker.start()
+
+    def attach(self, line_edit):
+        line_edit.setCompleter(self.completer)
+        line_edit.textEdited.connect(lambda text, edit=line_edit: self.request(edit, text))
+
+    def request(self, line_edit, text):
+        self.seq += 1
+        self.active_edit = line_edit
+        if not text.strip():
+            self.model.setStringList([])
+            self.completer.popup().hide()
+            return
+        self.worker.request(self.seq, text)
+
+    def live_edit(self):
+        # The url bar that asked last, unless its tab has been closed since
+        edit = self.active_edit
+        if edit is not None and sip.isdeleted(edit):
+            edit = self.active_edit = None
+        return edit
+
+    def show_suggestions(self, seq, results):
+        # Drop results for keystrokes that have since been superseded
+        edit = self.live_edit()
+        if seq != self.seq or edit is None or not edit.hasFocus():
+            return
+        self.model.setStringList([url for url, title in results])
+        if results:
+            self.completer.complete()
+        else:
+            self.completer.popup().hide()
+
+    def on_popup_clicked(self, index):
+        edit = self.live_edit()
+        if edit is not None:
+            edit.setText(index.data())
+            QTimer.singleShot(0, edit.returnPressed.emit)
+
+    def close(self):
+        self.worker.stop()
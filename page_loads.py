@@ -0,0 +1,106 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QHeaderView,
+                             QAbstractItemView, QMessageBox)
+from PyQt5.QtCore import Qt
+import sqlite3
+
+# Navigation Timing and Paint Timing for the page's current document, as
+# milliseconds from navigation start. Run in the application world so page
+# scripts cannot interfere; missing values come back as null.
+TIMING_SCRIPT = """
+(function() {
+    var nav = performance.getEntriesByType('navigation')[0];
+    if (!nav) return null;
+    var since = function(value) { return value > 0 ? value - nav.startTime : null; };
+    var result = {
+        ttfb_ms: since(nav.responseStart),
+        dom_content_loaded_ms: since(nav.domContentLoadedEventEnd),
+        load_event_ms: since(nav.loadEventEnd),
+        transfer_size: nav.transferSize || null,
+        first_paint_ms: null,
+        first_contentful_paint_ms: null
+    };
+    performance.getEntriesByType('paint').forEach(function(entry) {
+        if (entry.name === 'first-paint') result.first_paint_ms = entry.startTime;
+        if (entry.name === 'first-contentful-paint') result.first_contentful_paint_ms = entry.startTime;
+    });
+    return result;
+})()
+"""
+
+TIMING_FIELDS = ("ttfb_ms", "dom_content_loaded_ms", "load_event_ms", "transfer_size",
+                 "first_paint_ms", "first_contentful_paint_ms")
+
+MIN_LOADS = 3
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def host_summary(cursor, limit=50, min_loads=MIN_LOADS):
+    # Successful loads only, grouped by host and ranked by p95 load time
+    cursor.execute('''SELECT host, load_ms, first_contentful_paint_ms FROM page_loads
+                      WHERE ok = 1 AND host != '' ORDER BY host, load_ms''')
+    hosts = {}
+    for host, load_ms, fcp in cursor.fetchall():
+        loads, paints = hosts.setdefault(host, ([], []))
+        loads.append(load_ms)
+        if fcp is not None:
+            paints.append(fcp)
+
+    summary = []
+    for host, (loads, paints) in hosts.items():
+        if len(loads) < min_loads:
+            continue
+        paints.sort()
+        summary.append({
+            "host": host,
+            "loads": len(loads),
+            "p50_ms": percentile(loads, 0.5),
+            "p95_ms": percentile(loads, 0.95),
+            "fcp_p50_ms": percentile(paints, 0.5) if paints else None,
+        })
+    summary.sort(key=lambda row: row["p95_ms"], reverse=True)
+    return summary[:limit]
+
+
+class PageLoadsDialog(QDialog):
+    def __init__(self, browser):
+        super().__init__(browser)
+        self.browser = browser
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.setWindowTitle("Page Load Times")
+        self.resize(700, 420)
+
+        layout = QVBoxLayout()
+        self.table = QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels(["Host", "Loads", "p50 load", "p95 load", "p50 first paint"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.load)
+        layout.addWidget(refresh_btn)
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        layout.addWidget(close_btn)
+        self.setLayout(layout)
+
+        self.load()
+
+    def load(self):
+        # Loads recorded moments ago may still be queued in the storage worker
+        self.browser.storage.flush(1.0)
+        try:
+            rows = host_summary(self.browser.cursor)
+        except sqlite3.Error as e:
+            QMessageBox.warning(self, "Database Error", f"Failed to load page load times: {str(e)}")
+            return
+        self.table.setRowCount(len(rows))
+        for i, row in enumerate(rows):
+            fcp = f"{row['fcp_p50_ms']:.0f} ms" if row["fcp_p50_ms"] is not None else "-"
+            values = [row["host"], str(row["loads"]), f"{row['p50_ms']:.0f} ms", f"{row['p95_ms']:.0f} ms", fcp]
+            for column, value in enumerate(values):
+                self.table.setItem(i, column, QTableWidgetItem(value))
@@ -0,0 +1,90 @@
+from PyQt5.QtCore import QObject
+from PyQt5.QtWebEngineWidgets import QWebEngineProfile
+from settings_store import SettingsStore
+import os
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+CACHE_TYPES = {
+    "disk": QWebEngineProfile.DiskHttpCache,
+    "memory": QWebEngineProfile.MemoryHttpCache,
+    "none": QWebEngineProfile.NoCache,
+}
+
+PROFILE_SETTINGS = {"http_cache_type", "http_cache_size_mb", "incognito_cache_size_mb", "persistent_cookies"}
+
+COOKIE_POLICIES = {
+    "allow": QWebEngineProfile.AllowPersistentCookies,
+    "force": QWebEngineProfile.ForcePersistentCookies,
+    "none": QWebEngineProfile.NoPersistentCookies,
+}
+
+
+def directory_size(path):
+    total, files = 0, 0
+    for root, dirs, names in os.walk(path):
+        for name in names:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+                files += 1
+            except OSError:
+                pass
+    return total, files
+
+
+# Owns the two profiles every tab shares: the persistent default profile and
+# one off-the-record profile for all incognito tabs, so incognito tabs share
+# a network context, memory cache and warm connections. Cache and cookie
+# settings come from the shared SettingsStore and are reapplied when they
+# change.
+class ProfileManager(QObject):
+    def __init__(self, parent=None, settings=None):
+        super().__init__(parent)
+        self.normal = QWebEngineProfile.defaultProfile()
+        self.incognito = QWebEngineProfile(self)
+        self.settings = settings or SettingsStore.shared()
+        self.configure(self.settings.snapshot())
+        self.settings.changed.connect(self.apply_settings)
+
+    def apply_settings(self, diff):
+        # The diff holds only the keys that changed; most are page settings
+        if PROFILE_SETTINGS.intersection(diff):
+            self.configure(self.settings.snapshot())
+
+    def configure(self, values):
+        cache_type, cookies = values["http_cache_type"], values["persistent_cookies"]
+        cache_size_mb, incognito_cache_size_mb = values["http_cache_size_mb"], values["incognito_cache_size_mb"]
+        self.normal.setHttpCacheType(CACHE_TYPES.get(cache_type, QWebEngineProfile.DiskHttpCache))
+        self.normal.setHttpCacheMaximumSize(cache_size_mb * 1024 * 1024)
+        self.normal.setPersistentCookiesPolicy(COOKIE_POLICIES.get(cookies, QWebEngineProfile.AllowPersistentCookies))
+
+        # Off-the-record profiles can only keep their cache in memory
+        self.incognito.setHttpCacheType(QWebEngineProfile.MemoryHttpCache)
+        self.incognito.setHttpCacheMaximumSize(incognito_cache_size_mb * 1024 * 1024)
+        logging.info(f"HTTP cache: {cache_type} {cache_size_mb} MB, incognito memory {incognito_cache_size_mb} MB, "
+                     f"cookies: {cookies}")
+
+    def profile(self, incognito=False):
+        return self.incognito if incognito else self.normal
+
+    def profiles(self):
+        return [self.normal, self.incognito]
+
+    def cache_stats(self):
+        # Qt WebEngine does not expose cache hit counters; report what is on disk
+        stats = {}
+        for name, profile in (("normal", self.normal), ("incognito", self.incognito)):
+            cache_type = profile.httpCacheType()
+            size, entries = (0, 0)
+            if cache_type == QWebEngineProfile.DiskHttpCache and profile.cachePath():
+                size, entries = directory_size(profile.cachePath())
+            stats[name] = {
+                "type": next((key for key, value in CACHE_TYPES.items() if value == cache_type), "unknown"),
+                "max_size": profile.httpCacheMaximumSize(),
+                "disk_size": size,
+                "disk_entries": entries,
+                "path": profile.cachePath(),
+            }
+        return stats
@@ -0,0 +1,279 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton,
+                             QHeaderView, QAbstractItemView, QMessageBox, QFileDialog, QLabel)
+from PyQt5.QtCore import Qt, QObject, QThread, QTimer, pyqtSignal
+from lifecycle import PAGE_SIZE
+from config import RESOURCE_SAMPLE_SECONDS, RESOURCE_HISTORY_SAMPLES
+from collections import deque
+import os
+import json
+import time
+import signal
+import threading
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def process_stats(pid):
+    # (rss, pss, cpu seconds) from /proc; pss is None where smaps_rollup is
+    # missing or unreadable, and None is returned once the process is gone
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            rss = int(f.read().split()[1]) * PAGE_SIZE
+        with open(f"/proc/{pid}/stat") as f:
+            # The command name may contain spaces; fields resume after ")"
+            fields = f.read().rsplit(")", 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    except (OSError, ValueError, IndexError):
+        return None
+    pss = None
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    pss = int(line.split()[1]) * 1024
+                    break
+    except (OSError, ValueError, IndexError):
+        pass
+    return rss, pss, cpu
+
+
+# Reads /proc for the renderers the GUI thread hands it. Only the newest
+# request is kept; each renderer is read once per round even when several
+# tabs share it, and CPU use is the CPU time delta over the wall time delta.
+class ResourceSampler(QThread):
+    samplesReady = pyqtSignal(float, list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.condition = threading.Condition()
+        self.pending = None
+        self.running = True
+        self.previous = {}
+
+    def request(self, targets):
+        with self.condition:
+            self.pending = targets
+            self.condition.notify()
+
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.wait(2000)
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.running and self.pending is None:
+                    self.condition.wait()
+                if not self.running:
+                    break
+                targets, self.pending = self.pending, None
+            self.samplesReady.emit(time.time(), self.sample(targets))
+
+    def sample(self, targets):
+        now = time.monotonic()
+        processes = {}
+        sharing = {}
+        for tab_id, title, url, pid in targets:
+            sharing[pid] = sharing.get(pid, 0) + 1
+            if pid in processes:
+                continue
+            stats = process_stats(pid)
+            if stats is None:
+                processes[pid] = None
+                continue
+            rss, pss, cpu_time = stats
+            cpu = 0.0
+            previous = self.previous.get(pid)
+            if previous is not None and now > previous[0]:
+                cpu = max(0.0, (cpu_time - previous[1]) / (now - previous[0]) * 100)
+            processes[pid] = (rss, pss, cpu)
+            self.previous[pid] = (now, cpu_time)
+
+        # Forget renderers that have exited
+        for pid in [pid for pid in self.previous if pid not in processes]:
+            del self.previous[pid]
+
+        rows = []
+        for tab_id, title, url, pid in targets:
+            stats = processes.get(pid)
+            if stats is None:
+                continue
+            rss, pss, cpu = stats
+            rows.append({"tab_id": tab_id, "title": title, "url": url, "pid": pid, "rss": rss, "pss": pss,
+                         "cpu": round(cpu, 1), "shared": sharing[pid]})
+        return rows
+
+
+# Maps each live tab to its renderer PID on a timer and keeps the sampler's
+# results in a ring buffer of the last RESOURCE_HISTORY_SAMPLES rounds, which
+# can be exported as JSON lines to track memory growth per site. Rounds are
+# stored as tuples, and each (title, url) pair is stored once and shared by
+# every round that saw it.
+class ResourceMonitor(QObject):
+    updated = pyqtSignal(float, list)
+
+    def __init__(self, browser, interval=RESOURCE_SAMPLE_SECONDS, history=RESOURCE_HISTORY_SAMPLES):
+        super().__init__(browser)
+        self.browser = browser
+        self.history = deque(maxlen=history)
+        self.latest = []
+        self.labels = {}
+
+        self.sampler = ResourceSampler()
+        self.sampler.samplesReady.connect(self.on_samples)
+        self.sampler.start()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(interval * 1000))
+        self.timer.timeout.connect(self.request_sample)
+        self.timer.start()
+
+    def request_sample(self):
+        # renderProcessPid is a Qt call, so the PID map is built here
+        targets = []
+        tabs = self.browser.tabs
+        for i in range(tabs.count()):
+            tab = tabs.widget(i)
+            if tab.is_placeholder:
+                continue
+            pid = tab.renderer_pid()
+            if pid:
+                targets.append((tab.tab_id, tabs.tabText(i), tab.current_url(), pid))
+        self.sampler.request(targets)
+
+    def on_samples(self, timestamp, rows):
+        self.latest = rows
+        # Pairs only older rounds use stay alive through them; the table is
+        # started over once it outgrows what the open tabs need
+        if len(self.labels) > 4 * len(rows) + 64:
+            self.labels = {}
+        labels = self.labels
+        compact = []
+        for row in rows:
+            label = (row["title"], row["url"])
+            label = labels.setdefault(label, label)
+            compact.append((row["tab_id"], label, row["pid"], row["rss"], row["pss"], row["cpu"], row["shared"]))
+        self.history.append((timestamp, tuple(compact)))
+        self.updated.emit(timestamp, rows)
+
+    def export(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for timestamp, rows in self.history:
+                for tab_id, (title, url), pid, rss, pss, cpu, shared in rows:
+                    f.write(json.dumps({"tab_id": tab_id, "title": title, "url": url, "pid": pid, "rss": rss,
+                                        "pss": pss, "cpu": cpu, "shared": shared, "time": timestamp}) + "\n")
+
+    def close(self):
+        self.timer.stop()
+        self.sampler.stop()
+
+
+def format_megabytes(value):
+    return "-" if value is None else f"{value / 1048576:.1f} MB"
+
+
+class TaskManagerDialog(QDialog):
+    def __init__(self, browser):
+        super().__init__(browser)
+        self.browser = browser
+        self.monitor = browser.resource_monitor
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.setWindowTitle("Task Manager")
+        self.resize(760, 420)
+
+        layout = QVBoxLayout()
+        self.table = QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels(["Tab", "Process", "Memory", "Proportional", "CPU"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        layout.addWidget(self.table)
+
+        # What the tab lifecycle manager has done this session
+        self.lifecycle_label = QLabel()
+        layout.addWidget(self.lifecycle_label)
+
+        buttons = QHBoxLayout()
+        end_btn = QPushButton("End Process")
+        end_btn.clicked.connect(self.end_process)
+        buttons.addWidget(end_btn)
+        discard_btn = QPushButton("Discard Tab")
+        discard_btn.clicked.connect(self.discard_selected)
+        buttons.addWidget(discard_btn)
+        export_btn = QPushButton("Export History")
+        export_btn.clicked.connect(self.export_history)
+        buttons.addWidget(export_btn)
+        buttons.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.close)
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        self.show_samples(0.0, self.monitor.latest)
+        self.monitor.updated.connect(self.show_samples)
+        self.monitor.request_sample()
+
+    def show_samples(self, timestamp, rows):
+        selected = self.selected_row()
+        selected_id = selected["tab_id"] if selected else None
+        self.rows = sorted(rows, key=lambda row: row["pss"] if row["pss"] is not None else row["rss"], reverse=True)
+        self.table.setRowCount(len(self.rows))
+        for i, row in enumerate(self.rows):
+            process = f"{row['pid']}" + (f" (shared by {row['shared']})" if row["shared"] > 1 else "")
+            values = [row["title"] or row["url"], process, format_megabytes(row["rss"]),
+                      format_megabytes(row["pss"]), f"{row['cpu']:.1f}%"]
+            for column, value in enumerate(values):
+                self.table.setItem(i, column, QTableWidgetItem(value))
+            if row["tab_id"] == selected_id:
+                self.table.selectRow(i)
+        stats = self.browser.lifecycle.stats()
+        self.lifecycle_label.setText(
+            f"Discarded tabs: {stats['discarded_tabs']}, reactivated: {stats['reactivated_tabs']}, "
+            f"memory reclaimed: {format_megabytes(stats['reclaimed_bytes'])}")
+
+    def selected_row(self):
+        items = self.table.selectedItems()
+        return self.rows[items[0].row()] if items else None
+
+    def end_process(self):
+        row = self.selected_row()
+        if row is None:
+            return
+        if row["shared"] > 1 and QMessageBox.question(
+                self, "End Process",
+                f"This process is shared by {row['shared']} tabs. End it anyway?") != QMessageBox.Yes:
+            return
+        try:
+            os.kill(row["pid"], signal.SIGKILL)
+            logging.info(f"Killed renderer {row['pid']} for tab {row['tab_id']}")
+        except OSError as e:
+            QMessageBox.warning(self, "End Process", f"Failed to end process {row['pid']}: {str(e)}")
+
+    def discard_selected(self):
+        row = self.selected_row()
+        if row is None:
+            return
+        index = self.browser.find_tab(row["tab_id"])
+        if index == self.browser.tabs.currentIndex():
+            QMessageBox.information(self, "Discard Tab", "The current tab cannot be discarded.")
+            return
+        if index >= 0 and self.browser.discard_tab(index) is not None:
+            self.monitor.request_sample()
+
+    def export_history(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Resource History", "resource_history.jsonl",
+                                              "JSON Lines (*.jsonl)")
+        if not path:
+            return
+        try:
+            self.monitor.export(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export", f"Failed to export resource history: {str(e)}")
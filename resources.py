@@ -1,68 +1,87 @@
-from PyQt5.QtCore import Qt, QUrl, QSize, QDir
-from PyQt5.QtWebEngineWidgets import QWebEngineView
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtGui import QPainter
+from PyQt5.QtCore import Qt, QSize, QTimer
+from lottie import LottieAnimation
 import os
 import logging
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-class AnimationPlayer(QWebEngineView):
+MAX_FRAME_RATE = 30
+
+
+# Plays Lottie animations with QPainter. Parsed animations and rasterized
+# frames are shared process-wide, so every tab's spinner reuses the same
+# pixmaps and frames are only drawn the first time they are shown.
+class AnimationPlayer(QWidget):
+    animations = {}
+    frame_cache = {}
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setFixedSize(QSize(100, 100))
         self.setContextMenuPolicy(Qt.NoContextMenu)
-        self.page().setBackgroundColor(Qt.transparent)
-    
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.animation_path = None
+        self.animation = None
+        self.frames = None
+        self.frame = 0
+        self.frame_step = 1
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.next_frame)
+
     def load_animation(self, animation_path):
+        if animation_path == self.animation_path:
+            return
+
         base_dir = os.path.dirname(os.path.abspath(__file__))
         full_path = os.path.join(base_dir, f"{animation_path}.json")
-        lottie_path = os.path.join(base_dir, "resources", "lottie.min.js")
-        
-        # Convert paths to use forward slashes for web compatibility
-        full_path = full_path.replace('\\', '/')
-        lottie_path = lottie_path.replace('\\', '/')
-        
-        if not os.path.exists(full_path):
-            logging.error(f"Animation file not found: {full_path}")
-            self.setHtml("<div>Animation not available</div>")
-            return
-        
-        if not os.path.exists(lottie_path):
-            logging.error(f"Lottie library not found: {lottie_path}")
-            self.setHtml("<div>Lottie library not available</div>")
+
+        animation = AnimationPlayer.animations.get(full_path)
+        if animation is None:
+            if not os.path.exists(full_path):
+                logging.error(f"Animation file not found: {full_path}")
+                return
+            try:
+                animation = LottieAnimation.load(full_path)
+            except (OSError, ValueError, KeyError) as e:
+                logging.error(f"Failed to load animation {full_path}: {str(e)}")
+                return
+            AnimationPlayer.animations[full_path] = animation
+
+        self.animation_path = animation_path
+        self.animation = animation
+        self.frame = 0
+        self.frame_step = max(1, round(animation.frame_rate / MAX_FRAME_RATE))
+        key = (full_path, self.width(), self.height(), self.devicePixelRatioF())
+        self.frames = AnimationPlayer.frame_cache.setdefault(key, [None] * animation.frame_count)
+        self.timer.setInterval(int(1000 * self.frame_step / animation.frame_rate))
+        if self.isVisible():
+            self.timer.start()
+        self.update()
+
+    def next_frame(self):
+        self.frame = (self.frame + self.frame_step) % len(self.frames)
+        self.update()
+
+    def showEvent(self, event):
+        if self.animation is not None:
+            self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def paintEvent(self, event):
+        if self.animation is None:
             return
-        
-        logging.info(f"Loading animation from {full_path} with Lottie library {lottie_path}")
-        
-        self.setHtml(f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <script src="file:///{lottie_path}"></script>
-            <style>
-                body {{ margin: 0; background: transparent; }}
-                #animation {{ width: 100%; height: 100%; }}
-            </style>
-        </head>
-        <body>
-            <div id="animation"></div>
-            <script>
-                try {{
-                    if (typeof lottie !== 'undefined') {{
-                        var animation = lottie.loadAnimation({{
-                            container: document.getElementById('animation'),
-                            renderer: 'svg',
-                            loop: true,
-                            autoplay: true,
-                            path: 'file:///{full_path}'
-                        }});
-                    }} else {{
-                        document.getElementById('animation').innerText = 'Lottie library not loaded';
-                    }}
-                }} catch (e) {{
-                    document.getElementById('animation').innerText = 'Error loading animation: ' + e.message;
-                }}
-            </script>
-        </body>
-        </html>
-        """)
\ No newline at end of file
+        pixmap = self.frames[self.frame]
+        if pixmap is None:
+            pixmap = self.animation.rasterize(self.frame, self.size(), self.devicePixelRatioF())
+            self.frames[self.frame] = pixmap
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, pixmap)
+        painter.end()
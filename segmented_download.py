@@ -0,0 +1,260 @@
+import os
+import json
+import hashlib
+import threading
+import urllib.request
+import urllib.error
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+SEGMENT_COUNT = 4
+MIN_SEGMENT_SIZE = 1024 * 1024
+CHUNK_SIZE = 256 * 1024
+JOURNAL_INTERVAL = 1.0
+RETRIES = 3
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) Utharam"
+
+
+class DownloadError(Exception):
+    pass
+
+
+def journal_path(path):
+    return path + ".download"
+
+
+def probe(url, timeout=30):
+    # A one-byte range request tells us the size, whether ranges work and
+    # the validator used to make sure a resume continues the same file
+    request = urllib.request.Request(url, headers={"Range": "bytes=0-0", "User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+        if response.status == 206:
+            content_range = response.headers.get("Content-Range", "")
+            total = content_range.rpartition("/")[2]
+            if total.isdigit():
+                return int(total), True, validator
+        length = response.headers.get("Content-Length")
+        return (int(length) if length and length.isdigit() else -1), False, validator
+
+
+def split_segments(total, count):
+    count = max(1, min(count, total // MIN_SEGMENT_SIZE))
+    size = total // count
+    segments = []
+    for index in range(count):
+        start = index * size
+        end = total - 1 if index == count - 1 else start + size - 1
+        segments.append([start, end, 0])
+    return segments
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Fetches one HTTP(S) resource over several byte-range connections into a
+# preallocated file with positional writes. Progress per segment is kept in a
+# sidecar journal (<path>.download), written only after the data it covers
+# has been fsynced, so a download stopped by a crash or by stop() resumes
+# where it left off. The finished file's sha256 is checked or recorded.
+class SegmentedDownload:
+    def __init__(self, url, path, segments=SEGMENT_COUNT, expected_sha256=None, timeout=30,
+                 on_progress=None, on_finished=None):
+        self.url = url
+        self.path = path
+        self.segment_count = segments
+        self.expected_sha256 = expected_sha256
+        self.timeout = timeout
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+
+        self.total = -1
+        self.validator = None
+        self.segments = []
+        self.resumable = False
+        self.sha256 = None
+        self.state = "in_progress"
+        self.error = None
+
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.discard = False
+        # Set when what is on disk can never be completed by resuming
+        self.failed = False
+        self.thread = None
+
+    @property
+    def received(self):
+        with self.lock:
+            return sum(done for start, end, done in self.segments)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="SegmentedDownload", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=5.0):
+        # Keep the partial file and journal for a later resume
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    def cancel(self):
+        self.discard = True
+        self.stopping.set()
+
+    def run(self):
+        fd = None
+        try:
+            if not self.load_journal():
+                self.total, self.resumable, self.validator = probe(self.url, self.timeout)
+                if self.resumable and self.total > 0:
+                    self.segments = split_segments(self.total, self.segment_count)
+                else:
+                    self.resumable = False
+                    self.segments = [[0, max(self.total, 0) - 1, 0]]
+
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            if self.total > 0 and os.fstat(fd).st_size != self.total:
+                self.preallocate(fd)
+            if self.resumable:
+                self.save_journal(fd)
+
+            workers = [threading.Thread(target=self.fetch_segment, args=(fd, segment), daemon=True)
+                       for segment in self.segments if segment[0] + segment[2] <= segment[1] or segment[1] < 0]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                while worker.is_alive():
+                    worker.join(JOURNAL_INTERVAL)
+                    if self.resumable:
+                        self.save_journal(fd)
+
+            if self.error is None and not self.stopping.is_set():
+                os.fsync(fd)
+                self.finish()
+        except (OSError, ValueError, urllib.error.URLError, DownloadError) as e:
+            self.error = self.error or e
+        finally:
+            if fd is not None:
+                if self.resumable and not (self.discard or self.failed) and self.state != "completed":
+                    self.save_journal(fd)
+                os.close(fd)
+
+        if self.discard or self.failed:
+            # A failed job's ranges mix two versions of the file, so neither
+            # they nor the journal may be resumed on the next start
+            self.state = "cancelled" if self.discard else "failed"
+            for leftover in (self.path, journal_path(self.path)):
+                try:
+                    os.remove(leftover)
+                except OSError:
+                    pass
+            if self.failed:
+                logging.error(f"Segmented download of {self.url} failed: {str(self.error)}")
+        elif self.state != "completed":
+            self.state = "interrupted"
+            if self.error is not None:
+                logging.error(f"Segmented download of {self.url} failed: {str(self.error)}")
+        if self.on_finished:
+            self.on_finished()
+
+    def preallocate(self, fd):
+        try:
+            os.posix_fallocate(fd, 0, self.total)
+        except (AttributeError, OSError):
+            os.ftruncate(fd, self.total)
+
+    def fetch_segment(self, fd, segment):
+        attempts = 0
+        while not self.stopping.is_set():
+            start, end, done = segment
+            headers = {"User-Agent": USER_AGENT}
+            if self.resumable:
+                headers["Range"] = f"bytes={start + done}-{end}"
+                if self.validator:
+                    headers["If-Range"] = self.validator
+            elif done:
+                # Without range support a retry has to start over
+                with self.lock:
+                    segment[2] = done = 0
+            try:
+                request = urllib.request.Request(self.url, headers=headers)
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    if self.resumable and response.status != 206:
+                        # Retrying would not help: ranges unsupported or If-Range failed
+                        self.error = DownloadError("server ignored the range request or the file changed")
+                        self.failed = True
+                        self.stopping.set()
+                        return
+                    while not self.stopping.is_set():
+                        chunk = response.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        os.pwrite(fd, chunk, start + done)
+                        done += len(chunk)
+                        with self.lock:
+                            segment[2] = done
+                        if self.on_progress:
+                            self.on_progress()
+                if self.stopping.is_set() or end < 0 or start + done > end:
+                    if end < 0:
+                        with self.lock:
+                            segment[1] = done - 1
+                    return
+                raise DownloadError(f"segment {start}-{end} ended early")
+            except (OSError, urllib.error.URLError, DownloadError) as e:
+                attempts += 1
+                if attempts > RETRIES:
+                    self.error = e
+                    self.stopping.set()
+                    return
+                logging.info(f"Retrying segment {start}-{end} of {self.url}: {str(e)}")
+                self.stopping.wait(min(2 ** attempts, 10))
+
+    def finish(self):
+        if self.total < 0:
+            self.total = self.received
+        self.sha256 = file_sha256(self.path)
+        if self.expected_sha256 and self.sha256 != self.expected_sha256.lower():
+            raise DownloadError(f"checksum mismatch: expected {self.expected_sha256}, got {self.sha256}")
+        self.state = "completed"
+        try:
+            os.remove(journal_path(self.path))
+        except OSError:
+            pass
+
+    def load_journal(self):
+        try:
+            with open(journal_path(self.path), "r") as f:
+                journal = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if journal.get("url") != self.url or not os.path.exists(self.path):
+            return False
+        self.total = journal["total"]
+        self.validator = journal.get("validator")
+        self.segments = [list(segment) for segment in journal["segments"]]
+        self.resumable = True
+        logging.info(f"Resuming {self.url} at {self.received} of {self.total} bytes")
+        return True
+
+    def save_journal(self, fd):
+        # Snapshot progress, make the data it covers durable, then swap the
+        # journal in atomically; it never claims bytes that are not on disk
+        with self.lock:
+            journal = {"url": self.url, "total": self.total, "validator": self.validator,
+                       "segments": [list(segment) for segment in self.segments]}
+        os.fsync(fd)
+        temp_path = journal_path(self.path) + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(journal, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, journal_path(self.path))
@@ -0,0 +1,217 @@
+import os
+import json
+import base64
+import queue
+import threading
+import time
+import logging
+from config import RECENTLY_CLOSED_TABS
+from instrumentation import timed
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+SESSION_PATH = "session.json"
+JOURNAL_PATH = "session.journal"
+
+# Journal records written since the last snapshot before it is compacted
+COMPACT_EVERY = 500
+
+_STOP = object()
+
+
+# Back/forward stacks are QDataStream blobs, kept as base64 in the JSON files
+def encode_history(blob):
+    return base64.b64encode(blob).decode("ascii") if blob else None
+
+
+def decode_history(text):
+    try:
+        return base64.b64decode(text) if text else None
+    except ValueError:
+        return None
+
+
+def apply_record(tabs, record, closed):
+    op = record["op"]
+    tab_id = record.get("tab_id")
+    index = next((i for i, tab in enumerate(tabs) if tab.get("tab_id") == tab_id), -1)
+    if op == "open":
+        if index >= 0:
+            del tabs[index]
+        tabs.insert(min(record["index"], len(tabs)), dict(record["tab"]))
+        # Reopening a closed tab takes it out of the ring buffer
+        closed[:] = [tab for tab in closed if tab.get("tab_id") != tab_id]
+    elif op == "update" and index >= 0:
+        tabs[index].update(record["fields"])
+    elif op == "close" and index >= 0:
+        del tabs[index]
+        if record.get("tab"):
+            closed.append(dict(record["tab"], index=index))
+            del closed[:-RECENTLY_CLOSED_TABS]
+    elif op == "move" and index >= 0:
+        tabs.insert(min(record["index"], len(tabs) - 1), tabs.pop(index))
+
+
+def load_session(snapshot_path=SESSION_PATH, journal_path=JOURNAL_PATH):
+    # Snapshot first, then every journal record newer than it. A torn last
+    # line from a crash mid-append ends the replay.
+    seq, tabs, closed = 0, [], []
+    try:
+        with open(snapshot_path, "r") as f:
+            snapshot = json.load(f)
+        if isinstance(snapshot, list):
+            tabs = snapshot  # Pre-journal session.json
+        else:
+            seq, tabs = snapshot["seq"], snapshot["tabs"]
+            closed = snapshot.get("closed", [])
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError) as e:
+        logging.error(f"Failed to read session snapshot: {str(e)}")
+
+    replayed = 0
+    try:
+        with open(journal_path, "r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if record["seq"] <= seq:
+                    continue
+                apply_record(tabs, record, closed)
+                seq = record["seq"]
+                replayed += 1
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.error(f"Failed to read session journal: {str(e)}")
+
+    if replayed:
+        logging.info(f"Replayed {replayed} session journal records")
+    return seq, tabs, closed
+
+
+# Appends tab-state changes (open, close, update, move) to session.journal on
+# its own thread, one small JSON line per change, so recording a change costs
+# the same with 2 tabs or 200. Every COMPACT_EVERY records the thread writes
+# its view of the session to session.json (temp file, fsync, rename) and
+# truncates the journal. Records carry sequence numbers, so replaying a
+# journal that outlived its snapshot's rename never applies a change twice.
+class SessionJournal(threading.Thread):
+    def __init__(self, seq, tabs, closed=(), snapshot_path=SESSION_PATH, journal_path=JOURNAL_PATH,
+                 flush_interval=0.5):
+        super().__init__(name="SessionJournal", daemon=True)
+        self.seq = seq
+        self.tabs = [dict(tab) for tab in tabs]
+        self.closed_tabs = [dict(tab) for tab in closed]
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self.pending_records = 0
+
+    # Public async API, safe to call from the GUI thread
+
+    def opened(self, tab, index):
+        self.queue.put({"op": "open", "tab_id": tab["tab_id"], "index": index, "tab": tab})
+
+    def updated(self, tab_id, **fields):
+        self.queue.put({"op": "update", "tab_id": tab_id, "fields": fields})
+
+    def closed(self, tab_id, tab=None):
+        # With tab, the closed tab's state goes into the recently closed ring buffer
+        self.queue.put({"op": "close", "tab_id": tab_id, "tab": tab})
+
+    def moved(self, tab_id, index):
+        self.queue.put({"op": "move", "tab_id": tab_id, "index": index})
+
+    def compact(self, tabs=None, closed=None):
+        # With tabs, the snapshot is taken from them instead of the replayed state
+        self.queue.put(("compact", tabs, closed))
+
+    def close(self, timeout=5.0):
+        if not self.is_alive():
+            return
+        self.queue.put(_STOP)
+        self.join(timeout)
+
+    # Worker thread
+
+    def run(self):
+        try:
+            journal = open(self.journal_path, "a", encoding="utf-8")
+        except OSError as e:
+            logging.error(f"Failed to open session journal: {str(e)}")
+            return
+
+        # Fold whatever was replayed at startup (possibly ending in a torn
+        # line) into a fresh snapshot before appending anything
+        self.write_snapshot(journal)
+
+        running = True
+        while running:
+            item = self.queue.get()
+            lines = []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    running = False
+                    break
+                if isinstance(item, tuple):
+                    self.write_lines(journal, lines)
+                    lines = []
+                    if item[1] is not None:
+                        self.tabs = [dict(tab) for tab in item[1]]
+                    if item[2] is not None:
+                        self.closed_tabs = [dict(tab) for tab in item[2]]
+                    self.write_snapshot(journal)
+                else:
+                    self.seq += 1
+                    item["seq"] = self.seq
+                    apply_record(self.tabs, item, self.closed_tabs)
+                    lines.append(json.dumps(item, separators=(",", ":")))
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            # One write and one fsync per batch
+            self.write_lines(journal, lines)
+            if self.pending_records >= COMPACT_EVERY:
+                self.write_snapshot(journal)
+
+        journal.close()
+
+    @timed("session.write_lines")
+    def write_lines(self, journal, lines):
+        if not lines:
+            return
+        try:
+            journal.write("\n".join(lines) + "\n")
+            journal.flush()
+            os.fsync(journal.fileno())
+            self.pending_records += len(lines)
+        except OSError as e:
+            logging.error(f"Failed to append to session journal: {str(e)}")
+
+    @timed("session.write_snapshot")
+    def write_snapshot(self, journal):
+        temp_path = self.snapshot_path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"seq": self.seq, "tabs": self.tabs, "closed": self.closed_tabs}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.snapshot_path)
+
+            # Everything in the journal is now covered by the snapshot
+            journal.seek(0)
+            journal.truncate()
+            self.pending_records = 0
+        except OSError as e:
+            logging.error(f"Failed to write session snapshot: {str(e)}")
@@ -1,41 +1,66 @@
-from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QCheckBox, QMessageBox
-import json
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QFormLayout, QLabel, QPushButton, QCheckBox,
+                             QComboBox, QLineEdit, QSpinBox, QMessageBox)
+from settings_store import SETTINGS, CHOICES
 
 class SettingsDialog(QDialog):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
         self.setWindowTitle("Utharam Browser Settings")
-        self.setFixedSize(400, 300)
-        
+        self.setMinimumWidth(400)
+
         layout = QVBoxLayout()
         layout.setContentsMargins(20, 20, 20, 20)
-        
-        # Example settings
+
         title = QLabel("<h2>Settings</h2>")
         layout.addWidget(title)
-        
-        # JavaScript toggle
-        self.js_toggle = QCheckBox("Enable JavaScript")
-        self.js_toggle.setChecked(True)
-        layout.addWidget(self.js_toggle)
-        
+
+        # One checkbox per switch, in the store's order; text settings below
+        self.toggles = {}
+        self.fields = {}
+        form = QFormLayout()
+        for key, (kind, default, label) in SETTINGS.items():
+            if kind is bool:
+                toggle = QCheckBox(label)
+                toggle.setChecked(store.get(key))
+                layout.addWidget(toggle)
+                self.toggles[key] = toggle
+            elif key in CHOICES:
+                combo = QComboBox()
+                combo.addItems(CHOICES[key])
+                combo.setCurrentText(store.get(key))
+                form.addRow(label, combo)
+                self.fields[key] = combo.currentText
+            elif kind is int:
+                spin = QSpinBox()
+                spin.setRange(0, 1 << 20)
+                spin.setValue(store.get(key))
+                form.addRow(label, spin)
+                self.fields[key] = spin.value
+            else:
+                field = QLineEdit(store.get(key))
+                form.addRow(label, field)
+                self.fields[key] = field.text
+        layout.addLayout(form)
+
         # Save button
         save_btn = QPushButton("Save")
         save_btn.clicked.connect(self.save_settings)
         layout.addWidget(save_btn)
-        
+
         # Close button
         close_btn = QPushButton("Close")
         close_btn.clicked.connect(self.close)
         layout.addWidget(close_btn)
-        
+
         self.setLayout(layout)
-    
+
     def save_settings(self):
         try:
-            settings = {"javascript_enabled": self.js_toggle.isChecked()}
-            with open("settings.json", "w") as f:
-                json.dump(settings, f)
+            # Open tabs pick up the changed keys immediately
+            values = {key: toggle.isChecked() for key, toggle in self.toggles.items()}
+            values.update({key: read() for key, read in self.fields.items()})
+            self.store.update(**values)
             QMessageBox.information(self, "Settings", "Settings saved successfully!")
         except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to save settings: {str(e)}")
\ No newline at end of file
+            QMessageBox.warning(self, "Error", f"Failed to save settings: {str(e)}")
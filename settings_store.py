@@ -0,0 +1,124 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+from config import (CONTENT_BLOCKING, HTTP_CACHE_TYPE, HTTP_CACHE_SIZE_MB, INCOGNITO_CACHE_SIZE_MB,
+                    PERSISTENT_COOKIES)
+from engine_flags import PRESETS
+import json
+import os
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+SETTINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "settings.json")
+
+# Every setting with its type, default and the label the settings dialog
+# shows. The performance switches follow the page settings; the cache and
+# cookie settings are applied to the shared profiles as they change; the
+# engine settings are read once, before Qt WebEngine starts.
+SETTINGS = {
+    "javascript_enabled": (bool, True, "Enable JavaScript"),
+    "local_storage_enabled": (bool, True, "Enable local storage"),
+    "content_blocking": (bool, CONTENT_BLOCKING, "Block ads and trackers"),
+    "images_enabled": (bool, True, "Load images"),
+    "plugins_enabled": (bool, True, "Enable plugins"),
+    "lazy_background_tabs": (bool, False, "Load restored background tabs only when opened"),
+    "home_url": (str, "https://www.google.com", "Home page (new tabs and the Home button)"),
+    "http_cache_type": (str, HTTP_CACHE_TYPE, "HTTP cache"),
+    "http_cache_size_mb": (int, HTTP_CACHE_SIZE_MB, "HTTP cache size (MB)"),
+    "incognito_cache_size_mb": (int, INCOGNITO_CACHE_SIZE_MB, "Incognito memory cache size (MB)"),
+    "persistent_cookies": (str, PERSISTENT_COOKIES, "Persistent cookies"),
+    "engine_preset": (str, "default", "Engine preset (applies after restart)"),
+    "engine_extra_flags": (str, "", "Extra Chromium flags (applies after restart)"),
+}
+
+# Settings limited to a fixed set of values
+CHOICES = {
+    "http_cache_type": ("disk", "memory", "none"),
+    "persistent_cookies": ("allow", "force", "none"),
+    "engine_preset": tuple(PRESETS),
+}
+
+
+def validate(key, value):
+    kind = SETTINGS[key][0]
+    if type(value) is not kind:
+        raise TypeError(f"Setting {key} must be {kind.__name__}, got {value!r}")
+    if kind is int and value < 0:
+        raise ValueError(f"Setting {key} must not be negative, got {value!r}")
+    if key in CHOICES and value not in CHOICES[key]:
+        raise ValueError(f"Setting {key} must be one of {', '.join(CHOICES[key])}, got {value!r}")
+
+
+# Loaded once at startup and shared by every tab. Reads come from the
+# in-memory snapshot; update() validates and saves the changed keys with an
+# atomic rename and emits only what changed, so live tabs apply a diff.
+class SettingsStore(QObject):
+    changed = pyqtSignal(dict)
+    shared_store = None
+
+    def __init__(self, path=SETTINGS_PATH, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.values = {key: default for key, (kind, default, label) in SETTINGS.items()}
+        self.load()
+
+    @classmethod
+    def shared(cls):
+        if cls.shared_store is None:
+            cls.shared_store = SettingsStore()
+        return cls.shared_store
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.error(f"Failed to load settings: {str(e)}")
+            return
+        for key, value in saved.items():
+            if key not in SETTINGS:
+                continue
+            try:
+                validate(key, value)
+            except (TypeError, ValueError) as e:
+                logging.error(f"Ignoring setting {key}: {str(e)}")
+                continue
+            self.values[key] = value
+
+    def get(self, key):
+        return self.values[key]
+
+    def snapshot(self):
+        return dict(self.values)
+
+    def update(self, **values):
+        for key, value in values.items():
+            if key not in SETTINGS:
+                raise KeyError(f"Unknown setting: {key}")
+            validate(key, value)
+        diff = {key: value for key, value in values.items() if self.values[key] != value}
+        if not diff:
+            return diff
+        previous = dict(self.values)
+        self.values.update(diff)
+        try:
+            self.save()
+        except OSError:
+            self.values = previous
+            raise
+        self.changed.emit(diff)
+        return diff
+
+    def save(self):
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.values, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logging.error(f"Failed to save settings: {str(e)}")
+            raise
@@ -0,0 +1,38 @@
+from PyQt5.QtCore import QObject, QEvent, pyqtSignal
+import time
+import logging
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# main.py imports this module before anything else, so this is as close to
+# process start as Python code can measure
+PROCESS_START = time.perf_counter()
+
+phases = []
+
+
+def mark(phase):
+    # Logs each startup phase with its time since process start and since the
+    # previous phase, so a slow phase shows up in the log on every launch
+    now = (time.perf_counter() - PROCESS_START) * 1000
+    previous = phases[-1][1] if phases else 0.0
+    phases.append((phase, now))
+    logging.info(f"Startup: {phase} at {now:.0f} ms (+{now - previous:.0f} ms)")
+
+
+# Emits painted once, on the first paint event of the widget it watches, and
+# then removes itself.
+class FirstPaintWatcher(QObject):
+    painted = pyqtSignal()
+
+    def __init__(self, widget):
+        super().__init__(widget)
+        self.widget = widget
+        widget.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if watched is self.widget and event.type() == QEvent.Paint:
+            self.widget.removeEventFilter(self)
+            self.painted.emit()
+        return False
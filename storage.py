@@ -0,0 +1,358 @@
+import sqlite3
+import threading
+import queue
+import time
+import logging
+import math
+import urllib.parse
+from instrumentation import timed
+
+# Set up logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+_STOP = object()
+
+# Frecency is the visit count with every visit decaying exponentially with age.
+# It is stored as ln(sum(exp((visit_time - EPOCH) / TAU))): every row decays at
+# the same rate, so ordering by the stored value equals ordering by the
+# current decayed score, and it can be indexed and updated in O(1) per visit.
+FRECENCY_EPOCH = 1577836800  # 2020-01-01
+FRECENCY_HALF_LIFE = 30 * 86400
+FRECENCY_TAU = FRECENCY_HALF_LIFE / math.log(2)
+
+
+def frecency_add(current, visit_time):
+    weight = (visit_time - FRECENCY_EPOCH) / FRECENCY_TAU
+    if current is None:
+        return weight
+    high, low = max(current, weight), min(current, weight)
+    return high + math.log1p(math.exp(low - high))
+
+
+class FrecencySum:
+    def __init__(self):
+        self.value = None
+
+    def step(self, visit_time):
+        self.value = frecency_add(self.value, visit_time)
+
+    def finalize(self):
+        return self.value
+
+
+def register_functions(conn):
+    conn.create_function("frecency_add", 2, frecency_add, deterministic=True)
+    conn.create_aggregate("frecency_sum", 1, FrecencySum)
+
+
+# Create or migrate the schema; callers commit
+def init_database(cursor):
+    register_functions(cursor.connection)
+
+    # Create schema_version table if it doesn't exist
+    cursor.execute('''CREATE TABLE IF NOT EXISTS schema_version
+                         (version INTEGER PRIMARY KEY)''')
+    
+    # Get current schema version
+    cursor.execute("SELECT version FROM schema_version")
+    version = cursor.fetchone()
+    if not version:
+        version = 1
+        cursor.execute("INSERT INTO schema_version (version) VALUES (?)", (version,))
+    else:
+        version = version[0]
+    
+    # Create or update tables based on version
+    if version == 1:
+        cursor.execute('''CREATE TABLE IF NOT EXISTS bookmarks
+                             (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT, url TEXT)''')
+        cursor.execute('''CREATE TABLE IF NOT EXISTS history
+                             (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT, url TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+        
+        # Check if tab_groups table exists and its structure
+        cursor.execute("PRAGMA table_info(tab_groups)")
+        columns = [info[1] for info in cursor.fetchall()]
+        
+        if "tab_groups" not in [table[0] for table in cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")]:
+            cursor.execute('''CREATE TABLE tab_groups
+                                 (tab_id TEXT PRIMARY KEY, group_name TEXT, color TEXT)''')
+        elif "tab_index" in columns and "tab_id" not in columns:
+            cursor.execute('''CREATE TABLE tab_groups_new
+                                 (tab_id TEXT PRIMARY KEY, group_name TEXT, color TEXT)''')
+            cursor.execute('''INSERT INTO tab_groups_new (tab_id, group_name, color)
+                                 SELECT CAST(tab_index AS TEXT), group_name, color FROM tab_groups''')
+            cursor.execute('''DROP TABLE tab_groups''')
+            cursor.execute('''ALTER TABLE tab_groups_new RENAME TO tab_groups''')
+            cursor.execute("UPDATE schema_version SET version = 2")
+            version = 2
+    
+    if version == 1:
+        cursor.execute("UPDATE schema_version SET version = 2")
+        version = 2
+
+    # Version 3: split the append-only history log into urls + visits
+    if version == 2:
+        migrate_history_v3(cursor)
+        cursor.execute("UPDATE schema_version SET version = 3")
+        version = 3
+
+    # Version 4: drop rows written by the old titleChanged -> urlChanged bug
+    if version == 3:
+        cleanup_junk_history(cursor)
+        cursor.execute("UPDATE schema_version SET version = 4")
+        version = 4
+
+    # Version 5: frecency ranking and FTS5 indexes for omnibox suggestions
+    if version == 4:
+        migrate_search_index_v5(cursor)
+        cursor.execute("UPDATE schema_version SET version = 5")
+        version = 5
+
+    # Version 6: download records kept by DownloadManager
+    if version == 5:
+        cursor.execute('''CREATE TABLE IF NOT EXISTS downloads
+                          (id TEXT PRIMARY KEY, url TEXT, path TEXT, received_bytes INTEGER,
+                           total_bytes INTEGER, state TEXT, started INTEGER, finished INTEGER)''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_downloads_started ON downloads(started)")
+        cursor.execute("UPDATE schema_version SET version = 6")
+        version = 6
+
+    # Version 7: checksum of finished downloads
+    if version == 6:
+        cursor.execute("ALTER TABLE downloads ADD COLUMN sha256 TEXT")
+        cursor.execute("UPDATE schema_version SET version = 7")
+        version = 7
+
+    # Version 8: per-navigation page load timings
+    if version == 7:
+        cursor.execute('''CREATE TABLE IF NOT EXISTS page_loads
+                          (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT, host TEXT, started INTEGER, ok INTEGER,
+                           first_progress_ms REAL, load_ms REAL, ttfb_ms REAL, dom_content_loaded_ms REAL,
+                           load_event_ms REAL, first_paint_ms REAL, first_contentful_paint_ms REAL,
+                           transfer_size INTEGER)''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_page_loads_host ON page_loads(host)")
+        cursor.execute("UPDATE schema_version SET version = 8")
+        version = 8
+
+    return version
+
+
+def migrate_history_v3(cursor):
+    cursor.execute('''CREATE TABLE IF NOT EXISTS urls
+                      (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT NOT NULL UNIQUE, title TEXT,
+                       visit_count INTEGER NOT NULL DEFAULT 0, last_visit INTEGER NOT NULL DEFAULT 0)''')
+    cursor.execute('''CREATE TABLE IF NOT EXISTS visits
+                      (id INTEGER PRIMARY KEY AUTOINCREMENT, url_id INTEGER NOT NULL REFERENCES urls(id),
+                       visit_time INTEGER NOT NULL)''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_urls_last_visit ON urls(last_visit)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_visits_time ON visits(visit_time)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_visits_url_id ON visits(url_id)")
+
+    # Both copies are set-based INSERT ... SELECT so sqlite streams the old
+    # rows without ever holding the history log in Python memory. With MAX()
+    # sqlite takes the bare title column from the most recent row.
+    cursor.execute('''INSERT OR IGNORE INTO urls (url, title, visit_count, last_visit)
+                      SELECT url, title, COUNT(*), MAX(COALESCE(CAST(strftime('%s', timestamp) AS INTEGER), 0))
+                      FROM history WHERE url IS NOT NULL GROUP BY url''')
+    cursor.execute('''INSERT INTO visits (url_id, visit_time)
+                      SELECT urls.id, COALESCE(CAST(strftime('%s', history.timestamp) AS INTEGER), 0)
+                      FROM history JOIN urls ON urls.url = history.url
+                      ORDER BY history.id''')
+    cursor.execute("DROP TABLE history")
+
+
+def migrate_search_index_v5(cursor):
+    cursor.execute("ALTER TABLE urls ADD COLUMN frecency REAL")
+    cursor.execute("UPDATE urls SET frecency = (SELECT frecency_sum(visit_time) FROM visits WHERE url_id = urls.id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_urls_frecency ON urls(frecency)")
+
+    # External-content FTS tables: the index stores tokens only and the
+    # triggers below keep it in sync with urls and bookmarks.
+    for table in ("urls", "bookmarks"):
+        cursor.execute(f'''CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts
+                          USING fts5(url, title, content='{table}', content_rowid='id', prefix='2 3')''')
+        cursor.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_fts_insert AFTER INSERT ON {table} BEGIN
+                          INSERT INTO {table}_fts (rowid, url, title) VALUES (new.id, new.url, new.title);
+                          END''')
+        cursor.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_fts_delete AFTER DELETE ON {table} BEGIN
+                          INSERT INTO {table}_fts ({table}_fts, rowid, url, title) VALUES ('delete', old.id, old.url, old.title);
+                          END''')
+        cursor.execute(f'''CREATE TRIGGER IF NOT EXISTS {table}_fts_update AFTER UPDATE OF url, title ON {table}
+                          WHEN old.url IS NOT new.url OR old.title IS NOT new.title BEGIN
+                          INSERT INTO {table}_fts ({table}_fts, rowid, url, title) VALUES ('delete', old.id, old.url, old.title);
+                          INSERT INTO {table}_fts (rowid, url, title) VALUES (new.id, new.url, new.title);
+                          END''')
+        cursor.execute(f"INSERT INTO {table}_fts ({table}_fts) VALUES ('rebuild')")
+
+
+# Page titles used to be re-emitted as URLs, so history holds rows like
+# "Google" or "Inbox (3)" whose url has no valid scheme. Only these are removed.
+HISTORY_SCHEMES = {"http", "https", "file", "ftp", "about", "chrome", "data", "view-source", "qrc"}
+
+
+def is_history_url(url):
+    if not url or any(ch.isspace() for ch in url):
+        return False
+    try:
+        parts = urllib.parse.urlsplit(url)
+    except ValueError:
+        return False
+    if parts.scheme not in HISTORY_SCHEMES:
+        return False
+    if parts.scheme in ("http", "https", "ftp", "chrome") and not parts.netloc:
+        return False
+    return True
+
+
+def cleanup_junk_history(cursor, chunk_size=500):
+    # Read in batches so only the junk ids are held, not every history row
+    junk = []
+    cursor.execute("SELECT id, url FROM urls")
+    rows = cursor.fetchmany(chunk_size)
+    while rows:
+        junk.extend(url_id for url_id, url in rows if not is_history_url(url))
+        rows = cursor.fetchmany(chunk_size)
+    for start in range(0, len(junk), chunk_size):
+        chunk = junk[start:start + chunk_size]
+        marks = ",".join("?" * len(chunk))
+        cursor.execute(f"DELETE FROM visits WHERE url_id IN ({marks})", chunk)
+        cursor.execute(f"DELETE FROM urls WHERE id IN ({marks})", chunk)
+    if junk:
+        logging.info(f"Removed {len(junk)} invalid history entries")
+
+
+# Owns its own sqlite3 connection and applies queued writes off the GUI thread.
+# Writes are collected for up to flush_interval seconds and committed in a
+# single transaction, so navigations never wait on an fsync.
+class StorageWorker(threading.Thread):
+    def __init__(self, db_path, flush_interval=0.5):
+        super().__init__(name="StorageWorker", daemon=True)
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+
+    # Public async API, safe to call from the GUI thread
+
+    def execute(self, sql, params=()):
+        self.queue.put((((sql, params),), None))
+
+    def submit(self, statements, done=None):
+        # Queues (sql, params) pairs as one job. Once its batch is committed,
+        # done(error) runs on the storage thread with the first error that
+        # hit this job, or None, whatever happened to other writes.
+        self.queue.put((tuple(statements), done))
+
+    def add_history(self, title, url):
+        # A title equal to the URL is a stand-in and never replaces a real one
+        now = int(time.time())
+        self.execute('''INSERT INTO urls (url, title, visit_count, last_visit, frecency)
+                        VALUES (?, ?, 1, ?, frecency_add(NULL, ?))
+                        ON CONFLICT(url) DO UPDATE SET title = COALESCE(NULLIF(excluded.title, excluded.url), urls.title),
+                        visit_count = visit_count + 1, last_visit = excluded.last_visit,
+                        frecency = frecency_add(frecency, excluded.last_visit)''',
+                     (url, title, now, now))
+        self.execute("INSERT INTO visits (url_id, visit_time) SELECT id, ? FROM urls WHERE url = ?", (now, url))
+
+    def update_title(self, url, title):
+        self.execute("UPDATE urls SET title = ? WHERE url = ?", (title, url))
+
+    def add_bookmark(self, title, url):
+        self.execute("INSERT INTO bookmarks (title, url) VALUES (?, ?)", (title, url))
+
+    def set_tab_group(self, tab_id, group_name, color):
+        self.execute("INSERT OR REPLACE INTO tab_groups (tab_id, group_name, color) VALUES (?, ?, ?)",
+                     (tab_id, group_name, color))
+
+    def remove_tab_group(self, tab_id):
+        self.execute("DELETE FROM tab_groups WHERE tab_id = ?", (tab_id,))
+
+    def add_page_load(self, load):
+        self.execute('''INSERT INTO page_loads (url, host, started, ok, first_progress_ms, load_ms, ttfb_ms,
+                        dom_content_loaded_ms, load_event_ms, first_paint_ms, first_contentful_paint_ms,
+                        transfer_size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                     (load["url"], load["host"], load["started"], load["ok"], load["first_progress_ms"],
+                      load["load_ms"], load.get("ttfb_ms"), load.get("dom_content_loaded_ms"),
+                      load.get("load_event_ms"), load.get("first_paint_ms"),
+                      load.get("first_contentful_paint_ms"), load.get("transfer_size")))
+
+    def clear_history(self, done=None):
+        self.submit([("DELETE FROM visits", ()), ("DELETE FROM urls", ()), ("DELETE FROM page_loads", ())], done)
+
+    def clear_bookmarks(self, done=None):
+        self.submit([("DELETE FROM bookmarks", ())], done)
+
+    def flush(self, timeout=None):
+        # Block until everything queued so far has been committed
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        if not self.is_alive():
+            return
+        self.queue.put(_STOP)
+        self.join(timeout)
+
+    # Worker thread
+
+    def run(self):
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        register_functions(conn)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except sqlite3.Error as e:
+            logging.error(f"Failed to configure storage connection: {str(e)}")
+
+        running = True
+        while running:
+            item = self.queue.get()
+            batch, waiters = [], []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    running = False
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write_batch(conn, batch)
+            for waiter in waiters:
+                waiter.set()
+
+        conn.close()
+
+    @timed("storage.write_batch")
+    def _write_batch(self, conn, batch):
+        errors = [None] * len(batch)
+        try:
+            conn.execute("BEGIN")
+            for i, (statements, done) in enumerate(batch):
+                for sql, params in statements:
+                    try:
+                        conn.execute(sql, params)
+                    except sqlite3.Error as e:
+                        errors[i] = errors[i] or e
+                        logging.error(f"Storage write failed ({sql.split()[0]}): {str(e)}")
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            # Nothing in the batch was kept
+            errors = [error or e for error in errors]
+            logging.error(f"Failed to commit storage batch: {str(e)}")
+            try:
+                conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass
+        for (statements, done), error in zip(batch, errors):
+            if done is not None:
+                done(error)
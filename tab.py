@@ -1,31 +1,89 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLineEdit, QToolBar, 
-                            QAction, QMessageBox, QProgressBar, QFileDialog)
+                            QAction, QMessageBox, QProgressBar, QLabel)
 from PyQt5.QtWebEngineWidgets import (QWebEngineView, QWebEngineProfile, 
-                                     QWebEnginePage, QWebEngineDownloadItem,
-                                     QWebEngineSettings)
-from PyQt5.QtCore import pyqtSignal, QUrl, Qt, QTimer
+                                     QWebEnginePage,
+                                     QWebEngineSettings, QWebEngineScript)
+from PyQt5.QtCore import pyqtSignal, QUrl, Qt, QTimer, QByteArray, QDataStream, QIODevice
 from PyQt5.QtGui import QIcon
 from resources import AnimationPlayer
 from icons import Icons
+from content_blocker import RequestBlocker
+from settings_store import SettingsStore
+from instrumentation import timed
+from page_loads import TIMING_SCRIPT, TIMING_FIELDS
 import re
-import os
 import urllib.parse
 import uuid
+import time
 import logging
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Settings store keys that map directly onto page attributes
+PAGE_ATTRIBUTES = {
+    "javascript_enabled": QWebEngineSettings.JavascriptEnabled,
+    "local_storage_enabled": QWebEngineSettings.LocalStorageEnabled,
+    "images_enabled": QWebEngineSettings.AutoLoadImages,
+    "plugins_enabled": QWebEngineSettings.PluginsEnabled,
+}
+
+# Stands in for a restored tab until it is first activated. It holds only the
+# tab's saved state, so no web view, page or renderer exists for it yet.
+class TabPlaceholder(QWidget):
+    is_placeholder = True
+
+    def __init__(self, url, title="", tab_id=None, incognito=False, last_active=0.0, parent=None,
+                 history=None, pinned=False, discarded=False):
+        super().__init__(parent)
+        self.tab_id = tab_id or str(uuid.uuid4())
+        self.url = url
+        self.title = title
+        self.incognito = incognito
+        self.last_active = last_active
+        self.history = history
+        self.pinned = pinned
+        self.discarded = discarded
+
+        layout = QVBoxLayout()
+        label = QLabel(title or url)
+        label.setAlignment(Qt.AlignCenter)
+        label.setStyleSheet("color: #9aa0a6;")
+        layout.addWidget(label)
+        self.setLayout(layout)
+
+    def current_url(self):
+        return self.url
+
+    def save_history(self):
+        return self.history
+
+
 class BrowserTab(QWidget):
     urlChanged = pyqtSignal(str)
     titleChanged = pyqtSignal(str)
+    navigationCommitted = pyqtSignal(str)
+    visited = pyqtSignal(str, str)
+    pageLoaded = pyqtSignal(dict)
+    is_placeholder = False
 
-    def __init__(self, parent=None, incognito=False):
+    def __init__(self, parent=None, incognito=False, tab_id=None, profile=None):
         super().__init__(parent)
-        self.tab_id = str(uuid.uuid4())  # Generate unique ID for the tab
+        self.tab_id = tab_id or str(uuid.uuid4())  # Generate unique ID for the tab
         self.incognito = incognito
-        self.profile = QWebEngineProfile.defaultProfile() if not incognito else QWebEngineProfile()
+        self.last_active = 0.0
+        self.pinned = False
+        self.committed_url = None
+        # URL of the last main-frame load recorded as a visit, and whether a
+        # load has started since
+        self.visited_url = None
+        self.visit_pending = False
+        if profile is None:
+            profile = QWebEngineProfile.defaultProfile() if not incognito else QWebEngineProfile(self)
+        self.profile = profile
         self.page = QWebEnginePage(self.profile, self)
+        self.blocker = RequestBlocker(self, SettingsStore.shared().get("content_blocking"))
+        self.page.setUrlRequestInterceptor(self.blocker)
         self.browser = QWebEngineView(self)
         self.browser.setPage(self.page)
         
@@ -66,15 +124,24 @@ class BrowserTab(QWidget):
         self.browser.loadStarted.connect(self.show_loading)
         self.browser.loadProgress.connect(self.update_progress)
         self.browser.loadFinished.connect(self.hide_loading)
-        self.profile.downloadRequested.connect(self.handle_download)
+        self.browser.loadFinished.connect(self.finish_load_timing)
+        self.browser.loadFinished.connect(self.finish_visit)
+        self.load_timing = None
 
-        # Enable dev tools
-        self.page.settings().setAttribute(QWebEngineSettings.JavascriptEnabled, True)
-        self.page.settings().setAttribute(QWebEngineSettings.LocalStorageEnabled, True)
-        self.page.settings().setAttribute(QWebEngineSettings.PluginsEnabled, True)
+        # Page settings come from the shared store; later changes arrive as diffs
+        settings = SettingsStore.shared()
+        self.apply_settings(settings.snapshot())
+        settings.changed.connect(self.apply_settings)
 
-        # Set initial URL
-        self.browser.setUrl(QUrl("https://www.google.com"))
+    @timed("tab.apply_settings")
+    def apply_settings(self, values):
+        page_settings = self.page.settings()
+        for key, value in values.items():
+            attribute = PAGE_ATTRIBUTES.get(key)
+            if attribute is not None:
+                page_settings.setAttribute(attribute, value)
+        if "content_blocking" in values:
+            self.blocker.set_enabled(values["content_blocking"])
 
     def create_toolbar(self):
         self.toolbar = QToolBar()
@@ -130,6 +197,7 @@ class BrowserTab(QWidget):
         # Add toolbar to layout
         self.layout.addWidget(self.toolbar)
 
+    @timed("tab.navigate_to_url")
     def navigate_to_url(self):
         text = self.url_bar.text().strip()
         if not text:
@@ -154,20 +222,54 @@ class BrowserTab(QWidget):
         except Exception as e:
             QMessageBox.warning(self, "Invalid URL", f"Failed to navigate to {url}: {str(e)}")
 
+    def current_url(self):
+        return self.browser.url().toString()
+
+    @timed("tab.save_history")
+    def save_history(self):
+        data = QByteArray()
+        stream = QDataStream(data, QIODevice.WriteOnly)
+        stream << self.browser.history()
+        return bytes(data)
+
+    @timed("tab.restore_history")
+    def restore_history(self, blob):
+        # Rebuilds the back/forward stack and loads only the current entry
+        stream = QDataStream(QByteArray(blob))
+        stream >> self.browser.history()
+
+    def renderer_pid(self):
+        return self.page.renderProcessPid()
+
+    def is_audible(self):
+        return self.page.recentlyAudible()
+
+    @timed("tab.update_url")
     def update_url(self, url):
-        self.url_bar.setText(url.toString())
-        self.urlChanged.emit(url.toString())
+        url = url.toString()
+        self.url_bar.setText(url)
+        self.urlChanged.emit(url)
+
+        # Every main-frame URL change, same-document ones included, moves the
+        # back/forward stack the session keeps
+        if url and url != self.committed_url:
+            self.committed_url = url
+            self.navigationCommitted.emit(url)
 
     def update_title(self, title):
         self.titleChanged.emit(title)
-        self.urlChanged.emit(title)
 
+    @timed("tab.show_loading")
     def show_loading(self):
+        self.visit_pending = True
+        self.blocker.reset()
+        self.load_timing = {"started": int(time.time()), "clock": time.perf_counter(), "first_progress_ms": None}
         self.browser.hide()
         self.loading_animation.load_animation("animations/loading")
         self.loading_animation.show()
         self.progress_bar.setValue(0)
 
+    @timed("tab.hide_loading")
     def hide_loading(self):
         self.loading_animation.hide()
         self.browser.show()
@@ -176,33 +278,52 @@ class BrowserTab(QWidget):
 
     def update_progress(self, progress):
         self.progress_bar.setValue(progress)
+        timing = self.load_timing
+        if timing is not None and timing["first_progress_ms"] is None and progress > 0:
+            timing["first_progress_ms"] = (time.perf_counter() - timing["clock"]) * 1000
 
-    def handle_download(self, download: QWebEngineDownloadItem):
-        if self.incognito:
-            QMessageBox.warning(self, "Incognito Mode", "Downloads are not supported in incognito mode.")
+    def finish_visit(self, ok):
+        # One visit per finished main-frame load, so reloads and repeat
+        # visits count. pushState never starts a load; a fragment change on
+        # the page already visited is the same document and is skipped.
+        pending, self.visit_pending = self.visit_pending, False
+        url = self.browser.url()
+        if not pending or not ok or url.isEmpty():
             return
-        
-        # Ask for download location
-        default_path = os.path.join(os.path.expanduser("~"), "Downloads", download.suggestedFileName())
-        file_path, _ = QFileDialog.getSaveFileName(self, "Save File", default_path)
-        
-        if file_path:
-            download.setPath(file_path)
-            download.accept()
-            
-            # Show download progress
-            download.finished.connect(lambda: self.notify_download_complete(download.suggestedFileName()))
-            download.downloadProgress.connect(self.show_download_progress)
-        else:
-            download.cancel()
+        visited = self.visited_url
+        if visited is not None and url != visited and url.adjusted(QUrl.RemoveFragment) == visited.adjusted(QUrl.RemoveFragment):
+            self.visited_url = url
+            return
+        self.visited_url = url
+        self.visited.emit(url.toString(), self.browser.title())
 
-    def notify_download_complete(self, file_name):
-        QMessageBox.information(self, "Download Complete", f"Downloaded: {file_name}")
+    def finish_load_timing(self, ok):
+        # Main-frame loads only; the page's own timing entries are read once
+        # the load has finished and merged in before pageLoaded is emitted
+        timing, self.load_timing = self.load_timing, None
+        if timing is None or self.incognito:
+            return
+        url = self.browser.url()
+        load = {
+            "url": url.toString(),
+            "host": url.host(),
+            "started": timing["started"],
+            "ok": int(ok),
+            "first_progress_ms": timing["first_progress_ms"],
+            "load_ms": (time.perf_counter() - timing["clock"]) * 1000,
+        }
+        if not ok or url.scheme() not in ("http", "https"):
+            self.pageLoaded.emit(load)
+            return
 
-    def show_download_progress(self, bytes_received, bytes_total):
-        if bytes_total > 0:
-            progress = (bytes_received / bytes_total) * 100
-            self.url_bar.setText(f"Downloading... {progress:.1f}%")
+        def collected(entries):
+            if isinstance(entries, dict):
+                load.update({key: entries.get(key) for key in TIMING_FIELDS})
+            try:
+                self.pageLoaded.emit(load)
+            except RuntimeError:
+                pass  # The tab was closed before the script returned
+        self.page.runJavaScript(TIMING_SCRIPT, QWebEngineScript.ApplicationWorld, collected)
 
     def toggle_dev_tools(self):
         if hasattr(self, 'dev_tools_window') and self.dev_tools_window:
@@ -232,7 +353,6 @@ class BrowserTab(QWidget):
             self.browser.loadStarted.disconnect()
             self.browser.loadProgress.disconnect()
             self.browser.loadFinished.disconnect()
-            self.profile.downloadRequested.disconnect()
         except TypeError:
             pass  # Signals may already be disconnected
         
@@ -0,0 +1,76 @@
+from PyQt5.QtWidgets import QWidget, QTabBar
+from PyQt5.QtGui import QPainter, QColor, QFont
+from PyQt5.QtCore import Qt, QSize
+
+UNGROUPED = ("", "")
+
+
+# The group letter shown at the left of a grouped tab. It paints itself from
+# shared QColor objects instead of carrying its own stylesheet, and one badge
+# stays with its tab, repainting only when the group's letter or color changes.
+class GroupBadge(QWidget):
+    colors = {}
+    badge_font = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFixedSize(QSize(18, 16))
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.letter = ""
+        self.color = None
+
+    @classmethod
+    def shared_color(cls, name):
+        color = cls.colors.get(name)
+        if color is None:
+            color = cls.colors[name] = QColor(name)
+        return color
+
+    def set_group(self, group_name, color):
+        letter = group_name[:1].upper()
+        if letter == self.letter and color == self.color:
+            return
+        self.letter, self.color = letter, color
+        self.update()
+
+    def paintEvent(self, event):
+        if GroupBadge.badge_font is None:
+            GroupBadge.badge_font = QFont(self.font())
+            GroupBadge.badge_font.setBold(True)
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(GroupBadge.shared_color(self.color))
+        painter.drawRoundedRect(self.rect(), 8, 8)
+        painter.setPen(Qt.white)
+        painter.setFont(GroupBadge.badge_font)
+        painter.drawText(self.rect(), Qt.AlignCenter, self.letter)
+        painter.end()
+
+
+def apply_group_style(tab_bar, index, entry, group):
+    # entry.style remembers what this tab last got, so repeated calls on
+    # title and URL changes return without touching the tab bar
+    style = tuple(group) if group else UNGROUPED
+    if entry.style == style:
+        return
+    entry.style = style
+
+    # The badge lives on the registry entry: holding the Python reference
+    # keeps the GroupBadge subclass (and its paintEvent) alive, and lets the
+    # next group change recolor it instead of creating another
+    badge = entry.badge
+    if style == UNGROUPED:
+        tab_bar.setTabTextColor(index, Qt.white)
+        if badge is not None:
+            entry.badge = None
+            tab_bar.setTabButton(index, QTabBar.LeftSide, None)
+            badge.deleteLater()
+        return
+
+    group_name, color = style
+    tab_bar.setTabTextColor(index, GroupBadge.shared_color(color))
+    if badge is None:
+        badge = entry.badge = GroupBadge(tab_bar)
+        tab_bar.setTabButton(index, QTabBar.LeftSide, badge)
+    badge.set_group(group_name, color)
@@ -0,0 +1,105 @@
+from PyQt5.QtWidgets import QTabWidget
+from PyQt5.QtCore import QObject
+
+
+class TabEntry:
+    __slots__ = ("tab_id", "widget", "index", "title", "url", "style", "badge")
+
+    def __init__(self, tab_id, widget, index):
+        self.tab_id = tab_id
+        self.widget = widget
+        self.index = index
+        self.title = ""
+        self.url = ""
+        self.style = None
+        self.badge = None
+
+
+# Maps tab_id to the tab's widget, current index and metadata. Inserts and
+# removals only record the lowest position whose cached indices may have
+# shifted; the next lookup past it renumbers from there once, so lookups are
+# O(1) and opening or closing a tab never walks the whole tab list.
+class TabRegistry(QObject):
+    def __init__(self, tabs):
+        super().__init__(tabs)
+        self.tabs = tabs
+        self.entries = {}
+        self.dirty_from = 0
+        tabs.tabBar().tabMoved.connect(self.tab_moved)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries.values())
+
+    def entry(self, tab_id):
+        return self.entries.get(tab_id)
+
+    def widget(self, tab_id):
+        entry = self.entries.get(tab_id)
+        return entry.widget if entry is not None else None
+
+    def index(self, tab_id):
+        entry = self.entries.get(tab_id)
+        if entry is None:
+            return -1
+        if entry.index >= self.dirty_from:
+            self.reindex()
+        if self.tabs.widget(entry.index) is not entry.widget:
+            # The widget left the tab widget without unregister()
+            self.dirty_from = 0
+            self.reindex()
+            if self.tabs.widget(entry.index) is not entry.widget:
+                return -1
+        return entry.index
+
+    def unregister(self, tab_id):
+        self.entries.pop(tab_id, None)
+
+    # Kept in sync by TabWidget and QTabBar.tabMoved
+
+    def tab_inserted(self, index):
+        widget = self.tabs.widget(index)
+        entry = self.entries.get(widget.tab_id)
+        if entry is None:
+            entry = self.entries[widget.tab_id] = TabEntry(widget.tab_id, widget, index)
+        else:
+            # A placeholder and its real tab swap under the same tab_id; the
+            # new tab bar slot starts unstyled, and QTabBar deletes the old
+            # slot's badge along with it
+            entry.widget, entry.index, entry.style, entry.badge = widget, index, None, None
+        self.dirty_from = min(self.dirty_from, index)
+
+    def tab_removed(self, index):
+        self.dirty_from = min(self.dirty_from, index)
+
+    def tab_moved(self, from_index, to_index):
+        # Only the tabs between the two positions shift
+        for i in range(min(from_index, to_index), min(max(from_index, to_index) + 1, self.dirty_from)):
+            widget = self.tabs.widget(i)
+            entry = self.entries.get(widget.tab_id)
+            if entry is not None and entry.widget is widget:
+                entry.index = i
+
+    def reindex(self):
+        for i in range(self.dirty_from, self.tabs.count()):
+            widget = self.tabs.widget(i)
+            entry = self.entries.get(widget.tab_id)
+            if entry is not None and entry.widget is widget:
+                entry.index = i
+        self.dirty_from = self.tabs.count()
+
+
+class TabWidget(QTabWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.registry = TabRegistry(self)
+
+    def tabInserted(self, index):
+        super().tabInserted(index)
+        self.registry.tab_inserted(index)
+
+    def tabRemoved(self, index):
+        super().tabRemoved(index)
+        self.registry.tab_removed(index)
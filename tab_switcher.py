@@ -0,0 +1,262 @@
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem
+from PyQt5.QtCore import Qt, QEvent, pyqtSignal
+import heapq
+import re
+import time
+
+MAX_RESULTS = 20
+
+# Ranking: how tightly the query matches, a bonus for matching at a word
+# start and for matching in the title or group rather than the URL, plus a
+# bonus for tabs used recently
+COMPACTNESS_WEIGHT = 10.0
+WORD_START_BONUS = 3.0
+FIELD_BONUS = (3.0, 2.0, 0.0)
+RECENCY_BONUS = 6.0
+RECENCY_HALF_LIFE = 3600.0
+# Recency factors are relative to an epoch that moves forward once they grow
+# past 2 ** RECENCY_REBASE, long before a float would overflow
+RECENCY_REBASE = 64
+SEPARATOR = "\x01"
+
+
+def gaps(chars):
+    # Each gap stops at the first occurrence of the next character and never
+    # gives any of it back, so the engine never backtracks; gaps never cross
+    # a field boundary
+    return "".join(f"[^{char}\x01]*+{char}" for char in map(re.escape, chars))
+
+
+def subsequence_pattern(query):
+    return re.compile(re.escape(query[0]) + gaps(query[1:]))
+
+
+class TabRecord:
+    __slots__ = ("tab_id", "title", "url", "group", "last_active", "key", "bounds", "recency")
+
+    def __init__(self, tab_id):
+        self.tab_id = tab_id
+        self.title = ""
+        self.url = ""
+        self.group = ""
+        self.last_active = 0.0
+        self.key = SEPARATOR * 2
+        self.bounds = (1, 2)
+        self.recency = 0.0
+
+
+# Searchable copy of every tab's title, URL and group name, updated field by
+# field as tabs change. Each record's key is "title\x01group\x01url",
+# lowercased. Each kept query maps to its hits, their match state and its
+# results: a longer query only looks at the hits of its longest kept prefix
+# and continues their matches, and a query that is already kept (a space
+# typed between words, or characters deleted back to it) returns its results
+# as they are. Tabs past the point where scoring stopped keep the state of
+# the shorter query they last matched and are caught up when a later
+# keystroke reaches them.
+class TabIndex:
+    def __init__(self):
+        self.epoch = time.time()
+        self.records = {}
+        self.order = None
+        self.matches = {}
+
+    def update(self, tab_id, title=None, url=None, group=None, last_active=None):
+        record = self.records.get(tab_id)
+        if record is None:
+            record = self.records[tab_id] = TabRecord(tab_id)
+        if title is not None:
+            record.title = title
+        if url is not None:
+            record.url = url
+        if group is not None:
+            record.group = group
+        if last_active is not None:
+            record.last_active = last_active
+            # 2 ** (t / half-life) relative to the epoch; multiplied by the
+            # same factor at search time it is the decayed recency bonus
+            exponent = (last_active - self.epoch) / RECENCY_HALF_LIFE
+            if exponent > RECENCY_REBASE:
+                self.rebase(last_active)
+                exponent = 0.0
+            record.recency = 2.0 ** exponent
+        record.key = SEPARATOR.join((record.title, record.group, record.url)).lower().replace("\n", " ")
+        group_start = len(record.title) + 1
+        record.bounds = (group_start, group_start + len(record.group) + 1)
+        self.order = None
+        self.matches = {}
+
+    def rebase(self, epoch):
+        # Factors of long-idle tabs underflow to 0.0, which is their bonus anyway
+        scale = 2.0 ** ((self.epoch - epoch) / RECENCY_HALF_LIFE)
+        for record in self.records.values():
+            record.recency *= scale
+        self.epoch = epoch
+
+    def remove(self, tab_id):
+        if self.records.pop(tab_id, None) is not None:
+            self.order = None
+            self.matches = {}
+
+    def ordered(self):
+        # Most recently used first, re-sorted only after the index changed
+        if self.order is None:
+            self.order = sorted(self.records.values(), key=lambda record: record.last_active, reverse=True)
+        return self.order
+
+    def search(self, text, limit=MAX_RESULTS):
+        query = "".join(text.lower().split())
+        # Only prefixes of this query can be continued from later
+        self.matches = {kept: value for kept, value in self.matches.items() if query.startswith(kept)}
+        if not query:
+            return self.ordered()[:limit]
+
+        length = len(query)
+        prefix = next((query[:end] for end in range(length, 0, -1) if query[:end] in self.matches), None)
+        if prefix == query:
+            return self.matches[query][2][:limit]
+        if prefix is None:
+            candidates = self.ordered()
+            states = [None] * len(candidates)
+        else:
+            candidates, states = self.matches[prefix][:2]
+
+        search = subsequence_pattern(query).search
+        extenders = {}
+        compactness = COMPACTNESS_WEIGHT * length
+        decay = RECENCY_BONUS * 2.0 ** ((self.epoch - time.time()) / RECENCY_HALF_LIFE)
+        title_bonus, group_bonus = FIELD_BONUS[0], FIELD_BONUS[1]
+        best_match = COMPACTNESS_WEIGHT + WORD_START_BONUS + max(FIELD_BONUS)
+        hits, kept, top = [], [], []
+        scoring = True
+        for position, record in enumerate(candidates):
+            # Candidates are in most-recently-used order, so recency only
+            # falls from here on: once no remaining tab can beat the current
+            # top results, the rest are still matched but no longer scored
+            if scoring and len(top) == limit and top[0][0] >= best_match + record.recency * decay:
+                scoring = False
+            key = record.key
+            # Either (substring start,) or (-1, leftmost subsequence start,
+            # end, query length); the subsequence is only looked for once
+            # there is no substring left
+            state = states[position]
+            if state is not None and state[0] >= 0:
+                # A longer query's first occurrence is at or after the
+                # shorter query's
+                substring = key.find(query, state[0])
+                state = (substring,) if substring >= 0 else None
+                if state is None and length == 1:
+                    continue
+            elif state is None:
+                substring = key.find(query)
+                if substring >= 0:
+                    state = (substring,)
+                elif length == 1:
+                    continue
+            elif state[3] != length:
+                # The leftmost subsequence match continues the shorter one's
+                # if that field has room for the new characters; if not, that
+                # field cannot hold it anywhere
+                start, end, done = state[1:]
+                extend = extenders.get(done)
+                if extend is None:
+                    extend = extenders[done] = re.compile(gaps(query[done:])).match
+                match = extend(key, end)
+                if match is not None:
+                    state = (-1, start, match.end(), length)
+                else:
+                    boundary = key.find(SEPARATOR, end)
+                    match = search(key, boundary + 1) if boundary >= 0 else None
+                    if match is None:
+                        continue
+                    state = (-1, *match.span(), length)
+            if state is None:
+                match = search(key)
+                if match is None:
+                    continue
+                state = (-1, *match.span(), length)
+            hits.append(record)
+            kept.append(state)
+            if not scoring:
+                continue
+
+            # Substring hits are the tightest; otherwise the leftmost subsequence
+            start = state[0]
+            if start >= 0:
+                span = length
+            else:
+                start = state[1]
+                span = state[2] - start
+            score = compactness / span + record.recency * decay
+            if start == 0 or not key[start - 1].isalnum():
+                score += WORD_START_BONUS
+            if start < record.bounds[0]:
+                score += title_bonus
+            elif start < record.bounds[1]:
+                score += group_bonus
+            if len(top) < limit:
+                heapq.heappush(top, (score, -position, record))
+            elif score > top[0][0]:
+                heapq.heapreplace(top, (score, -position, record))
+
+        results = [record for score, position, record in sorted(top, key=lambda item: item[:2], reverse=True)]
+        self.matches[query] = (hits, kept, results)
+        return results
+
+
+# Quick-switcher popup: type to filter, arrows to move, Enter to switch.
+class TabSwitcher(QDialog):
+    tabChosen = pyqtSignal(str)
+
+    def __init__(self, index, parent=None):
+        super().__init__(parent, Qt.Popup)
+        self.index = index
+        self.setMinimumWidth(560)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(6, 6, 6, 6)
+        self.search_bar = QLineEdit()
+        self.search_bar.setPlaceholderText("Search tabs by title, URL or group")
+        self.search_bar.textEdited.connect(self.refresh)
+        self.search_bar.returnPressed.connect(self.choose_current)
+        self.search_bar.installEventFilter(self)
+        layout.addWidget(self.search_bar)
+
+        self.results = QListWidget()
+        self.results.itemActivated.connect(self.choose)
+        layout.addWidget(self.results)
+        self.setLayout(layout)
+
+        self.refresh("")
+        self.search_bar.setFocus()
+
+    def refresh(self, text):
+        self.results.clear()
+        for record in self.index.search(text):
+            label = record.title or record.url
+            if record.group:
+                label = f"[{record.group}] {label}"
+            item = QListWidgetItem(f"{label}\n{record.url}")
+            item.setData(Qt.UserRole, record.tab_id)
+            self.results.addItem(item)
+        if self.results.count():
+            self.results.setCurrentRow(0)
+
+    def eventFilter(self, watched, event):
+        # Arrow keys move through the results while the search bar keeps focus
+        if watched is self.search_bar and event.type() == QEvent.KeyPress and event.key() in (Qt.Key_Up, Qt.Key_Down):
+            step = -1 if event.key() == Qt.Key_Up else 1
+            row = self.results.currentRow() + step
+            if 0 <= row < self.results.count():
+                self.results.setCurrentRow(row)
+            return True
+        return super().eventFilter(watched, event)
+
+    def choose_current(self):
+        item = self.results.currentItem()
+        if item is not None:
+            self.choose(item)
+
+    def choose(self, item):
+        self.tabChosen.emit(item.data(Qt.UserRole))
+        self.accept()
@@ -0,0 +1,171 @@
+# Runs SegmentedDownload against a local HTTP server and checks the file it
+# writes: byte ranges over several connections, the single-stream fallback
+# for servers that ignore Range, resuming from the journal, and a file that
+# changed between two runs.
+#
+#   python -m pytest tests
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from segmented_download import SegmentedDownload, DownloadError, journal_path, probe, MIN_SEGMENT_SIZE
+
+PAYLOAD = os.urandom(4 * MIN_SEGMENT_SIZE + 12345)
+SHA256 = hashlib.sha256(PAYLOAD).hexdigest()
+
+
+def make_handler(payload, ranges=True, rate=None):
+    # The served file can be swapped by setting the class's payload and etag
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        requests = []
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            payload, etag = Handler.payload, Handler.etag
+            Handler.requests.append(self.headers.get("Range"))
+            start, end = 0, len(payload) - 1
+            header = self.headers.get("Range")
+            if_range = self.headers.get("If-Range")
+            if ranges and header and (if_range is None or if_range == etag):
+                first, _, last = header[len("bytes="):].partition("-")
+                start = int(first)
+                end = min(int(last), end) if last else end
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(payload)}")
+            else:
+                self.send_response(200)
+            if ranges:
+                self.send_header("Accept-Ranges", "bytes")
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+
+            step = 64 * 1024
+            began = time.monotonic()
+            try:
+                for offset in range(start, end + 1, step):
+                    self.wfile.write(payload[offset:min(offset + step, end + 1)])
+                    if rate:
+                        ahead = (offset + step - start) / rate - (time.monotonic() - began)
+                        if ahead > 0:
+                            time.sleep(ahead)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    Handler.payload = payload
+    Handler.etag = '"%s"' % hashlib.sha256(payload).hexdigest()[:16]
+    return Handler
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def serve(handler):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/file.bin"
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def stop_halfway(download, total):
+    download.start()
+    deadline = time.monotonic() + 10
+    while download.received < total // 2 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    download.stop()
+    return download.received
+
+
+def test_probe_reports_size_and_range_support(serve):
+    assert probe(serve(make_handler(PAYLOAD)))[:2] == (len(PAYLOAD), True)
+    assert probe(serve(make_handler(PAYLOAD, ranges=False)))[:2] == (len(PAYLOAD), False)
+
+
+def test_segmented_download_writes_the_whole_file(serve, tmp_path):
+    handler = make_handler(PAYLOAD)
+    path = str(tmp_path / "file.bin")
+    download = SegmentedDownload(serve(handler), path, segments=4, expected_sha256=SHA256)
+    download.run()
+
+    assert download.state == "completed", download.error
+    assert download.resumable and len(download.segments) == 4
+    assert read(path) == PAYLOAD
+    assert download.sha256 == SHA256
+    assert not os.path.exists(journal_path(path))
+    # The probe, then one request per segment
+    assert sorted(handler.requests[1:]) == sorted(f"bytes={start}-{end}" for start, end, done in download.segments)
+
+
+def test_server_ignoring_range_falls_back_to_one_stream(serve, tmp_path):
+    handler = make_handler(PAYLOAD, ranges=False)
+    path = str(tmp_path / "file.bin")
+    download = SegmentedDownload(serve(handler), path, segments=4, expected_sha256=SHA256)
+    download.run()
+
+    assert download.state == "completed", download.error
+    assert not download.resumable and len(download.segments) == 1
+    assert read(path) == PAYLOAD
+    assert handler.requests[1:] == [None]
+    assert not os.path.exists(journal_path(path))
+
+
+def test_stopped_download_resumes_from_the_journal(serve, tmp_path):
+    # 1 MB/s per connection leaves time to stop about halfway
+    url = serve(make_handler(PAYLOAD, rate=MIN_SEGMENT_SIZE))
+    path = str(tmp_path / "file.bin")
+    download = SegmentedDownload(url, path, segments=4)
+    stopped_at = stop_halfway(download, len(PAYLOAD))
+
+    assert download.state == "interrupted"
+    with open(journal_path(path)) as f:
+        journal = json.load(f)
+    assert 0 < sum(done for start, end, done in journal["segments"]) <= stopped_at < len(PAYLOAD)
+
+    resumed = SegmentedDownload(url, path, segments=4, expected_sha256=SHA256)
+    resumed.run()
+    assert resumed.state == "completed", resumed.error
+    assert read(path) == PAYLOAD
+    assert not os.path.exists(journal_path(path))
+
+
+def test_changed_file_is_not_resumed(serve, tmp_path):
+    handler = make_handler(PAYLOAD, rate=MIN_SEGMENT_SIZE)
+    url = serve(handler)
+    path = str(tmp_path / "file.bin")
+    download = SegmentedDownload(url, path, segments=4)
+    stop_halfway(download, len(PAYLOAD))
+    assert download.state == "interrupted"
+
+    # New content and validator under the same URL: If-Range makes the
+    # server answer with the whole new file, which must not be spliced into
+    # the ranges already on disk
+    handler.payload, handler.etag = PAYLOAD[::-1], '"changed"'
+    resumed = SegmentedDownload(url, path, segments=4)
+    resumed.run()
+    assert resumed.state == "failed"
+    assert isinstance(resumed.error, DownloadError)
+    # Nothing is left for resume_interrupted to retry on the next start
+    assert not os.path.exists(journal_path(path))
+    assert not os.path.exists(path)
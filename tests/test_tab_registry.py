@@ -0,0 +1,124 @@
+# Opens, moves, swaps and closes tabs in an offscreen TabWidget and checks
+# that TabRegistry agrees with the widget after every step, and that a
+# lookup after an insert only renumbers the tabs that actually shifted.
+#
+#   python -m pytest tests
+import os
+import random
+import sys
+import uuid
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QWidget
+from tab_registry import TabWidget
+
+
+class FakeTab(QWidget):
+    def __init__(self, tab_id=None):
+        super().__init__()
+        self.tab_id = tab_id or str(uuid.uuid4())
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def tabs(app):
+    tabs = TabWidget()
+    tabs.setMovable(True)
+    yield tabs
+    tabs.deleteLater()
+
+
+def open_tabs(tabs, count):
+    for _ in range(count):
+        tabs.addTab(FakeTab(), "tab")
+
+
+def check(tabs):
+    registry = tabs.registry
+    assert len(registry) == tabs.count()
+    for i in range(tabs.count()):
+        assert registry.index(tabs.widget(i).tab_id) == i
+
+
+def test_insert_renumbers_only_from_the_insert_position(tabs, monkeypatch):
+    open_tabs(tabs, 1000)
+    check(tabs)
+    shifted = tabs.widget(500).tab_id
+
+    registry = tabs.registry
+    starts = []
+    reindex = registry.reindex
+    monkeypatch.setattr(registry, "reindex", lambda: (starts.append(registry.dirty_from), reindex())[1])
+    tabs.insertTab(500, FakeTab(), "tab")
+
+    assert registry.index(shifted) == 501
+    assert starts == [500]
+    check(tabs)
+
+
+def test_remove_and_move_keep_indices(tabs):
+    open_tabs(tabs, 50)
+    tabs.tabBar().moveTab(3, 40)
+    check(tabs)
+    tabs.tabBar().moveTab(45, 0)
+    check(tabs)
+    removed = tabs.widget(10).tab_id
+    tabs.registry.unregister(removed)
+    tabs.removeTab(10)
+    assert tabs.registry.index(removed) == -1
+    check(tabs)
+
+
+def test_swapped_tab_keeps_its_entry(tabs):
+    open_tabs(tabs, 10)
+    old = tabs.widget(4)
+    entry = tabs.registry.entry(old.tab_id)
+    entry.style = ("Work", "#ff0000")
+
+    # A placeholder replaced by its real tab under the same tab_id
+    real = FakeTab(old.tab_id)
+    tabs.insertTab(4, real, "tab")
+    tabs.removeTab(5)
+
+    assert tabs.registry.entry(old.tab_id) is entry
+    assert entry.widget is real and entry.style is None
+    assert tabs.registry.index(old.tab_id) == 4
+    check(tabs)
+
+
+def test_random_workload_stays_consistent(tabs):
+    rng = random.Random(1)
+    for _ in range(300):
+        tabs.insertTab(rng.randint(0, tabs.count()), FakeTab(), "tab")
+    check(tabs)
+
+    registry = tabs.registry
+    for step in range(3000):
+        roll = rng.random()
+        if roll < 0.05:
+            tabs.tabBar().moveTab(rng.randrange(tabs.count()), rng.randrange(tabs.count()))
+        elif roll < 0.08 and tabs.count() > 1:
+            index = rng.randrange(tabs.count())
+            registry.unregister(tabs.widget(index).tab_id)
+            tabs.removeTab(index)
+        elif roll < 0.11:
+            tabs.insertTab(rng.randint(0, tabs.count()), FakeTab(), "tab")
+        elif roll < 0.12:
+            index = rng.randrange(tabs.count())
+            old = tabs.widget(index)
+            tabs.insertTab(index, FakeTab(old.tab_id), "tab")
+            tabs.removeTab(index + 1)
+        else:
+            index = rng.randrange(tabs.count())
+            assert registry.index(tabs.widget(index).tab_id) == index
+        if step % 250 == 0:
+            check(tabs)
+    check(tabs)